@@ -2,147 +2,145 @@
 Flask WebSocket server for crypto chat application - Kararlı Versiyon
 """
 
-import json
-import base64
+import argparse
 import sys
 import os
 import traceback
-from flask import Flask, render_template, request
+from flask import Flask, Response, render_template, request, jsonify
 from flask_socketio import SocketIO, emit
 
 # Backend dizinini içe aktarmalar için yola ekle
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from encryption import SymmetricEncryptionFactory, AsymmetricEncryptionFactory
+from encryption.symmetric import MAX_MESSAGE_SIZE
+from server import (create_client_manager, run_cluster, use_worker_sid_prefix, ServerComponents,
+                    ChatHandlers, run_steps)
 
 app = Flask(__name__, template_folder='../frontend/templates', static_folder='../frontend/static')
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 
 # CORS ve Async Mode ayarları (eventlet yüklü olması önerilir)
-socketio = SocketIO(app, cors_allowed_origins="*", max_http_buffer_size=10 * 1024 * 1024) # 10MB limit
-
-# İstemci şifreleme ayarlarını saklamak için (Bellek üzerinde)
-client_settings = {}
-# İstemciye özel sunucu asimetrik anahtar çiftleri
-server_key_pairs = {}
+# Çok işçili modda yayınlar işçiler arası message queue üzerinden taşınır
+socketio_options = {}
+if os.environ.get('SOCKETIO_MESSAGE_QUEUE'):
+    socketio_options['client_manager'] = create_client_manager(os.environ['SOCKETIO_MESSAGE_QUEUE'])
+
+# Büyük yükler için tek mesaj yerine stream_* olayları kullanılmalı (bkz. handle_stream_chunk)
+socketio = SocketIO(app, cors_allowed_origins="*", max_http_buffer_size=MAX_MESSAGE_SIZE,
+                    **socketio_options)
+
+# Oturum deposu, anahtar havuzu, executor, biletler, ECDH, akışlar ve metrikler
+# (asgi.py ile ortak yapılandırma, bkz. server/components.py)
+components = ServerComponents(async_mode=socketio.async_mode)
+key_pool = components.key_pool
+crypto_executor = components.crypto_executor
+tickets = components.tickets
+metrics = components.metrics
+
+# Olayların gövdesi asgi.py ile ortaktır (bkz. server/handlers.py); burada yalnızca
+# request.sid ve emit bağlanır. Simetrik işler green thread'de doğrudan çalışır.
+handlers = ChatHandlers(components)
+
+def _run(steps):
+    run_steps(steps, emit, crypto_executor)
 
 @socketio.on('connect')
 def handle_connect():
-    """İstemci bağlandığında tetiklenir."""
-    print(f"Client connected: {request.sid}")
-    emit('connected', {'status': 'connected'})
+    _run(handlers.connect(request.sid))
 
 @socketio.on('disconnect')
 def handle_disconnect():
-    """İstemci ayrıldığında verileri temizle."""
-    print(f"Client disconnected: {request.sid}")
-    client_settings.pop(request.sid, None)
-    server_key_pairs.pop(request.sid, None)
+    handlers.disconnect(request.sid)
 
 @socketio.on('key_exchange_params')
 def handle_key_exchange_params(data):
-    """
-    İstemci algoritma değiştirdiğinde veya ilk bağlantıda yeni
-    sunucu anahtar çiftini üretir.
-    """
-    try:
-        asymmetric_algo = data.get('asymmetric_algorithm', 'rsa')
-        asymmetric_impl = 'lib' # Anahtar değişimi her zaman kütüphane ile yapılır
-
-        print(f"Generating new {asymmetric_algo} keys for sid: {request.sid}")
-
-        asymmetric_enc = AsymmetricEncryptionFactory.create(asymmetric_algo, asymmetric_impl)
-
-        # Sunucu için yeni anahtar çifti üret
-        public_key, private_key = asymmetric_enc.generate_key_pair()
-
-        # Eski anahtar varsa üzerine yazar (Sıfırlama mantığı için kritik)
-        server_key_pairs[request.sid] = {
-            'private_key': private_key,
-            'algorithm': asymmetric_algo
-        }
-
-        # Genel anahtarı istemciye gönder
-        emit('server_public_key', {
-            'public_key': base64.b64encode(public_key).decode('utf-8'),
-            'algorithm': asymmetric_algo
-        })
-
-    except Exception as e:
-        print(f"Key generation error: {e}")
-        emit('error', {'message': f'Anahtar değişimi başarısız: {str(e)}'})
+    _run(handlers.key_exchange_params(request.sid, data))
 
 @socketio.on('set_encryption_settings')
 def handle_set_encryption_settings(data):
-    """İstemciden gelen şifreli simetrik anahtarı çözer ve ayarları kaydeder."""
-    try:
-        asymmetric_algo = data.get('asymmetric_algorithm', 'rsa')
-
-        if request.sid not in server_key_pairs:
-            emit('error', {'message': 'Sunucu anahtarı bulunamadı, lütfen önce anahtar isteyin.'})
-            return
-
-        server_private_key = server_key_pairs[request.sid]['private_key']
-        asymmetric_enc = AsymmetricEncryptionFactory.create(asymmetric_algo, 'lib')
+    _run(handlers.set_encryption_settings(request.sid, data))
 
-        encrypted_symmetric_key = data.get('encrypted_symmetric_key', '')
-
-        # Simetrik anahtarı sunucu özel anahtarı ile deşifre et
-        symmetric_key = asymmetric_enc.decrypt_key(encrypted_symmetric_key, server_private_key)
-
-        # Ayarları istemciye özel sakla
-        client_settings[request.sid] = {
-            'symmetric_algorithm': data.get('symmetric_algorithm', 'aes'),
-            'symmetric_implementation': data.get('symmetric_implementation', 'lib'),
-            'symmetric_key': symmetric_key
-        }
-
-        print(f"Encryption settings verified for {request.sid}")
-        emit('settings_confirmed', {'status': 'ok'})
-
-    except Exception as e:
-        traceback.print_exc()
-        emit('error', {'message': f'Ayarlar kaydedilemedi: {str(e)}'})
+@socketio.on('resume_session')
+def handle_resume_session(data):
+    _run(handlers.resume_session(request.sid, data))
 
 @socketio.on('message')
 def handle_message(data):
-    """Şifreli mesajı alır, çözer, işler ve tekrar şifreleyerek geri gönderir."""
-    try:
-        if request.sid not in client_settings:
-            emit('error', {'message': 'Şifreleme ayarları bulunamadı!'})
-            return
+    _run(handlers.message(request.sid, data))
 
-        settings = client_settings[request.sid]
-        symmetric_enc = SymmetricEncryptionFactory.create(
-            settings['symmetric_algorithm'],
-            settings['symmetric_implementation']
-        )
+@socketio.on('message_batch')
+def handle_message_batch(data):
+    _run(handlers.message_batch(request.sid, data))
 
-        encrypted_incoming = data.get('message', '')
-        symmetric_key = settings['symmetric_key']
+@socketio.on('stream_start')
+def handle_stream_start(data):
+    _run(handlers.stream_start(request.sid, data))
 
-        # 1. Mesajı Deşifre Et (Sunucu içeriği görür)
-        decrypted_text = symmetric_enc.decrypt(encrypted_incoming, symmetric_key)
-        print(f"Message from {request.sid}: {decrypted_text}")
+@socketio.on('stream_chunk')
+def handle_stream_chunk(data):
+    _run(handlers.stream_chunk(request.sid, data))
 
-        # 2. Cevabı Hazırla
-        server_response_text = f"+{decrypted_text}"
-
-        # 3. Cevabı TEKRAR ŞİFRELE (Ağ güvenliği için en kritik adım)
-        # Artık 'decrypted' veya 'original_encrypted' gibi açık alanlar göndermiyoruz.
-        re_encrypted_response = symmetric_enc.encrypt(server_response_text, symmetric_key)
-
-        # 4. Sadece şifreli yükü (payload) gönder
-        emit('message_response', {
-            'encrypted_payload': re_encrypted_response
-        })
-
-    except Exception as e:
-        print(f"Message handling error: {e}")
-        emit('error', {'message': 'Mesaj işlenirken şifreleme hatası oluştu.'})
+@socketio.on('stream_end')
+def handle_stream_end(data):
+    _run(handlers.stream_end(request.sid, data))
 
 @app.route('/')
 def index():
     return render_template('index.html')
 
+@app.route('/stats/key_pool')
+def key_pool_stats():
+    """Anahtar havuzu derinliği, yenileme hızı ve ıskalama sayıları."""
+    return jsonify(key_pool.stats())
+
+@app.route('/stats/executor')
+def executor_stats():
+    """Executor kuyruk derinliği, reddedilen işler ve işlem bazlı gecikme histogramları."""
+    return jsonify(crypto_executor.stats())
+
+@app.route('/stats/tickets')
+def ticket_stats():
+    """Oturum devam bileti isabet oranı ve ıskalama nedenleri."""
+    return jsonify(tickets.stats())
+
+@app.route('/stats/sessions')
+def session_stats():
+    """Oturum sınırı, nedene göre silinen oturumlar ve tamamlanmamış el sıkışmalar."""
+    return jsonify(components.session_stats())
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus metin biçiminde tüm metrikler."""
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+def _session_sweeper():
+    """Disconnect'i kaçırılan oturumları ve yarım kalan el sıkışmaları düzenli aralıkla temizler."""
+    while True:
+        socketio.sleep(components.sweep_interval)
+        try:
+            components.sweep()
+        except Exception:
+            traceback.print_exc()
+
 if __name__ == '__main__':
-    socketio.run(app, debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Crypto chat sunucusu')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WORKERS', 1)),
+                        help='İşçi süreç sayısı (>1 ise yapışkan yönlendirici ile çalışır)')
+    parser.add_argument('--worker-index', type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.workers > 1 and args.worker_index is None:
+        # Bu süreç yalnızca yönlendirici + yerel broker olarak çalışır
+        run_cluster(os.path.abspath(__file__), args.workers, args.host, args.port,
+                    message_queue=os.environ.get('SOCKETIO_MESSAGE_QUEUE'))
+    else:
+        if args.worker_index is not None:
+            use_worker_sid_prefix(socketio.server, args.worker_index)
+        components.warm_up()
+        socketio.start_background_task(_session_sweeper)
+        try:
+            # İşçiler yeniden yükleyici (reloader) ile çalıştırılmaz
+            socketio.run(app, debug=args.worker_index is None, host=args.host, port=args.port)
+        finally:
+            key_pool.shutdown()
\ No newline at end of file
@@ -0,0 +1,181 @@
+"""
+ASGI entry point for crypto chat - asyncio sunucusu (eventlet olmadan).
+
+app.py ile aynı Socket.IO protokolü, python-socketio AsyncServer üzerinde
+async handler'larla çalışır; monkey-patching yoktur. Asimetrik işlemler ve
+büyük simetrik yükler CryptoExecutor.run_async ile thread havuzunda beklenir,
+böylece event loop diğer bağlantılara hizmet etmeye devam eder.
+
+Kurulum: pip install -r requirements-asgi.txt
+Çalıştırma: python asgi.py  (veya: uvicorn asgi:app)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import traceback
+
+import socketio
+
+# Backend dizinini içe aktarmalar için yola ekle
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from encryption.symmetric import MAX_MESSAGE_SIZE
+from server import ServerComponents, ChatHandlers, run_steps_async
+
+FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'frontend')
+
+# Bu boyutun (bayt/karakter) üstündeki simetrik işler event loop yerine thread havuzunda çalışır;
+# küçük mesajlarda thread'e aktarma maliyeti şifrelemenin kendisinden büyüktür
+OFFLOAD_THRESHOLD = int(os.environ.get('ASYNC_OFFLOAD_THRESHOLD', 64 * 1024))
+
+# Büyük yükler için tek mesaj yerine stream_* olayları kullanılmalı (bkz. handle_stream_chunk)
+sio = socketio.AsyncServer(async_mode='asgi', cors_allowed_origins='*',
+                           max_http_buffer_size=MAX_MESSAGE_SIZE)
+
+# app.py ile aynı yapılandırma ve olay gövdeleri (bkz. server/components.py, server/handlers.py)
+components = ServerComponents(async_mode='asyncio')
+key_pool = components.key_pool
+crypto_executor = components.crypto_executor
+tickets = components.tickets
+metrics = components.metrics
+handlers = ChatHandlers(components)
+
+# Her olay ayrı bir görevde çalışır; mesaj ve akış olayları bağlantı başına bu kilitle
+# geldikleri sırada işlenir (cevap ve akış sırası korunur). El sıkışma olayları kilidi beklemez.
+_ordered = {}
+
+
+async def _run(sid, steps):
+    async def reply(event, data):
+        await sio.emit(event, data, to=sid)
+    await run_steps_async(steps, reply, crypto_executor, offload_threshold=OFFLOAD_THRESHOLD)
+
+
+async def _run_ordered(sid, steps):
+    # Bağlantı kapandıysa (kilit disconnect'te silinir) olay sessizce düşürülür
+    lock = _ordered.get(sid)
+    if lock is None:
+        return
+    async with lock:
+        await _run(sid, steps)
+
+
+@sio.on('connect')
+async def handle_connect(sid, environ):
+    _ordered[sid] = asyncio.Lock()
+    await _run(sid, handlers.connect(sid))
+
+@sio.on('disconnect')
+async def handle_disconnect(sid):
+    _ordered.pop(sid, None)
+    handlers.disconnect(sid)
+
+@sio.on('key_exchange_params')
+async def handle_key_exchange_params(sid, data):
+    await _run(sid, handlers.key_exchange_params(sid, data))
+
+@sio.on('set_encryption_settings')
+async def handle_set_encryption_settings(sid, data):
+    await _run(sid, handlers.set_encryption_settings(sid, data))
+
+@sio.on('resume_session')
+async def handle_resume_session(sid, data):
+    await _run(sid, handlers.resume_session(sid, data))
+
+@sio.on('message')
+async def handle_message(sid, data):
+    await _run_ordered(sid, handlers.message(sid, data))
+
+@sio.on('message_batch')
+async def handle_message_batch(sid, data):
+    await _run_ordered(sid, handlers.message_batch(sid, data))
+
+@sio.on('stream_start')
+async def handle_stream_start(sid, data):
+    await _run_ordered(sid, handlers.stream_start(sid, data))
+
+@sio.on('stream_chunk')
+async def handle_stream_chunk(sid, data):
+    await _run_ordered(sid, handlers.stream_chunk(sid, data))
+
+@sio.on('stream_end')
+async def handle_stream_end(sid, data):
+    await _run_ordered(sid, handlers.stream_end(sid, data))
+
+
+def _render_index() -> bytes:
+    """index.html bir kez işlenir; url_for('static', ...) /static/ altına eşlenir."""
+    import jinja2
+    environment = jinja2.Environment(loader=jinja2.FileSystemLoader(os.path.join(FRONTEND_DIR, 'templates')),
+                                     autoescape=True)
+    environment.globals['url_for'] = lambda endpoint, filename: f"/{endpoint}/{filename}"
+    return environment.get_template('index.html').render().encode('utf-8')
+
+
+def _json(fn):
+    return lambda: ('application/json', json.dumps(fn()).encode('utf-8'))
+
+
+# Socket.IO ve statik dosyalar dışındaki HTTP yolları (app.py'deki Flask route'ları ile aynı)
+_index_html = _render_index()
+_routes = {
+    '/': lambda: ('text/html; charset=utf-8', _index_html),
+    '/stats/key_pool': _json(key_pool.stats),
+    '/stats/executor': _json(crypto_executor.stats),
+    '/stats/tickets': _json(tickets.stats),
+    '/stats/sessions': _json(components.session_stats),
+    '/metrics': lambda: ('text/plain; version=0.0.4; charset=utf-8', metrics.render().encode('utf-8')),
+}
+
+
+async def http_app(scope, receive, send):
+    """Minimal ASGI app for the index page, /stats/* and /metrics."""
+    if scope['type'] != 'http':
+        return
+    route = _routes.get(scope['path'])
+    if route is None:
+        status, content_type, body = 404, 'text/plain', b'Not Found'
+    else:
+        status = 200
+        content_type, body = route()
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': [(b'content-type', content_type.encode('utf-8'))]})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def _session_sweeper():
+    """Disconnect'i kaçırılan oturumları ve yarım kalan el sıkışmaları düzenli aralıkla temizler."""
+    while True:
+        await sio.sleep(components.sweep_interval)
+        try:
+            components.sweep()
+        except Exception:
+            traceback.print_exc()
+
+
+def _startup():
+    components.warm_up()
+    sio.start_background_task(_session_sweeper)
+
+
+app = socketio.ASGIApp(
+    sio, other_asgi_app=http_app,
+    static_files={'/static': os.path.join(FRONTEND_DIR, 'static')},
+    on_startup=_startup, on_shutdown=key_pool.shutdown
+)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Crypto chat sunucusu (asyncio/ASGI)')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5000)
+    args = parser.parse_args()
+
+    try:
+        import uvicorn
+    except ImportError:
+        raise RuntimeError("ASGI modu için uvicorn gerekli: pip install -r requirements-asgi.txt") from None
+
+    # Tek süreç: çok işçili kurulum için app.py --workers kullanılır
+    uvicorn.run(app, host=args.host, port=args.port, log_level='warning')
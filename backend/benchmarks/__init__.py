@@ -0,0 +1,5 @@
+"""
+Benchmarks for the crypto chat backend.
+Run from the backend directory, e.g. `python -m benchmarks.cipher_context`.
+`python -m benchmarks` runs the full cipher suite and can write JSON results.
+"""
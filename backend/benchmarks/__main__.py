@@ -0,0 +1,7 @@
+"""`python -m benchmarks` runs the full suite (see benchmarks/suite.py)."""
+
+import sys
+
+from .suite import main
+
+sys.exit(main())
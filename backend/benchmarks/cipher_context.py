@@ -0,0 +1,55 @@
+"""
+Per-message cost of the message path: factory + key preparation on every
+message (old handle_message) versus a session-bound CipherContext.
+"""
+
+import argparse
+import time
+
+from encryption import SymmetricEncryptionFactory
+
+COMBINATIONS = [
+    ('aes', 'lib'), ('aes', 'manual'), ('des', 'lib'), ('des', 'manual'),
+    ('caesar', 'lib'), ('vigenere', 'lib'), ('railfence', 'lib'), ('playfair', 'lib'),
+]
+
+
+def _per_call(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def run(message: str, iterations: int):
+    print(f"{'algorithm':<18}{'factory (us)':>14}{'context (us)':>14}{'speedup':>10}")
+    for algorithm, implementation in COMBINATIONS:
+        symmetric_enc = SymmetricEncryptionFactory.create(algorithm, implementation)
+        key = symmetric_enc.generate_key()
+        incoming = symmetric_enc.encrypt(message, key)
+
+        def per_message_factory():
+            enc = SymmetricEncryptionFactory.create(algorithm, implementation)
+            enc.encrypt('+' + enc.decrypt(incoming, key), key)
+
+        cipher = symmetric_enc.bind(key)
+
+        def per_message_context():
+            cipher.encrypt('+' + cipher.decrypt(incoming))
+
+        before = _per_call(per_message_factory, iterations)
+        after = _per_call(per_message_context, iterations)
+        name = f"{algorithm}/{implementation}"
+        print(f"{name:<18}{before * 1e6:>14.1f}{after * 1e6:>14.1f}{before / after:>9.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=64, help='message length in characters')
+    parser.add_argument('--iterations', type=int, default=2000)
+    args = parser.parse_args()
+    run('M' * args.size, args.iterations)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Throughput of the classical ciphers from 1 KB to 10 MB messages.
+"""
+
+import argparse
+import time
+
+from encryption import SymmetricEncryptionFactory
+
+ALGORITHMS = ['caesar', 'vigenere']
+SIZES = [1024, 10 * 1024, 100 * 1024, 1024 * 1024, 10 * 1024 * 1024]
+# Türkçe karakterler dahil, çok baytlı UTF-8 yolunu da ölçer
+ALPHABET = "Merhaba dünya, şifreli sohbet! ÇĞİÖŞÜ 0123456789 "
+
+
+def _sample_text(size: int) -> str:
+    repeats = size // len(ALPHABET) + 1
+    return (ALPHABET * repeats)[:size]
+
+
+def _format_size(size: int) -> str:
+    if size >= 1024 * 1024:
+        return f"{size // (1024 * 1024)} MB"
+    return f"{size // 1024} KB"
+
+
+def run(algorithms, sizes, repeat: int):
+    print(f"{'algorithm':<12}{'size':>8}{'encrypt MB/s':>15}{'decrypt MB/s':>15}")
+    for algorithm in algorithms:
+        cipher_impl = SymmetricEncryptionFactory.create(algorithm, 'lib')
+        cipher = cipher_impl.bind(cipher_impl.generate_key())
+        for size in sizes:
+            text = _sample_text(size)
+            megabytes = len(text.encode('utf-8')) / (1024 * 1024)
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                ciphertext = cipher.encrypt(text)
+            encrypt_time = (time.perf_counter() - start) / repeat
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                decrypted = cipher.decrypt(ciphertext)
+            decrypt_time = (time.perf_counter() - start) / repeat
+
+            assert decrypted == text
+            print(f"{algorithm:<12}{_format_size(size):>8}"
+                  f"{megabytes / encrypt_time:>15.1f}{megabytes / decrypt_time:>15.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--algorithms', nargs='+', default=ALGORITHMS)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    run(args.algorithms, SIZES, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""
+Message throughput of the multi-worker mode for a growing number of workers.
+
+Her ölçüm için: LocalBroker + N işçi + StickyRouter başlatılır, ayrı
+süreçlerdeki istemciler yönlendirici üzerinden WebSocket ile bağlanıp el
+sıkışır ve süre boyunca mesaj gönderip cevabını bekler. Doğrusal ölçekleme
+için makinede en az (işçi + istemci süreci) kadar çekirdek olmalıdır.
+
+Kullanım (backend/ dizininden):
+    python -m benchmarks.cluster_scaling --workers 1 2 4 --clients 4 --duration 10
+"""
+
+import argparse
+import base64
+import json
+import multiprocessing
+import os
+import threading
+import time
+
+import simple_websocket
+
+from encryption import AsymmetricEncryptionFactory, SymmetricEncryptionFactory
+from server.broker import LocalBroker
+from server.cluster import StickyRouter, start_workers, stop_workers, wait_for_port
+
+APP_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+
+class _Connection:
+    """Minimal Engine.IO v4 / Socket.IO v5 client over a WebSocket."""
+
+    def __init__(self, port: int):
+        url = f"ws://127.0.0.1:{port}/socket.io/?EIO=4&transport=websocket"
+        self.ws = simple_websocket.Client(url)
+        self.ws.receive()              # Engine.IO open paketi
+        self.ws.send('40')             # Varsayılan namespace'e bağlan
+
+    def emit(self, event: str, data) -> None:
+        self.ws.send('42' + json.dumps([event, data]))
+
+    def wait_for(self, event: str):
+        while True:
+            packet = self.ws.receive()
+            if packet == '2':          # ping
+                self.ws.send('3')
+            elif packet.startswith('42'):
+                name, *args = json.loads(packet[2:])
+                if name == event:
+                    return args[0] if args else None
+                if name == 'error':
+                    raise RuntimeError(args[0])
+
+    def handshake(self, symmetric_algorithm: str, implementation: str):
+        self.emit('key_exchange_params', {'asymmetric_algorithm': 'ecc'})
+        public_key = base64.b64decode(self.wait_for('server_public_key')['public_key'])
+        symmetric_enc = SymmetricEncryptionFactory.create(symmetric_algorithm, implementation)
+        key = symmetric_enc.generate_key()
+        self.emit('set_encryption_settings', {
+            'asymmetric_algorithm': 'ecc',
+            'symmetric_algorithm': symmetric_algorithm,
+            'symmetric_implementation': implementation,
+            'encrypted_symmetric_key': AsymmetricEncryptionFactory.create('ecc').encrypt_key(key, public_key),
+        })
+        self.wait_for('settings_confirmed')
+        return symmetric_enc.bind(key)
+
+    def close(self):
+        self.ws.close()
+
+
+def _client_process(port: int, connections: int, duration: float, message_size: int, results):
+    """One load-generating process with `connections` synchronous connections."""
+    counts = [0] * connections
+    start_barrier = threading.Barrier(connections)
+
+    def run(slot: int):
+        connection = _Connection(port)
+        cipher = connection.handshake('aes', 'lib')
+        payload = 'M' * message_size
+        start_barrier.wait()
+        deadline = time.perf_counter() + duration
+        while time.perf_counter() < deadline:
+            connection.emit('message', {'message': cipher.encrypt(payload)})
+            cipher.decrypt(connection.wait_for('message_response')['encrypted_payload'])
+            counts[slot] += 1
+        connection.close()
+
+    threads = [threading.Thread(target=run, args=(slot,)) for slot in range(connections)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.put(sum(counts))
+
+
+def measure(workers: int, clients: int, connections: int, duration: float,
+            message_size: int, port: int) -> float:
+    """Messages per second through the router with the given number of workers."""
+    broker = LocalBroker()
+    broker.start()
+    processes = start_workers(APP_SCRIPT, workers, port + 1, broker.url)
+    router = StickyRouter([('127.0.0.1', port + 1 + i) for i in range(workers)], '127.0.0.1', port)
+    threading.Thread(target=router.serve_forever, daemon=True).start()
+    wait_for_port(('127.0.0.1', port))
+    try:
+        results = multiprocessing.Queue()
+        loaders = [multiprocessing.Process(target=_client_process,
+                                           args=(port, connections, duration, message_size, results))
+                   for _ in range(clients)]
+        for loader in loaders:
+            loader.start()
+        total = sum(results.get() for _ in loaders)
+        for loader in loaders:
+            loader.join()
+        return total / duration
+    finally:
+        router.close()
+        stop_workers(processes)
+        broker.shutdown()
+        broker.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--clients', type=int, default=4, help='Yük üreten süreç sayısı')
+    parser.add_argument('--connections', type=int, default=8, help='Süreç başına bağlantı')
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--message-size', type=int, default=256)
+    parser.add_argument('--port', type=int, default=5100)
+    args = parser.parse_args()
+
+    print(f"CPU cores: {os.cpu_count()}")
+    print(f"{'workers':>8}{'msg/s':>12}{'speedup':>10}{'efficiency':>12}")
+    baseline = None
+    for workers in args.workers:
+        rate = measure(workers, args.clients, args.connections, args.duration,
+                       args.message_size, args.port)
+        baseline = baseline or rate / workers
+        speedup = rate / baseline
+        print(f"{workers:>8}{rate:>12.0f}{speedup:>10.2f}{speedup / workers:>12.0%}")
+
+
+if __name__ == '__main__':
+    main()
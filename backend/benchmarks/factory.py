@@ -0,0 +1,83 @@
+"""
+Cold-start cost of importing the encryption package and per-call cost of
+the cipher factories.
+
+Soğuk başlangıç her ölçümde yeni bir Python sürecinde ölçülür: yalnızca
+`import encryption`, ve import + ilk create çağrısı (AES lib, cryptography
+yüklenir; Caesar, cryptography gerekmez).
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from encryption import AsymmetricEncryptionFactory, SymmetricEncryptionFactory
+
+_BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_COLD_START = """
+import json, sys, time
+start = time.perf_counter()
+import encryption
+imported = time.perf_counter()
+if {algorithm!r}:
+    encryption.SymmetricEncryptionFactory.create({algorithm!r}, 'lib')
+created = time.perf_counter()
+print(json.dumps([imported - start, created - start, 'cryptography' in sys.modules]))
+"""
+
+COLD_CASES = [('import encryption', None), ("+ create('caesar')", 'caesar'), ("+ create('aes')", 'aes')]
+CALL_CASES = [
+    ("sym create('aes', 'lib')", lambda: SymmetricEncryptionFactory.create('aes', 'lib')),
+    ("sym create('AES', 'Manual')", lambda: SymmetricEncryptionFactory.create('AES', 'Manual')),
+    ("sym create('playfair')", lambda: SymmetricEncryptionFactory.create('playfair')),
+    ("asym create('ecc')", lambda: AsymmetricEncryptionFactory.create('ecc')),
+]
+
+
+def _cold_start(algorithm, runs: int):
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, '-c', _COLD_START.format(algorithm=algorithm)],
+            cwd=_BACKEND, check=True, capture_output=True, text=True
+        ).stdout
+        samples.append(json.loads(output))
+    imported, created, crypto_loaded = zip(*samples)
+    return statistics.median(imported), statistics.median(created), crypto_loaded[0]
+
+
+def _per_call(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+
+def run(runs: int, iterations: int):
+    print(f"{'cold start':<28}{'import ms':>12}{'total ms':>12}{'cryptography':>14}")
+    for label, algorithm in COLD_CASES:
+        imported, created, crypto_loaded = _cold_start(algorithm, runs)
+        print(f"{label:<28}{imported * 1000:>12.1f}{created * 1000:>12.1f}{str(crypto_loaded):>14}")
+
+    print()
+    print(f"{'per call':<28}{'us':>12}")
+    for label, fn in CALL_CASES:
+        fn()
+        print(f"{label:<28}{_per_call(fn, iterations) * 1e6:>12.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=15, help='Soğuk başlangıç ölçümü başına süreç sayısı')
+    parser.add_argument('--iterations', type=int, default=200000)
+    args = parser.parse_args()
+    run(args.runs, args.iterations)
+
+
+if __name__ == '__main__':
+    main()
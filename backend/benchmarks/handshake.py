@@ -0,0 +1,88 @@
+"""
+Keygen and key exchange latency of the RSA, ECC and ECDH handshakes.
+
+RSA/ECC: sunucu oturum başına anahtar çifti üretir, istemci simetrik
+anahtarı şifreler, sunucu deşifre eder. ECDH: sunucu dönem anahtarını
+kullanır (üretim yok), istemci geçici anahtar üretir ve iki taraf
+oturum anahtarını HKDF ile türetir.
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from encryption import AsymmetricEncryptionFactory
+from encryption.asymmetric import ECCLib
+from server.ecdh import ECDHKeyRing
+
+MODES = ['rsa', 'ecc', 'ecdh']
+INFO = b"crypto-chat session key|aes|lib"
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def _rsa_or_ecc(algorithm: str):
+    asymmetric_enc = AsymmetricEncryptionFactory.create(algorithm, 'lib')
+    symmetric_key = os.urandom(32)
+    (public_key, private_key), keygen = _timed(asymmetric_enc.generate_key_pair)
+    encrypted, client = _timed(asymmetric_enc.encrypt_key, symmetric_key, public_key)
+    decrypted, exchange = _timed(asymmetric_enc.decrypt_key, encrypted, private_key)
+    assert decrypted == symmetric_key
+    return keygen, client, exchange
+
+
+def _ecdh(key_ring: ECDHKeyRing, ecc: ECCLib):
+    # Dönem anahtarı önbellekten gelir; ölçülen "keygen" sadece bu aramadır
+    (key_id, server_public), keygen = _timed(key_ring.current)
+
+    def client_side():
+        client_public, client_private = ecc.generate_key_pair()
+        key = ecc.derive_key(client_private, server_public, 32,
+                             salt=client_public + server_public, info=INFO)
+        return client_public, key
+
+    (client_public, client_key), client = _timed(client_side)
+    server_key, exchange = _timed(key_ring.derive, key_id, client_public, 32, INFO)
+    assert server_key == client_key
+    return keygen, client, exchange
+
+
+def _summary(samples):
+    ms = sorted(sample * 1000 for sample in samples)
+    return statistics.mean(ms), ms[len(ms) // 2], ms[min(len(ms) - 1, int(len(ms) * 0.99))]
+
+
+def run(modes, iterations: int):
+    key_ring = ECDHKeyRing()
+    ecc = ECCLib()
+    key_ring.current()  # İlk dönem anahtarının türetilmesi ölçüme girmesin
+
+    print(f"{'mode':<6}{'phase':<16}{'mean ms':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for mode in modes:
+        samples = []
+        for _ in range(iterations):
+            samples.append(_ecdh(key_ring, ecc) if mode == 'ecdh' else _rsa_or_ecc(mode))
+        keygen, client, exchange = zip(*samples)
+        server_total = [k + e for k, e in zip(keygen, exchange)]
+        for phase, values in (('server keygen', keygen), ('client', client),
+                              ('server exchange', exchange), ('server total', server_total)):
+            mean, p50, p99 = _summary(values)
+            print(f"{mode:<6}{phase:<16}{mean:>10.3f}{p50:>10.3f}{p99:>10.3f}")
+        print(f"{mode:<6}{'handshakes/s':<16}{1000 / _summary(server_total)[0]:>10.0f}  (server, one core)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--modes', nargs='+', default=MODES, choices=MODES)
+    parser.add_argument('--iterations', type=int, default=100)
+    args = parser.parse_args()
+    run(args.modes, args.iterations)
+
+
+if __name__ == '__main__':
+    main()
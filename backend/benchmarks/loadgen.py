@@ -0,0 +1,377 @@
+"""
+End-to-end Socket.IO load generator with headless asyncio clients.
+
+Her istemci tarayıcıdaki app.js ile aynı protokolü konuşur: WebSocket
+üzerinden Engine.IO/Socket.IO bağlantısı, key_exchange_params ->
+server_public_key -> set_encryption_settings (RSALib/ECCLib.encrypt_key)
+-> settings_confirmed, ardından şifreli `message` / `message_response`.
+Binlerce istemci tek bir asyncio döngüsünde çalışır; WebSocket katmanı
+python-engineio'nun zaten kullandığı wsproto ile yazılmıştır.
+
+Raporlanan: bağlantı hızı, bağlantı ve el sıkışma gecikmesi, mesaj gidiş
+dönüş süresi (RTT) yüzdelikleri, mesaj hızı, hatalar ve sunucu CPU
+kullanımı (--spawn veya --server-pid ile, Linux /proc üzerinden).
+
+Kullanım (backend/ dizininden):
+    python -m benchmarks.loadgen --spawn --clients 1000 --duration 30
+    python -m benchmarks.loadgen --url http://127.0.0.1:5000 --server-pid 1234
+"""
+
+import argparse
+import asyncio
+import base64
+import collections
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Deque, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from wsproto import ConnectionType, WSConnection
+from wsproto.events import (AcceptConnection, CloseConnection, Message, Ping,
+                            RejectConnection, Request, TextMessage)
+
+from encryption import AsymmetricEncryptionFactory, SymmetricEncryptionFactory
+from server.cluster import stop_workers, wait_for_port
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# --spawn ile başlatılabilen sunucular: Flask-SocketIO (eventlet) ve asyncio/ASGI (uvicorn)
+SERVER_SCRIPTS = {'eventlet': os.path.join(BACKEND_DIR, 'app.py'), 'asgi': os.path.join(BACKEND_DIR, 'asgi.py')}
+
+
+class _WebSocket:
+    """Minimal asyncio WebSocket client (text frames only) on top of wsproto."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.ws = WSConnection(ConnectionType.CLIENT)
+        self._messages: Deque[str] = collections.deque()
+        self._partial: List[str] = []
+        self._accepted = False
+
+    @classmethod
+    async def connect(cls, host: str, port: int, target: str) -> '_WebSocket':
+        reader, writer = await asyncio.open_connection(host, port)
+        self = cls(reader, writer)
+        writer.write(self.ws.send(Request(host=f"{host}:{port}", target=target)))
+        while not self._accepted:
+            await self._pump()
+        return self
+
+    async def _pump(self) -> None:
+        # Sunucu el sıkışma cevabı ile ilk paketleri aynı okumada gönderebilir;
+        # tüm olaylar işlenir, hiçbiri atılmaz
+        data = await self.reader.read(65536)
+        if not data:
+            raise ConnectionError("Sunucu bağlantıyı kapattı")
+        self.ws.receive_data(data)
+        for event in self.ws.events():
+            if isinstance(event, TextMessage):
+                self._partial.append(event.data)
+                if event.message_finished:
+                    self._messages.append(''.join(self._partial))
+                    self._partial.clear()
+            elif isinstance(event, Ping):
+                self.writer.write(self.ws.send(event.response()))
+            elif isinstance(event, AcceptConnection):
+                self._accepted = True
+            elif isinstance(event, RejectConnection):
+                self.writer.close()
+                raise ConnectionError(f"WebSocket reddedildi ({event.status_code})")
+            elif isinstance(event, CloseConnection):
+                raise ConnectionError("Sunucu WebSocket'i kapattı")
+
+    def send(self, text: str) -> None:
+        self.writer.write(self.ws.send(Message(data=text)))
+
+    async def receive(self) -> str:
+        while not self._messages:
+            await self._pump()
+        return self._messages.popleft()
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class SocketIOClient:
+    """Engine.IO v4 / Socket.IO v5 client speaking the app.js protocol."""
+
+    def __init__(self, ws: _WebSocket):
+        self.ws = ws
+        self.cipher = None
+
+    @classmethod
+    async def connect(cls, host: str, port: int) -> 'SocketIOClient':
+        ws = await _WebSocket.connect(host, port, '/socket.io/?EIO=4&transport=websocket')
+        await ws.receive()             # Engine.IO open paketi
+        ws.send('40')                  # Varsayılan namespace'e bağlan
+        self = cls(ws)
+        while not (await ws.receive()).startswith('40'):
+            pass
+        return self
+
+    def emit(self, event: str, data: Any) -> None:
+        self.ws.send('42' + json.dumps([event, data]))
+
+    async def wait_for(self, event: str) -> Any:
+        while True:
+            packet = await self.ws.receive()
+            if packet == '2':          # ping
+                self.ws.send('3')
+            elif packet.startswith('42'):
+                name, *args = json.loads(packet[2:])
+                if name == event:
+                    return args[0] if args else None
+                if name == 'error':
+                    raise RuntimeError(args[0].get('message', args[0]))
+
+    async def handshake(self, asymmetric_algorithm: str, symmetric_algorithm: str,
+                        implementation: str) -> None:
+        self.emit('key_exchange_params', {'asymmetric_algorithm': asymmetric_algorithm})
+        public_key = base64.b64decode((await self.wait_for('server_public_key'))['public_key'])
+        symmetric_enc = SymmetricEncryptionFactory.create(symmetric_algorithm, implementation)
+        key = symmetric_enc.generate_key()
+        asymmetric_enc = AsymmetricEncryptionFactory.create(asymmetric_algorithm)
+        self.emit('set_encryption_settings', {
+            'asymmetric_algorithm': asymmetric_algorithm,
+            'symmetric_algorithm': symmetric_algorithm,
+            'symmetric_implementation': implementation,
+            'encrypted_symmetric_key': asymmetric_enc.encrypt_key(key, public_key),
+        })
+        await self.wait_for('settings_confirmed')
+        self.cipher = symmetric_enc.bind(key)
+
+    async def send_message(self, text: str) -> None:
+        self.emit('message', {'message': self.cipher.encrypt(text)})
+        response = await self.wait_for('message_response')
+        if self.cipher.decrypt(response['encrypted_payload']) != f"+{text}":
+            raise RuntimeError("Cevap beklenen mesajla eşleşmiyor")
+
+    def close(self) -> None:
+        self.ws.close()
+
+
+def _process_tree_cpu(pid: int) -> Optional[float]:
+    """User + system CPU seconds of pid and its descendants (Linux /proc)."""
+    ticks = os.sysconf('SC_CLK_TCK')
+    stats = {}
+    try:
+        for entry in os.listdir('/proc'):
+            if entry.isdigit():
+                try:
+                    with open(f'/proc/{entry}/stat') as f:
+                        fields = f.read().rsplit(')', 1)[1].split()
+                except OSError:
+                    continue
+                # fields[1] = ppid, fields[11:13] = utime, stime
+                stats[int(entry)] = (int(fields[1]), int(fields[11]) + int(fields[12]))
+    except OSError:
+        return None
+    if pid not in stats:
+        return None
+    tree, total = {pid}, 0
+    for child, (parent, _) in sorted(stats.items()):
+        if parent in tree:
+            tree.add(child)
+    for member in tree:
+        total += stats[member][1]
+    return total / ticks
+
+
+def _percentiles(samples: List[float]) -> Dict[str, Optional[float]]:
+    if not samples:
+        return {'count': 0, 'p50_ms': None, 'p90_ms': None, 'p99_ms': None, 'max_ms': None}
+    ordered = sorted(samples)
+
+    def at(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000
+
+    return {'count': len(ordered), 'p50_ms': at(0.50), 'p90_ms': at(0.90),
+            'p99_ms': at(0.99), 'max_ms': ordered[-1] * 1000}
+
+
+class LoadGenerator:
+    """Ramps up simulated clients and collects latency samples."""
+
+    def __init__(self, host: str, port: int, args: argparse.Namespace):
+        self.host = host
+        self.port = port
+        self.args = args
+        self.connect_times: List[float] = []
+        self.handshake_times: List[float] = []
+        self.rtts: List[float] = []
+        self.errors: Dict[str, int] = collections.Counter()
+        self.connected_at: List[float] = []
+        self.stopping = asyncio.Event()
+
+    def _error(self, phase: str, error: Exception) -> None:
+        # Sunucunun 'error' olayları (ör. meşgul) mesajıyla, diğerleri türüyle sayılır
+        detail = str(error) if isinstance(error, RuntimeError) else type(error).__name__
+        self.errors[f"{phase}: {detail}"] += 1
+
+    async def _client(self, index: int) -> None:
+        args = self.args
+        start = time.perf_counter()
+        try:
+            client = await asyncio.wait_for(SocketIOClient.connect(self.host, self.port), args.timeout)
+        except Exception as e:
+            self._error('connect', e)
+            return
+        connected = time.perf_counter()
+        self.connect_times.append(connected - start)
+        self.connected_at.append(connected)
+
+        try:
+            await asyncio.wait_for(
+                client.handshake(args.asymmetric, args.symmetric, args.implementation), args.timeout)
+            self.handshake_times.append(time.perf_counter() - connected)
+        except Exception as e:
+            self._error('handshake', e)
+            client.close()
+            return
+
+        text = 'M' * args.message_size
+        try:
+            # İstemciler aynı anda mesaj göndermesin diye ilk mesaj rastgele kaydırılır
+            if args.interval:
+                await asyncio.sleep(args.interval * (index % 100) / 100)
+            while not self.stopping.is_set():
+                sent = time.perf_counter()
+                await asyncio.wait_for(client.send_message(text), args.timeout)
+                self.rtts.append(time.perf_counter() - sent)
+                if args.interval:
+                    await asyncio.sleep(max(0.0, args.interval - (time.perf_counter() - sent)))
+        except Exception as e:
+            if not self.stopping.is_set():
+                self._error('message', e)
+        finally:
+            client.close()
+
+    async def run(self) -> Dict[str, Any]:
+        args = self.args
+        tasks = []
+        start = time.perf_counter()
+        for index in range(args.clients):
+            tasks.append(asyncio.ensure_future(self._client(index)))
+            if args.connect_rate:
+                await asyncio.sleep(max(0.0, start + (index + 1) / args.connect_rate - time.perf_counter()))
+        ramp_done = time.perf_counter()
+
+        await asyncio.sleep(max(0.0, start + args.duration - time.perf_counter()))
+        self.stopping.set()
+        end = time.perf_counter()
+        # Bekleyen cevaplar en fazla timeout kadar beklenir
+        await asyncio.wait(tasks, timeout=args.timeout)
+        for task in tasks:
+            task.cancel()
+
+        connect_window = (max(self.connected_at) - start) if self.connected_at else 0.0
+        return {
+            'clients': args.clients,
+            'connected': len(self.connect_times),
+            'handshakes': len(self.handshake_times),
+            'duration_s': end - start,
+            'ramp_s': ramp_done - start,
+            'connection_rate_per_s': len(self.connected_at) / connect_window if connect_window else None,
+            'connect': _percentiles(self.connect_times),
+            'handshake': _percentiles(self.handshake_times),
+            'message_rtt': _percentiles(self.rtts),
+            'messages_per_s': len(self.rtts) / (end - start),
+            'errors': dict(self.errors),
+        }
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    print(f"clients              {report['connected']}/{report['clients']} connected, "
+          f"{report['handshakes']} handshakes")
+    rate = report['connection_rate_per_s']
+    print(f"connection rate      {rate:.1f}/s" if rate else "connection rate      -")
+    print(f"{'':<21}{'count':>8}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name in ('connect', 'handshake', 'message_rtt'):
+        stats = report[name]
+        if stats['count']:
+            print(f"{name:<21}{stats['count']:>8}{stats['p50_ms']:>10.2f}{stats['p90_ms']:>10.2f}"
+                  f"{stats['p99_ms']:>10.2f}{stats['max_ms']:>10.2f}")
+    print(f"messages/s           {report['messages_per_s']:.1f}")
+    if report.get('server_cpu_percent') is not None:
+        print(f"server CPU           {report['server_cpu_percent']:.1f}% of one core")
+    print(f"loadgen CPU          {report['loadgen_cpu_percent']:.1f}% of one core")
+    for error, count in sorted(report['errors'].items()):
+        print(f"error                {error} x{count}")
+
+
+def measure(host: str, port: int, args: argparse.Namespace, spawn: Optional[str] = None,
+            server_pid: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Run one load test and add server/loadgen CPU usage to the report.
+
+    spawn: SERVER_SCRIPTS anahtarı; verilirse sunucu bu süreçte başlatılır
+    ve test bitince durdurulur.
+    """
+    server = None
+    if spawn:
+        server = subprocess.Popen([sys.executable, SERVER_SCRIPTS[spawn], '--host', host, '--port', str(port)],
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        server_pid = server.pid
+    try:
+        wait_for_port((host, port))
+        server_cpu_before = _process_tree_cpu(server_pid) if server_pid else None
+        loadgen_cpu_before = time.process_time()
+
+        report = asyncio.run(LoadGenerator(host, port, args).run())
+
+        server_cpu_after = _process_tree_cpu(server_pid) if server_pid else None
+        if server_cpu_before is not None and server_cpu_after is not None:
+            report['server_cpu_percent'] = (server_cpu_after - server_cpu_before) / report['duration_s'] * 100
+        else:
+            report['server_cpu_percent'] = None
+        report['loadgen_cpu_percent'] = (time.process_time() - loadgen_cpu_before) / report['duration_s'] * 100
+    finally:
+        if server is not None:
+            stop_workers([server])
+    return report
+
+
+def add_load_arguments(parser: argparse.ArgumentParser) -> None:
+    """Arguments shared with benchmarks.server_modes."""
+    parser.add_argument('--clients', type=int, default=100)
+    parser.add_argument('--connect-rate', type=float, default=200.0,
+                        help='Saniyede açılan yeni bağlantı (0 = sınırsız)')
+    parser.add_argument('--duration', type=float, default=20.0, help='Toplam süre (saniye)')
+    parser.add_argument('--interval', type=float, default=1.0,
+                        help='İstemci başına mesaj aralığı (saniye, 0 = cevap gelir gelmez)')
+    parser.add_argument('--asymmetric', default='ecc', choices=['rsa', 'ecc'])
+    parser.add_argument('--symmetric', default='aes')
+    parser.add_argument('--implementation', default='lib')
+    parser.add_argument('--message-size', type=int, default=64)
+    parser.add_argument('--timeout', type=float, default=30.0, help='İşlem başına zaman aşımı (saniye)')
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help='Sunucu adresi')
+    parser.add_argument('--spawn', action='store_true',
+                        help='Sunucuyu --url adresinde bu araç başlatsın (CPU ölçümü dahil)')
+    parser.add_argument('--server', default='eventlet', choices=sorted(SERVER_SCRIPTS),
+                        help='--spawn ile başlatılacak sunucu (app.py veya asgi.py)')
+    parser.add_argument('--server-pid', type=int, help='CPU ölçümü için dışarıda çalışan sunucunun PID\'i')
+    add_load_arguments(parser)
+    parser.add_argument('--output', '-o', help='JSON rapor dosyası')
+    args = parser.parse_args(argv)
+
+    url = urlsplit(args.url)
+    host, port = url.hostname or '127.0.0.1', url.port or 5000
+
+    report = measure(host, port, args, spawn=args.server if args.spawn else None, server_pid=args.server_pid)
+    _print_report(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 1 if report['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
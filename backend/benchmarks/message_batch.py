@@ -0,0 +1,91 @@
+"""
+Server throughput of per-message `message` events versus `message_batch`
+events of 10, 100 and 1000 messages.
+
+Flask-SocketIO test istemcisi kullanılır: ağ maliyeti yoktur, ölçülen
+olay gönderimi + oturum araması + şifreleme + emit toplamıdır. Sunucu
+çıktısı ölçüm sırasında /dev/null'a yönlendirilir.
+"""
+
+import argparse
+import base64
+import contextlib
+import os
+import time
+
+import app as chat
+from encryption import AsymmetricEncryptionFactory, SymmetricEncryptionFactory
+
+BATCH_SIZES = [10, 100, 1000]
+
+
+def _connect(algorithm: str, binary: bool):
+    client = chat.socketio.test_client(chat.app)
+    client.get_received()
+    symmetric_enc = SymmetricEncryptionFactory.create(algorithm, 'lib')
+    key = symmetric_enc.generate_key()
+
+    client.emit('key_exchange_params', {'asymmetric_algorithm': 'ecc'})
+    public_key = base64.b64decode(client.get_received()[0]['args'][0]['public_key'])
+    client.emit('set_encryption_settings', {
+        'asymmetric_algorithm': 'ecc',
+        'symmetric_algorithm': algorithm,
+        'symmetric_implementation': 'lib',
+        'encrypted_symmetric_key': AsymmetricEncryptionFactory.create('ecc').encrypt_key(key, public_key),
+        'binary': binary,
+    })
+    assert any(r['name'] == 'settings_confirmed' for r in client.get_received())
+    return client, symmetric_enc.bind(key)
+
+
+def _rate(fn, messages: int, budget: float) -> float:
+    sent, start = 0, time.perf_counter()
+    while sent == 0 or time.perf_counter() - start < budget:
+        fn()
+        sent += messages
+    return sent / (time.perf_counter() - start)
+
+
+def run(algorithm: str, binary: bool, batch_sizes, budget: float):
+    client, cipher = _connect(algorithm, binary)
+    text = 'merhaba dünya ' * 4
+    incoming = cipher.encrypt_bytes(text.encode('utf-8')) if binary else cipher.encrypt(text)
+
+    def single():
+        client.emit('message', {'message': incoming})
+        client.get_received()
+
+    print(f"{'mode':<16}{'msg/s':>12}{'speedup':>10}")
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        baseline = _rate(single, 1, budget)
+        rates = []
+        for size in batch_sizes:
+            batch = [incoming] * size
+
+            def batched():
+                client.emit('message_batch', {'messages': batch})
+                client.get_received()
+
+            rates.append((size, _rate(batched, size, budget)))
+
+    print(f"{'per-message':<16}{baseline:>12.0f}{1.0:>10.2f}")
+    for size, rate in rates:
+        print(f"{f'batch of {size}':<16}{rate:>12.0f}{rate / baseline:>10.2f}")
+    client.disconnect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--algorithm', default='aes')
+    parser.add_argument('--binary', action='store_true', help='İkili çerçeve modu')
+    parser.add_argument('--batch-sizes', nargs='+', type=int, default=BATCH_SIZES)
+    parser.add_argument('--budget', type=float, default=1.0, help='Ölçüm başına yaklaşık süre (saniye)')
+    args = parser.parse_args()
+    try:
+        run(args.algorithm, args.binary, args.batch_sizes, args.budget)
+    finally:
+        chat.key_pool.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Side-by-side load test of the eventlet server (app.py) and the asyncio/ASGI server (asgi.py).
+
+Her sunucu sırayla aynı portta başlatılır ve loadgen ile aynı yük
+uygulanır: bağlantı hızı, el sıkışma ve mesaj RTT yüzdelikleri, mesaj
+hızı ve sunucu CPU kullanımı tek tabloda karşılaştırılır. asgi.py için
+uvicorn kurulu olmalıdır (pip install -r requirements-asgi.txt).
+
+Kullanım (backend/ dizininden):
+    python -m benchmarks.server_modes --clients 500 --duration 30
+"""
+
+import argparse
+import importlib.util
+import json
+import sys
+from typing import Any, Dict
+
+from .loadgen import SERVER_SCRIPTS, add_load_arguments, measure
+
+ROWS = [
+    ('connected', lambda r: r['connected'], '{:.0f}'),
+    ('handshakes', lambda r: r['handshakes'], '{:.0f}'),
+    ('connections/s', lambda r: r['connection_rate_per_s'], '{:.1f}'),
+    ('connect p50 ms', lambda r: r['connect']['p50_ms'], '{:.2f}'),
+    ('handshake p50 ms', lambda r: r['handshake']['p50_ms'], '{:.2f}'),
+    ('handshake p99 ms', lambda r: r['handshake']['p99_ms'], '{:.2f}'),
+    ('message RTT p50 ms', lambda r: r['message_rtt']['p50_ms'], '{:.2f}'),
+    ('message RTT p99 ms', lambda r: r['message_rtt']['p99_ms'], '{:.2f}'),
+    ('messages/s', lambda r: r['messages_per_s'], '{:.1f}'),
+    ('server CPU %', lambda r: r['server_cpu_percent'], '{:.1f}'),
+    ('errors', lambda r: sum(r['errors'].values()), '{:.0f}'),
+]
+
+
+def _cell(fn, report: Dict[str, Any], fmt: str) -> str:
+    value = fn(report) if report else None
+    return '-' if value is None else fmt.format(value)
+
+
+def print_table(reports: Dict[str, Dict[str, Any]]) -> None:
+    print(f"{'':<22}" + ''.join(f"{server:>14}" for server in reports))
+    for name, fn, fmt in ROWS:
+        print(f"{name:<22}" + ''.join(f"{_cell(fn, report, fmt):>14}" for report in reports.values()))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--servers', nargs='+', default=['eventlet', 'asgi'], choices=sorted(SERVER_SCRIPTS))
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    add_load_arguments(parser)
+    parser.add_argument('--output', '-o', help='JSON rapor dosyası (sunucu -> loadgen raporu)')
+    args = parser.parse_args(argv)
+
+    reports = {}
+    for server in args.servers:
+        if server == 'asgi' and importlib.util.find_spec('uvicorn') is None:
+            print("asgi: uvicorn kurulu değil, atlanıyor (pip install -r requirements-asgi.txt)", file=sys.stderr)
+            reports[server] = None
+            continue
+        print(f"{server}: {args.clients} clients, {args.duration:.0f}s ...", file=sys.stderr)
+        reports[server] = measure(args.host, args.port, args, spawn=server)
+
+    print_table(reports)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(reports, f, indent=2)
+    return 1 if any(report and report['errors'] for report in reports.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
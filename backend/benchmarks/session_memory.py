@@ -0,0 +1,135 @@
+"""
+Per-session memory of the session store: dict layout vs slotted Session records.
+
+Bellek deposuna N adet el sıkışması tamamlanmış oturum yazılır ve oturum
+başına bayt (tracemalloc, Python yığını) raporlanır:
+
+- dict: önceki düzen; kaydın dict kopyası + şifreleyici, istemciden gelen
+  (intern edilmemiş) algoritma adları
+- slots: Session kaydı (__slots__), kayıt defterindeki (intern edilmiş) algoritma adları
+
+Sunucu private key'i (RSA/ECC) OpenSSL belleğinde durduğu için tracemalloc
+onu görmez; yüklenmiş bir anahtarın maliyeti ayrıca RSS farkıyla ölçülür.
+Bu, anahtar doğrulandıktan sonra kayıttan düşülen bellektir.
+
+Kullanım (backend/ dizininden):
+    python -m benchmarks.session_memory --counts 10000 100000 1000000
+"""
+
+import argparse
+import base64
+import gc
+import json
+import os
+import resource
+import time
+import tracemalloc
+
+from encryption import AsymmetricEncryptionFactory, SymmetricEncryptionFactory
+from server import KeyHandle, MemorySessionStore, build_session, cipher_id
+
+LAYOUTS = ['dict', 'slots']
+COUNTS = [10_000, 100_000, 1_000_000]
+
+
+def _dict_session(record):
+    """Önceki düzen: kaydın dict kopyası + bağlı şifreleyici."""
+    session = dict(record)
+    symmetric_enc = SymmetricEncryptionFactory.create(record['symmetric_algorithm'],
+                                                      record['symmetric_implementation'])
+    session['cipher'] = symmetric_enc.bind(record['symmetric_key'])
+    session['cipher_name'] = type(symmetric_enc).__name__
+    return session
+
+
+def _fill(layout: str, count: int, payload: bytes, key_size: int) -> MemorySessionStore:
+    store = MemorySessionStore(materialize=_dict_session if layout == 'dict' else build_session)
+    for _ in range(count):
+        # Engine.IO sid'i gibi 20 karakter; ayarlar her istemciden ayrı bir JSON olarak gelir
+        sid = base64.urlsafe_b64encode(os.urandom(15)).decode('ascii')
+        data = json.loads(payload)
+        if layout == 'dict':
+            store.update(sid, symmetric_algorithm=data['symmetric_algorithm'],
+                         symmetric_implementation=data['symmetric_implementation'],
+                         symmetric_key=os.urandom(key_size), binary=data['binary'],
+                         compression=None, compression_dictionary=None)
+        else:
+            symmetric_algorithm, symmetric_implementation = cipher_id(data['symmetric_algorithm'],
+                                                                      data['symmetric_implementation'])
+            store.update(sid, server_key=None,
+                         symmetric_algorithm=symmetric_algorithm,
+                         symmetric_implementation=symmetric_implementation,
+                         symmetric_key=os.urandom(key_size), binary=data['binary'],
+                         compression=None, compression_dictionary=None)
+    return store
+
+
+def measure_sessions(layout: str, count: int, algorithm: str, implementation: str):
+    """(bytes per session, seconds to fill) for one layout."""
+    payload = json.dumps({'symmetric_algorithm': algorithm, 'symmetric_implementation': implementation,
+                          'binary': False}).encode('utf-8')
+    key_size = len(SymmetricEncryptionFactory.create(algorithm, implementation).generate_key())
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    store = _fill(layout, count, payload, key_size)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    assert len(store) == count
+    del store
+    gc.collect()
+    return used / count, elapsed
+
+
+def _rss_bytes() -> int:
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        # /proc olmayan sistemler: en yüksek RSS (Linux dışında bayt, Linux'ta KiB)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def measure_server_key(algorithm: str, count: int) -> float:
+    """RSS bytes per loaded server private key (what dropping server_key frees)."""
+    asymmetric_enc = AsymmetricEncryptionFactory.create(algorithm, 'lib')
+    # Havuzdaki çiftler yüklenmiş tutamak döner; her oturumun kendi anahtarı olsun diye PEM'den yüklenir
+    pem = asymmetric_enc.export_private_key(asymmetric_enc.generate_key_pair()[1])
+    gc.collect()
+    before = _rss_bytes()
+    handles = [KeyHandle(algorithm, asymmetric_enc.load_private_key(pem)) for _ in range(count)]
+    used = _rss_bytes() - before
+    assert len(handles) == count
+    return used / count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--counts', nargs='+', type=int, default=COUNTS)
+    parser.add_argument('--layouts', nargs='+', default=LAYOUTS, choices=LAYOUTS)
+    parser.add_argument('--algorithm', default='aes')
+    parser.add_argument('--implementation', default='lib')
+    parser.add_argument('--server-keys', type=int, default=1000,
+                        help='Yüklenmiş private key ölçümü için anahtar sayısı (0: atla)')
+    args = parser.parse_args(argv)
+
+    if args.server_keys:
+        # Önce ölçülür: oturum ölçümlerinde serbest kalan yığın RSS farkını gizler
+        for algorithm in ('rsa', 'ecc'):
+            per_key = measure_server_key(algorithm, args.server_keys)
+            print(f"server_key {algorithm}: {per_key:.0f} bytes/session (RSS, {args.server_keys} loaded keys)")
+        print()
+
+    print(f"{'sessions':>10}{'layout':>8}{'bytes/session':>16}{'total MiB':>12}{'fill s':>9}")
+    for count in args.counts:
+        for layout in args.layouts:
+            per_session, elapsed = measure_sessions(layout, count, args.algorithm, args.implementation)
+            print(f"{count:>10}{layout:>8}{per_session:>16.0f}{per_session * count / 2 ** 20:>12.1f}"
+                  f"{elapsed:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+"""
+Benchmark suite for every registered cipher and the key exchange paths.
+
+Simetrik algoritmalar için (kayıttaki tüm algoritma/implementasyon
+çiftleri) her yük boyutunda encrypt ve decrypt, bir kez de keygen ölçülür.
+Asimetrik algoritmalar için keygen, encrypt_key ve decrypt_key ölçülür.
+
+Her işlem için: çağrı sayısı, ortalama/p50/p99 gecikme, MB/s (yük boyutu
+olan işlemlerde) ve çağrı başına ayrılan en yüksek bellek (tracemalloc).
+Bellek ölçümü ayrı çağrılarla yapılır; tracemalloc zaman ölçümüne karışmaz.
+
+Sonuçlar JSON olarak yazılır (--output). --compare önceki bir JSON ile
+p50 değerlerini karşılaştırır ve eşiği aşan gerilemede 1 ile çıkar (CI).
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from encryption import AsymmetricEncryptionFactory, SymmetricEncryptionFactory
+from encryption.asymmetric.factory import registry as asymmetric_registry
+from encryption.symmetric.factory import registry as symmetric_registry
+
+SCHEMA_VERSION = 1
+SIZES = [64, 1024, 16 * 1024, 256 * 1024]
+# Klasik şifreler metin üzerinde çalışır; tüm algoritmalar için geçerli ASCII yük
+_TEXT = b"The quick brown fox jumps over the lazy dog "
+_ALLOCATION_SAMPLES = 3
+
+
+def _payload(size: int) -> bytes:
+    return (_TEXT * (size // len(_TEXT) + 1))[:size]
+
+
+def _measure(fn: Callable[[], Any], budget: float, min_calls: int, max_calls: int) -> Dict[str, Any]:
+    fn()  # Isınma: tembel içe aktarma ve önbellekler ölçüme girmesin
+    samples: List[float] = []
+    deadline = time.perf_counter() + budget
+    while len(samples) < min_calls or (len(samples) < max_calls and time.perf_counter() < deadline):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+
+    peaks = []
+    for _ in range(_ALLOCATION_SAMPLES):
+        tracemalloc.start()
+        fn()
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    return {
+        'calls': len(samples),
+        'mean_us': sum(samples) / len(samples) * 1e6,
+        'p50_us': samples[len(samples) // 2] * 1e6,
+        'p99_us': samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1e6,
+        'alloc_peak_bytes': sorted(peaks)[len(peaks) // 2],
+    }
+
+
+def _result(group: str, algorithm: str, implementation: str, operation: str,
+            size: Optional[int], stats: Dict[str, Any]) -> Dict[str, Any]:
+    result = {'group': group, 'algorithm': algorithm, 'implementation': implementation,
+              'operation': operation, 'size': size}
+    result.update(stats)
+    result['mb_per_s'] = size / stats['mean_us'] if size else None  # bayt/us == MB/s
+    return result
+
+
+def result_key(result: Dict[str, Any]) -> str:
+    """Stable identifier of a measurement, used to match runs."""
+    size = '' if result['size'] is None else f"@{result['size']}"
+    return f"{result['group']}:{result['algorithm']}/{result['implementation']}:{result['operation']}{size}"
+
+
+def run_symmetric(pairs, sizes, budget: float, max_calls: int) -> List[Dict[str, Any]]:
+    results = []
+    for algorithm, implementation in pairs:
+        symmetric_enc = SymmetricEncryptionFactory.create(algorithm, implementation)
+        stats = _measure(symmetric_enc.generate_key, budget, 5, max_calls)
+        results.append(_result('symmetric', algorithm, implementation, 'keygen', None, stats))
+
+        cipher = symmetric_enc.bind(symmetric_enc.generate_key())
+        for size in sizes:
+            payload = _payload(size)
+            frame = cipher.encrypt_bytes(payload)
+            for operation, fn in (('encrypt', lambda: cipher.encrypt_bytes(payload)),
+                                  ('decrypt', lambda: cipher.decrypt_bytes(frame))):
+                stats = _measure(fn, budget, 5, max_calls)
+                results.append(_result('symmetric', algorithm, implementation, operation, size, stats))
+    return results
+
+
+def run_asymmetric(pairs, budget: float, max_calls: int) -> List[Dict[str, Any]]:
+    results = []
+    symmetric_key = os.urandom(32)
+    for algorithm, implementation in pairs:
+        asymmetric_enc = AsymmetricEncryptionFactory.create(algorithm, implementation)
+        public_key, private_key = asymmetric_enc.generate_key_pair()
+        encrypted = asymmetric_enc.encrypt_key(symmetric_key, public_key)
+        for operation, fn in (('keygen', asymmetric_enc.generate_key_pair),
+                              ('encrypt_key', lambda: asymmetric_enc.encrypt_key(symmetric_key, public_key)),
+                              ('decrypt_key', lambda: asymmetric_enc.decrypt_key(encrypted, private_key))):
+            stats = _measure(fn, budget, 5, max_calls)
+            results.append(_result('asymmetric', algorithm, implementation, operation, None, stats))
+    return results
+
+
+def _selected(pairs, names: Optional[List[str]]):
+    # "aes" tüm implementasyonları, "aes/manual" yalnızca birini seçer
+    if not names:
+        return pairs
+    return [(a, i) for a, i in pairs if a in names or f"{a}/{i}" in names]
+
+
+def run(algorithms: Optional[List[str]], sizes: List[int], budget: float, max_calls: int,
+        log=sys.stderr) -> Dict[str, Any]:
+    """Run the suite and return the JSON-serialisable report."""
+    results = []
+    for algorithm, implementation in _selected(symmetric_registry.available(), algorithms):
+        print(f"symmetric {algorithm}/{implementation}", file=log)
+        results.extend(run_symmetric([(algorithm, implementation)], sizes, budget, max_calls))
+    for algorithm, implementation in _selected(asymmetric_registry.available(), algorithms):
+        print(f"asymmetric {algorithm}/{implementation}", file=log)
+        results.extend(run_asymmetric([(algorithm, implementation)], budget, max_calls))
+
+    try:
+        from importlib.metadata import version
+        crypto_version = version('cryptography')
+    except Exception:
+        crypto_version = None
+    return {
+        'schema': SCHEMA_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cryptography': crypto_version,
+        'budget': budget,
+        'results': results,
+    }
+
+
+def print_table(report: Dict[str, Any], out=sys.stdout) -> None:
+    print(f"{'benchmark':<46}{'calls':>8}{'p50 us':>12}{'p99 us':>12}{'MB/s':>10}{'alloc B':>10}", file=out)
+    for result in report['results']:
+        mb = f"{result['mb_per_s']:.1f}" if result['mb_per_s'] is not None else '-'
+        print(f"{result_key(result):<46}{result['calls']:>8}{result['p50_us']:>12.1f}"
+              f"{result['p99_us']:>12.1f}{mb:>10}{result['alloc_peak_bytes']:>10}", file=out)
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float, out=sys.stdout) -> List[str]:
+    """
+    Compare p50 latency against a baseline report.
+
+    Returns:
+        Keys of measurements slower than the baseline by more than `threshold`
+        (e.g. 0.25 = 25%)
+    """
+    previous = {result_key(r): r for r in baseline.get('results', [])}
+    regressions = []
+    for result in report['results']:
+        key = result_key(result)
+        before = previous.get(key)
+        if before is None or not before['p50_us']:
+            continue
+        change = result['p50_us'] / before['p50_us'] - 1
+        if change > threshold:
+            regressions.append(key)
+            print(f"REGRESSION {key}: p50 {before['p50_us']:.1f} -> {result['p50_us']:.1f} us "
+                  f"(+{change:.0%})", file=out)
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--algorithms', nargs='+',
+                        help='Yalnızca bu algoritmalar ("aes" veya "aes/manual" biçiminde)')
+    parser.add_argument('--sizes', nargs='+', type=int, default=SIZES)
+    parser.add_argument('--budget', type=float, default=0.2, help='Ölçüm başına yaklaşık süre (saniye)')
+    parser.add_argument('--max-calls', type=int, default=2000, help='Ölçüm başına en fazla çağrı')
+    parser.add_argument('--output', '-o', help='JSON sonuç dosyası ("-" = stdout)')
+    parser.add_argument('--compare', help='Karşılaştırılacak önceki JSON sonuç dosyası')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Gerileme sayılacak p50 artışı (0.25 = %%25)')
+    args = parser.parse_args(argv)
+
+    report = run(args.algorithms, args.sizes, args.budget, args.max_calls)
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print_table(report)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold, out=sys.stderr):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+Bytes on the wire and CPU per message for the base64 (default) and the
+binary Socket.IO framing of the message path.
+
+Her mesaj için: istemci şifreler -> Socket.IO paketi kodlanır -> sunucu
+paketi çözer, deşifre eder, '+' ekler, tekrar şifreler -> cevap paketi.
+"""
+
+import argparse
+import time
+
+from socketio import packet
+
+from encryption import SymmetricEncryptionFactory
+
+COMBINATIONS = [('aes', 'lib'), ('aes', 'manual'), ('des', 'lib'), ('des', 'manual')]
+SIZES = [64, 1024, 64 * 1024, 1024 * 1024]
+
+
+def _wire_size(encoded) -> int:
+    # Binary paketler [metin başlık, ek1, ...] listesi olarak kodlanır
+    if isinstance(encoded, list):
+        return sum(len(part) if isinstance(part, bytes) else len(part.encode('utf-8'))
+                   for part in encoded)
+    return len(encoded.encode('utf-8'))
+
+
+def _decode_packet(encoded) -> list:
+    if isinstance(encoded, list):
+        pkt = packet.Packet(encoded_packet=encoded[0])
+        for attachment in encoded[1:]:
+            pkt.add_attachment(attachment)
+        return pkt.data
+    return packet.Packet(encoded_packet=encoded).data
+
+
+def _round_trip(cipher, payload, binary: bool) -> int:
+    if binary:
+        outgoing = cipher.encrypt_bytes(payload)
+    else:
+        outgoing = cipher.encrypt(payload)
+    request = packet.Packet(packet.EVENT, data=['message', {'message': outgoing}]).encode()
+
+    incoming = _decode_packet(request)[1]['message']
+    if binary:
+        response = cipher.encrypt_bytes(b"+" + cipher.decrypt_bytes(incoming))
+    else:
+        response = cipher.encrypt(f"+{cipher.decrypt(incoming)}")
+    reply = packet.Packet(packet.EVENT, data=['message_response', {'encrypted_payload': response}]).encode()
+    _decode_packet(reply)
+    return _wire_size(request) + _wire_size(reply)
+
+
+def run(sizes, iterations: int):
+    print(f"{'algorithm':<14}{'size':>9}{'mode':>8}{'wire bytes':>12}{'CPU us/msg':>12}")
+    for algorithm, implementation in COMBINATIONS:
+        symmetric_enc = SymmetricEncryptionFactory.create(algorithm, implementation)
+        cipher = symmetric_enc.bind(symmetric_enc.generate_key())
+        for size in sizes:
+            text = 'M' * size
+            for binary in (False, True):
+                payload = text.encode('utf-8') if binary else text
+                count = max(1, iterations * 64 // max(size, 64))
+                start = time.process_time()
+                for _ in range(count):
+                    wire = _round_trip(cipher, payload, binary)
+                cpu = (time.process_time() - start) / count
+                mode = 'binary' if binary else 'base64'
+                print(f"{algorithm + '/' + implementation:<14}{size:>9}{mode:>8}"
+                      f"{wire:>12}{cpu * 1e6:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--iterations', type=int, default=500)
+    args = parser.parse_args()
+    run(SIZES, args.iterations)
+
+
+if __name__ == '__main__':
+    main()
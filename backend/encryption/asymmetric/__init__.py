@@ -1,11 +1,16 @@
 """
 Asymmetric encryption module for key exchange.
 Supports RSA and ECC with library implementations only.
+
+Şifre sınıfları ilk erişimde içe aktarılır.
 """
 
-from .rsa_lib import RSALib
-from .ecc_lib import ECCLib
+from ..registry import lazy_exports
 from .factory import AsymmetricEncryptionFactory
 
-__all__ = ['RSALib', 'ECCLib', 'AsymmetricEncryptionFactory']
+__getattr__ = lazy_exports(globals(), {
+    'RSALib': '.rsa_lib',
+    'ECCLib': '.ecc_lib',
+})
 
+__all__ = ['RSALib', 'ECCLib', 'AsymmetricEncryptionFactory']
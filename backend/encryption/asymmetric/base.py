@@ -3,14 +3,20 @@ Base class for asymmetric encryption implementations.
 """
 
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import Any, Tuple, Union
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.backends import default_backend
+
+# Yüklenmiş (deserialize edilmiş) private key nesnesi
+PrivateKeyHandle = Any
 
 
 class AsymmetricEncryption(ABC):
     """Abstract base class for asymmetric encryption algorithms."""
     
     @abstractmethod
-    def generate_key_pair(self, key_size: int = None) -> Tuple[bytes, bytes]:
+    def generate_key_pair(self, key_size: int = None) -> Tuple[bytes, PrivateKeyHandle]:
         """
         Generate a public/private key pair.
         
@@ -18,9 +24,45 @@ class AsymmetricEncryption(ABC):
             key_size: Size of the key in bits
             
         Returns:
-            Tuple of (public_key, private_key) as bytes
+            Tuple of (public_key as DER bytes, loaded private key handle)
         """
         pass
+
+    def load_private_key(self, private_key: Union[bytes, PrivateKeyHandle]) -> PrivateKeyHandle:
+        """
+        Return a loaded private key handle.
+        
+        Args:
+            private_key: PEM bytes or an already loaded handle
+            
+        Returns:
+            Private key handle (handles are passed through untouched)
+        """
+        if isinstance(private_key, (bytes, bytearray, memoryview)):
+            return serialization.load_pem_private_key(
+                bytes(private_key),
+                password=None,
+                backend=default_backend()
+            )
+        return private_key
+
+    def export_private_key(self, private_key: Union[bytes, PrivateKeyHandle]) -> bytes:
+        """
+        Serialize a private key to PEM (PKCS8), only for persisting or exporting it.
+        
+        Args:
+            private_key: Loaded handle or PEM bytes
+            
+        Returns:
+            PEM encoded private key
+        """
+        if isinstance(private_key, (bytes, bytearray, memoryview)):
+            return bytes(private_key)
+        return private_key.private_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PrivateFormat.PKCS8,
+            encryption_algorithm=serialization.NoEncryption()
+        )
     
     @abstractmethod
     def encrypt_key(self, symmetric_key: bytes, public_key: bytes) -> str:
@@ -37,13 +79,13 @@ class AsymmetricEncryption(ABC):
         pass
     
     @abstractmethod
-    def decrypt_key(self, encrypted_key: str, private_key: bytes) -> bytes:
+    def decrypt_key(self, encrypted_key: str, private_key: Union[bytes, PrivateKeyHandle]) -> bytes:
         """
         Decrypt an encrypted symmetric key using the private key.
         
         Args:
             encrypted_key: Base64 encoded encrypted key
-            private_key: Private key for decryption
+            private_key: Loaded private key handle (PEM bytes are also accepted)
             
         Returns:
             Decrypted symmetric key as bytes
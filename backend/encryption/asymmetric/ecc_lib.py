@@ -13,27 +13,21 @@ class ECCLib(AsymmetricEncryption):
     """ECC encryption implementation using cryptography library."""
 
     def generate_key_pair(self, key_size: int = None) -> tuple:
-        """Generate ECC key pair (NIST P-256)."""
+        """Generate ECC key pair (NIST P-256), private key as a loaded handle."""
         private_key = ec.generate_private_key(
             ec.SECP256R1(),
             default_backend()
         )
         public_key = private_key.public_key()
 
-        # Private key: PEM format (Backend kullanımı için standart)
-        private_pem = private_key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.PKCS8,
-            encryption_algorithm=serialization.NoEncryption()
-        )
-
         # Public key: DER (SPKI) format - Web Crypto API ile en uyumlu format
         public_der = public_key.public_bytes(
             encoding=serialization.Encoding.DER,
             format=serialization.PublicFormat.SubjectPublicKeyInfo
         )
 
-        return public_der, private_pem
+        # Private key PEM'e yalnızca export_private_key ile çevrilir
+        return public_der, private_key
 
     def encrypt_key(self, symmetric_key: bytes, public_key: bytes) -> str:
         """Simetrik anahtarı ECC (ECDH + HKDF) kullanarak şifreler."""
@@ -76,11 +70,11 @@ class ECCLib(AsymmetricEncryption):
         combined = ephemeral_pub + b'|||' + encrypted
         return base64.b64encode(combined).decode('utf-8')
 
-    def decrypt_key(self, encrypted_key: str, private_key: bytes) -> bytes:
+    def decrypt_key(self, encrypted_key: str, private_key) -> bytes:
         """Sunucuya gelen şifreli simetrik anahtarı çözer."""
         try:
-            # Private key'i yükle
-            priv_key = serialization.load_pem_private_key(private_key, password=None, backend=default_backend())
+            # Handle ise olduğu gibi kullanılır, PEM ise yüklenir
+            priv_key = self.load_private_key(private_key)
 
             # Base64 çöz
             combined = base64.b64decode(encrypted_key)
@@ -116,4 +110,46 @@ class ECCLib(AsymmetricEncryption):
             return symmetric_key
         except Exception as e:
             print(f"ECC Decryption Error: {str(e)}")
-            raise e
\ No newline at end of file
+            raise e
+
+    def load_public_key(self, public_key: bytes) -> ec.EllipticCurvePublicKey:
+        """Load a P-256 public key from DER (SPKI), PEM or a raw encoded point."""
+        try:
+            return serialization.load_der_public_key(public_key, default_backend())
+        except Exception:
+            try:
+                return serialization.load_pem_public_key(public_key, default_backend())
+            except Exception:
+                return ec.EllipticCurvePublicKey.from_encoded_point(ec.SECP256R1(), public_key)
+
+    def derive_key(self, private_key, peer_public_key: bytes, length: int = 32,
+                   salt: bytes = b"", info: bytes = b"") -> bytes:
+        """
+        ECDH + HKDF-SHA256: derive a shared key directly, without encrypting one.
+
+        Args:
+            private_key: Own private key handle (PEM bytes are also accepted)
+            peer_public_key: Peer public key (DER, PEM or raw point)
+            length: Derived key length in bytes
+            salt: HKDF salt
+            info: HKDF info (binds the key to its purpose)
+
+        Returns:
+            Derived key bytes
+        """
+        priv_key = self.load_private_key(private_key)
+        shared_secret = priv_key.exchange(ec.ECDH(), self.load_public_key(peer_public_key))
+        return HKDF(
+            algorithm=hashes.SHA256(),
+            length=length,
+            salt=salt,
+            info=info,
+            backend=default_backend()
+        ).derive(shared_secret)
+
+    def public_key_bytes(self, private_key) -> bytes:
+        """DER (SPKI) encoding of the public half of a private key."""
+        return self.load_private_key(private_key).public_key().public_bytes(
+            encoding=serialization.Encoding.DER,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo
+        )
@@ -3,33 +3,39 @@ Factory for creating asymmetric encryption instances.
 Only library implementations are supported for key exchange.
 """
 
-from .rsa_lib import RSALib
-from .ecc_lib import ECCLib
-from .base import AsymmetricEncryption
+from typing import TYPE_CHECKING
+
+from ..registry import CipherRegistry
+
+if TYPE_CHECKING:
+    from .base import AsymmetricEncryption
+
+# Şifre modülleri ilk kullanımda içe aktarılır (bkz. encryption/registry.py)
+registry = CipherRegistry(__package__, 'crypto_chat.asymmetric')
+registry.register('rsa', 'lib', '.rsa_lib:RSALib')
+registry.register('ecc', 'lib', '.ecc_lib:ECCLib')
 
 
 class AsymmetricEncryptionFactory:
     """Factory for creating asymmetric encryption instances."""
     
     @staticmethod
-    def create(algorithm: str, implementation: str = 'lib') -> AsymmetricEncryption:
+    def create(algorithm: str, implementation: str = 'lib') -> 'AsymmetricEncryption':
         """
         Create an asymmetric encryption instance.
         Only library implementation is supported for key exchange.
         
         Args:
-            algorithm: 'rsa' or 'ecc'
+            algorithm: 'rsa', 'ecc' or one added through the
+                'crypto_chat.asymmetric' entry points
             implementation: 'lib' (only library is supported)
             
         Returns:
             AsymmetricEncryption instance
         """
-        algorithm = algorithm.lower()
-        
-        if algorithm == 'rsa':
-            return RSALib()
-        elif algorithm == 'ecc':
-            return ECCLib()
-        else:
-            raise ValueError(f"Unknown algorithm: {algorithm}")
+        return registry.create(algorithm, implementation)
 
+    @staticmethod
+    def register(algorithm: str, implementation: str, target) -> None:
+        """Register a cipher class or "module:Class" string."""
+        registry.register(algorithm, implementation, target)
@@ -13,7 +13,7 @@ class RSALib(AsymmetricEncryption):
     """RSA encryption implementation using cryptography library."""
 
     def generate_key_pair(self, key_size: int = 2048) -> tuple:
-        """Generate RSA key pair."""
+        """Generate RSA key pair (private key is returned as a loaded handle)."""
         private_key = rsa.generate_private_key(
             public_exponent=65537,
             key_size=key_size,
@@ -21,20 +21,14 @@ class RSALib(AsymmetricEncryption):
         )
         public_key = private_key.public_key()
 
-        # Private key: PEM format
-        private_pem = private_key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.PKCS8,
-            encryption_algorithm=serialization.NoEncryption()
-        )
-
         # Public key: DER format (Web Crypto API'nin beklediği standart SPKI formatı)
         public_der = public_key.public_bytes(
             encoding=serialization.Encoding.DER,
             format=serialization.PublicFormat.SubjectPublicKeyInfo
         )
 
-        return public_der, private_pem
+        # Private key PEM'e yalnızca export_private_key ile çevrilir
+        return public_der, private_key
 
     def encrypt_key(self, symmetric_key: bytes, public_key: bytes) -> str:
         """Encrypt symmetric key using RSA public key."""
@@ -57,15 +51,11 @@ class RSALib(AsymmetricEncryption):
 
         return base64.b64encode(encrypted_key).decode('utf-8')
 
-    def decrypt_key(self, encrypted_key: str, private_key: bytes) -> bytes:
-        """Decrypt symmetric key using RSA private key."""
+    def decrypt_key(self, encrypted_key: str, private_key) -> bytes:
+        """Decrypt symmetric key using RSA private key handle."""
         try:
-            # Private key yükle
-            priv_key = serialization.load_pem_private_key(
-                private_key,
-                password=None,
-                backend=default_backend()
-            )
+            # Handle ise olduğu gibi kullanılır, PEM ise yüklenir
+            priv_key = self.load_private_key(private_key)
 
             # Base64 decode
             encrypted_data = base64.b64decode(encrypted_key)
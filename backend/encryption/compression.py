@@ -0,0 +1,307 @@
+"""
+Optional compression stage in front of the symmetric ciphers.
+
+Düz metin şifrelenmeden önce sıkıştırılır; şifreli metin sıkıştırılamadığı
+için sıra önemlidir. Her çerçevenin ilk baytı (şifrenin içinde) yükün
+sıkıştırılıp sıkıştırılmadığını söyler, böylece eşik altındaki veya
+sıkıştırmadan kazanç sağlamayan mesajlar olduğu gibi gönderilir.
+
+zlib (ham deflate) oturum başına ortak bir sözlük kullanır: kısa sohbet
+mesajları sözlükteki kalıplara başvurarak da küçülür. lzma (ham LZMA2)
+büyük metinlerde daha iyi oran verir ama sözlük desteklemez.
+"""
+
+import base64
+import lzma
+from abc import ABC, abstractmethod
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional, Union
+
+from .symmetric.base import BytesLike, CipherContext, StreamTransform, TextCipher, _copy_into
+
+# Çerçevenin ilk baytı
+STORED = 0
+COMPRESSED = 1
+
+# Bu boyutun altındaki yükler sıkıştırılmaz (bayt); sözlük sayesinde kısa mesajlar da küçülür
+DEFAULT_THRESHOLD = 16
+# Açılan yükün üst sınırı (sıkıştırma bombalarına karşı); Socket.IO tampon sınırıyla aynı
+DEFAULT_MAX_OUTPUT = 10 * 1024 * 1024
+
+# İstemci sözlük göndermezse kullanılan zlib sözlüğü. zlib sözlüğün sonundaki
+# baytları daha kısa mesafeyle kodladığı için en sık kalıplar sondadır.
+DEFAULT_DICTIONARY = (
+    '{"type":"file","name":"","size":,"content":"data:application/octet-stream;base64,'
+    'https://www. .com .org .net .html .json .pdf .png .jpg .txt '
+    'because about after again also always another anything around before being between '
+    'could didn\'t doesn\'t don\'t every first from going good great have here I\'m it\'s '
+    'just know like little look make maybe more much need never nothing only other people '
+    'please really right should something still sure than thank thanks that that\'s their '
+    'them then there these they thing think this though time today tomorrow very want '
+    'what when where which while will with would yeah year you your you\'re '
+    'ama ben bir bu burada çok daha değil diye gibi gün güzel hayır için iyi kadar merhaba '
+    'nasıl ne neden olarak olan sonra şey şimdi tamam teşekkürler var ve ya yarın yok '
+    'the and to of a in is that for it on you with this be are have not as at '
+).encode('utf-8')
+# zlib sözlüğünün pencere boyutunu aşan kısmı kullanılmaz
+MAX_DICTIONARY_SIZE = 32 * 1024
+
+
+class CompressionStats:
+    """Thread-safe byte and CPU-time totals per codec (read by /metrics)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._codecs: Dict[str, Dict[str, float]] = {}
+
+    def _totals(self, codec: str) -> Dict[str, float]:
+        totals = self._codecs.get(codec)
+        if totals is None:
+            totals = self._codecs[codec] = {
+                'compressed': 0, 'skipped': 0, 'decompressed': 0,
+                'bytes_in': 0, 'bytes_out': 0,
+                'compress_cpu_seconds': 0.0, 'decompress_cpu_seconds': 0.0,
+            }
+        return totals
+
+    def record_compress(self, codec: str, size: int, compressed_size: Optional[int], cpu: float) -> None:
+        """compressed_size None: sıkıştırma denenmedi veya kazanç yoktu, yük olduğu gibi gönderildi."""
+        with self._lock:
+            totals = self._totals(codec)
+            totals['compress_cpu_seconds'] += cpu
+            totals['bytes_in'] += size
+            if compressed_size is None:
+                totals['skipped'] += 1
+                totals['bytes_out'] += size
+            else:
+                totals['compressed'] += 1
+                totals['bytes_out'] += compressed_size
+
+    def record_decompress(self, codec: str, cpu: float) -> None:
+        with self._lock:
+            totals = self._totals(codec)
+            totals['decompressed'] += 1
+            totals['decompress_cpu_seconds'] += cpu
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Totals per codec; ratio is outgoing payload bytes / original bytes."""
+        with self._lock:
+            snapshot = {codec: dict(totals) for codec, totals in self._codecs.items()}
+        for totals in snapshot.values():
+            totals['ratio'] = totals['bytes_out'] / totals['bytes_in'] if totals['bytes_in'] else None
+        return snapshot
+
+
+class Codec(ABC):
+    """One compression algorithm; codecs without preset dictionaries reject a dictionary."""
+
+    name = None
+    supports_dictionary = False
+
+    @abstractmethod
+    def compress(self, data: BytesLike, dictionary: Optional[bytes]) -> bytes:
+        """Compress data (with the shared preset dictionary, if any)."""
+        pass
+
+    @abstractmethod
+    def decompress(self, data: BytesLike, dictionary: Optional[bytes], max_output: int) -> bytes:
+        """
+        Inverse of compress.
+
+        Raises:
+            ValueError: Corrupt or truncated data, or more than max_output bytes
+        """
+        pass
+
+    def _check_dictionary(self, dictionary: Optional[bytes]) -> None:
+        if dictionary and not self.supports_dictionary:
+            raise ValueError(f"{self.name} sıkıştırma sözlüğü desteklemiyor")
+
+
+class ZlibCodec(Codec):
+    """Raw deflate (no zlib header/checksum; the cipher already frames the payload)."""
+
+    name = 'zlib'
+    supports_dictionary = True
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def compress(self, data: BytesLike, dictionary: Optional[bytes]) -> bytes:
+        if dictionary:
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=dictionary)
+        else:
+            compressor = zlib.compressobj(self.level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        return compressor.compress(data) + compressor.flush()
+
+    def decompress(self, data: BytesLike, dictionary: Optional[bytes], max_output: int) -> bytes:
+        if dictionary:
+            decompressor = zlib.decompressobj(-zlib.MAX_WBITS, zdict=dictionary)
+        else:
+            decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        try:
+            result = decompressor.decompress(data, max_output)
+        except zlib.error as e:
+            raise ValueError(f"Sıkıştırılmış mesaj açılamadı: {e}") from None
+        if decompressor.unconsumed_tail:
+            raise ValueError(f"Açılan mesaj {max_output} bayt sınırını aşıyor")
+        if not decompressor.eof:
+            raise ValueError("Sıkıştırılmış mesaj eksik")
+        return result
+
+
+class LzmaCodec(Codec):
+    """Raw LZMA2 stream (no .xz container); preset dictionaries are not supported."""
+
+    name = 'lzma'
+
+    def __init__(self, preset: int = 6):
+        self.filters = [{'id': lzma.FILTER_LZMA2, 'preset': preset}]
+
+    def compress(self, data: BytesLike, dictionary: Optional[bytes]) -> bytes:
+        self._check_dictionary(dictionary)
+        return lzma.compress(data, format=lzma.FORMAT_RAW, filters=self.filters)
+
+    def decompress(self, data: BytesLike, dictionary: Optional[bytes], max_output: int) -> bytes:
+        self._check_dictionary(dictionary)
+        decompressor = lzma.LZMADecompressor(format=lzma.FORMAT_RAW, filters=self.filters)
+        try:
+            result = decompressor.decompress(data, max_output)
+        except lzma.LZMAError as e:
+            raise ValueError(f"Sıkıştırılmış mesaj açılamadı: {e}") from None
+        if not decompressor.eof:
+            if not decompressor.needs_input:
+                raise ValueError(f"Açılan mesaj {max_output} bayt sınırını aşıyor")
+            raise ValueError("Sıkıştırılmış mesaj eksik")
+        return result
+
+
+CODECS: Dict[str, Codec] = {codec.name: codec for codec in (ZlibCodec(), LzmaCodec())}
+
+
+class CompressedContext:
+    """
+    CipherContext wrapper that compresses plaintext before encryption.
+
+    Frame plaintext: 1 flag byte (STORED / COMPRESSED) + payload. Streams
+    (encryptor/decryptor) are passed through uncompressed.
+    """
+
+    __slots__ = ('context', 'codec', 'dictionary', 'threshold', 'max_output', 'stats')
+
+    def __init__(self, context: CipherContext, codec: Codec, dictionary: Optional[bytes] = None,
+                 threshold: int = DEFAULT_THRESHOLD, max_output: int = DEFAULT_MAX_OUTPUT,
+                 stats: Optional[CompressionStats] = None):
+        self.context = context
+        self.codec = codec
+        self.dictionary = dictionary
+        self.threshold = threshold
+        self.max_output = max_output
+        self.stats = stats
+
+    @property
+    def cipher(self):
+        return self.context.cipher
+
+    def pack(self, data: BytesLike) -> bytes:
+        """Flag byte + compressed payload, or + the original bytes if compression does not pay off."""
+        start = time.thread_time()
+        compressed = self.codec.compress(data, self.dictionary) if len(data) >= self.threshold else None
+        if compressed is not None and len(compressed) >= len(data):
+            compressed = None
+        if self.stats is not None:
+            self.stats.record_compress(self.codec.name, len(data), None if compressed is None else len(compressed),
+                                       time.thread_time() - start)
+        if compressed is None:
+            return bytes((STORED,)) + bytes(data)
+        return bytes((COMPRESSED,)) + compressed
+
+    def unpack(self, payload: BytesLike) -> bytes:
+        """Inverse of pack."""
+        view = memoryview(payload)
+        if not view:
+            raise ValueError("Sıkıştırma başlığı eksik")
+        flag = view[0]
+        if flag == STORED:
+            return bytes(view[1:])
+        if flag != COMPRESSED:
+            raise ValueError(f"Bilinmeyen sıkıştırma başlığı: {flag}")
+        start = time.thread_time()
+        data = self.codec.decompress(view[1:], self.dictionary, self.max_output)
+        if self.stats is not None:
+            self.stats.record_decompress(self.codec.name, time.thread_time() - start)
+        return data
+
+    def encrypt_bytes(self, data: BytesLike) -> bytes:
+        return self.context.encrypt_bytes(self.pack(data))
+
+    def decrypt_bytes(self, frame: BytesLike) -> bytes:
+        return self.unpack(self.context.decrypt_bytes(frame))
+
+    def encrypt(self, plaintext: str) -> str:
+        return base64.b64encode(self.encrypt_bytes(plaintext.encode('utf-8'))).decode('ascii')
+
+    def decrypt(self, ciphertext: str) -> str:
+        return self.decrypt_bytes(base64.b64decode(ciphertext)).decode('utf-8')
+
+    def encrypt_into(self, data: BytesLike, out: Union[bytearray, memoryview]) -> int:
+        return self.context.encrypt_into(self.pack(data), out)
+
+    def decrypt_into(self, frame: BytesLike, out: Union[bytearray, memoryview]) -> int:
+        # Açılan boyut önceden bilinmez; düz metin açıldıktan sonra kopyalanır
+        return _copy_into(self.decrypt_bytes(frame), out)
+
+    def max_frame_size(self, length: int) -> Optional[int]:
+        # pack kazanç yoksa yükü olduğu gibi bırakır: en fazla 1 baytlık başlık eklenir
+        return self.context.max_frame_size(length + 1)
+
+    def max_plaintext_size(self, frame_length: int) -> Optional[int]:
+        payload_size = self.context.max_plaintext_size(frame_length)
+        if payload_size is None:
+            return None
+        return max(payload_size - 1, self.max_output)
+
+    def encryptor(self) -> StreamTransform:
+        return self.context.encryptor()
+
+    def decryptor(self) -> StreamTransform:
+        return self.context.decryptor()
+
+
+def compress_context(context: CipherContext, codec_name: str, dictionary: Optional[bytes] = None,
+                     threshold: int = DEFAULT_THRESHOLD, max_output: int = DEFAULT_MAX_OUTPUT,
+                     stats: Optional[CompressionStats] = None) -> CompressedContext:
+    """
+    Wrap a bound cipher with the named compression codec.
+
+    Args:
+        context: Result of SymmetricEncryption.bind
+        codec_name: 'zlib' or 'lzma'
+        dictionary: Shared zlib dictionary (None: DEFAULT_DICTIONARY for zlib)
+        threshold: Payloads shorter than this are sent uncompressed
+        max_output: Upper bound for a decompressed payload
+        stats: Optional CompressionStats receiving sizes and CPU time
+
+    Raises:
+        ValueError: Unknown codec, oversized dictionary, a dictionary for a
+            codec without one, or a text cipher (their frames must stay valid UTF-8)
+    """
+    validate(context.cipher, codec_name, dictionary)
+    codec = CODECS[codec_name]
+    if dictionary is None and codec.supports_dictionary:
+        dictionary = DEFAULT_DICTIONARY
+    return CompressedContext(context, codec, dictionary, threshold, max_output, stats)
+
+
+def validate(cipher: Any, codec_name: str, dictionary: Optional[bytes] = None) -> None:
+    """Check a negotiated compression setting before it is stored in a session."""
+    if codec_name not in CODECS:
+        raise ValueError(f"Desteklenmeyen sıkıştırma: {codec_name} (desteklenenler: {', '.join(CODECS)})")
+    if isinstance(cipher, TextCipher):
+        raise ValueError("Sıkıştırma yalnızca bayt tabanlı şifrelerle kullanılabilir")
+    if dictionary and not CODECS[codec_name].supports_dictionary:
+        raise ValueError(f"{codec_name} sıkıştırma sözlüğü desteklemiyor")
+    if dictionary is not None and len(dictionary) > MAX_DICTIONARY_SIZE:
+        raise ValueError(f"Sıkıştırma sözlüğü en fazla {MAX_DICTIONARY_SIZE} bayt olabilir")
@@ -0,0 +1,170 @@
+"""
+Lazy (algorithm, implementation) -> class registry used by the factories.
+
+Girdiler "modül:Sınıf" dizgesi olarak kaydedilir ve ilk kullanımda bir
+kez içe aktarılır; böylece `import encryption` cryptography'yi ve
+kullanılmayan şifre modüllerini yüklemez. Çözülen sınıf çağrıldığı ham
+(algorithm, implementation) çiftiyle önbelleğe alınır, sonraki create
+çağrıları tek bir sözlük aramasıdır.
+
+Üçüncü taraf şifreler paket meta verisindeki giriş noktalarıyla
+(entry points) eklenir. Giriş noktası adı "algoritma" (lib) veya
+"algoritma.uygulama" biçimindedir; yerleşik girdiler önceliklidir:
+
+    [project.entry-points."crypto_chat.symmetric"]
+    twofish = "my_package.twofish:TwofishLib"
+    "twofish.manual" = "my_package.twofish:TwofishManual"
+"""
+
+import importlib
+import sys
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_IMPLEMENTATION = 'lib'
+
+# İstemciden gelen farklı yazımlar (büyük/küçük harf vb.) önbelleği sınırsız büyütmesin
+_MAX_ALIASES = 256
+
+
+def _load_target(package: str, target: Any) -> type:
+    if isinstance(target, str):
+        module_name, _, attribute = target.partition(':')
+        return getattr(importlib.import_module(module_name, package), attribute)
+    if hasattr(target, 'load'):  # importlib.metadata.EntryPoint
+        return target.load()
+    return target
+
+
+def _group_entry_points(group: str) -> list:
+    # importlib.metadata pahalı bir içe aktarmadır; yalnızca bilinmeyen bir ad istendiğinde yüklenir
+    from importlib.metadata import entry_points
+    found = entry_points()
+    if hasattr(found, 'select'):  # Python 3.10+
+        return list(found.select(group=group))
+    return list(found.get(group, []))
+
+
+class CipherRegistry:
+    """Maps (algorithm, implementation) to a lazily imported cipher class."""
+
+    def __init__(self, package: str, entry_point_group: str):
+        self.package = package
+        self.entry_point_group = entry_point_group
+        self._entries: Dict[Tuple[str, str], Any] = {}
+        self._resolved: Dict[Tuple[str, str], type] = {}
+        self._entry_points_loaded = False
+        self._lock = threading.Lock()
+
+    def register(self, algorithm: str, implementation: str, target: Any) -> None:
+        """
+        Register a cipher.
+
+        Args:
+            algorithm: Algorithm name, e.g. 'aes'
+            implementation: 'lib', 'manual', ...
+            target: The class, a "module:Class" string (relative to the
+                registry's package when it starts with '.') or an entry point
+        """
+        with self._lock:
+            self._entries[(sys.intern(algorithm.lower()), sys.intern(implementation.lower()))] = target
+            self._resolved.clear()
+
+    def _load_entry_points(self) -> None:
+        with self._lock:
+            if self._entry_points_loaded:
+                return
+            self._entry_points_loaded = True
+            for entry_point in _group_entry_points(self.entry_point_group):
+                algorithm, _, implementation = entry_point.name.lower().partition('.')
+                key = (sys.intern(algorithm), sys.intern(implementation or DEFAULT_IMPLEMENTATION))
+                self._entries.setdefault(key, entry_point)
+
+    def _lookup(self, algorithm: str, implementation: str) -> Any:
+        # Bilinmeyen uygulama adları algoritmanın lib sürümüne düşer
+        return (self._entries.get((algorithm, implementation))
+                or self._entries.get((algorithm, DEFAULT_IMPLEMENTATION)))
+
+    def resolve(self, algorithm: str, implementation: str = DEFAULT_IMPLEMENTATION) -> type:
+        """
+        Return the class registered for (algorithm, implementation).
+
+        Raises:
+            ValueError: If the algorithm is not registered
+        """
+        cls = self._resolved.get((algorithm, implementation))
+        if cls is not None:
+            return cls
+
+        normalized = (algorithm.lower(), implementation.lower())
+        target = self._lookup(*normalized)
+        if target is None and not self._entry_points_loaded:
+            self._load_entry_points()
+            target = self._lookup(*normalized)
+        if target is None:
+            raise ValueError(f"Unknown algorithm: {normalized[0]}")
+
+        cls = _load_target(self.package, target)
+        if len(self._resolved) < _MAX_ALIASES:
+            self._resolved[(algorithm, implementation)] = cls
+        return cls
+
+    def _registered_key(self, algorithm: str, implementation: str) -> Optional[Tuple[str, str]]:
+        for key in ((algorithm, implementation), (algorithm, DEFAULT_IMPLEMENTATION)):
+            if key in self._entries:
+                return key
+        return None
+
+    def canonical(self, algorithm: str, implementation: str = DEFAULT_IMPLEMENTATION) -> Tuple[str, str]:
+        """
+        Registered (algorithm, implementation) key that the pair resolves to.
+
+        Büyük/küçük harf farkı ve bilinmeyen uygulama (lib'e düşer) kayıttaki
+        ada çevrilir. Kayıtlı adlar intern edildiği için dönen dizgeler tüm
+        çağrılarda aynı nesnelerdir; kayıtsız adlar intern edilmez.
+
+        Raises:
+            ValueError: If the algorithm is not registered
+        """
+        normalized = (algorithm.lower(), implementation.lower())
+        key = self._registered_key(*normalized)
+        if key is None and not self._entry_points_loaded:
+            self._load_entry_points()
+            key = self._registered_key(*normalized)
+        if key is None:
+            raise ValueError(f"Unknown algorithm: {normalized[0]}")
+        return sys.intern(key[0]), sys.intern(key[1])
+
+    def create(self, algorithm: str, implementation: str = DEFAULT_IMPLEMENTATION) -> Any:
+        """Instantiate the class registered for (algorithm, implementation)."""
+        cls = self._resolved.get((algorithm, implementation))
+        if cls is None:
+            cls = self.resolve(algorithm, implementation)
+        return cls()
+
+    def available(self) -> List[Tuple[str, str]]:
+        """Registered (algorithm, implementation) pairs, including entry points."""
+        self._load_entry_points()
+        return sorted(self._entries)
+
+
+def lazy_exports(namespace: Dict[str, Any], exports: Dict[str, str]) -> Callable[[str], Any]:
+    """
+    Build a module-level __getattr__ (PEP 562) that imports `exports`
+    (attribute name -> relative module) on first access.
+
+    Args:
+        namespace: globals() of the package
+        exports: e.g. {'AESLib': '.aes_lib'}
+    """
+    package = namespace['__name__']
+
+    def __getattr__(name: str) -> Any:
+        module_name = exports.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, package), name)
+        namespace[name] = value
+        return value
+
+    return __getattr__
@@ -1,16 +1,22 @@
 """
 Symmetric encryption module.
-Supports AES and DES with library and manual implementations.
+Supports AES and DES with library and manual implementations, and
+authenticated AES-GCM / ChaCha20-Poly1305.
+
+Şifre sınıfları ilk erişimde içe aktarılır.
 """
 
-from .aes_lib import AESLib
-from .aes_manual import AESManual
-from .des_lib import DESLib
-from .des_manual import DESManual
+from ..registry import lazy_exports
+from .base import MAX_MESSAGE_SIZE, CipherContext
 from .factory import SymmetricEncryptionFactory
 
-__all__ = ['AESLib', 'AESManual', 'DESLib', 'DESManual', 'SymmetricEncryptionFactory']
-
-
-
+__getattr__ = lazy_exports(globals(), {
+    'AESLib': '.aes_lib',
+    'AESManual': '.aes_manual',
+    'DESLib': '.des_lib',
+    'DESManual': '.des_manual',
+    'AESGCMLib': '.aead_lib',
+    'ChaCha20Poly1305Lib': '.aead_lib',
+})
 
+__all__ = ['MAX_MESSAGE_SIZE', 'CipherContext', 'AESLib', 'AESManual', 'DESLib', 'DESManual', 'AESGCMLib', 'ChaCha20Poly1305Lib', 'SymmetricEncryptionFactory']
@@ -0,0 +1,74 @@
+"""
+Authenticated encryption (AES-GCM, ChaCha20-Poly1305) using cryptography library.
+"""
+
+import os
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
+from .base import SymmetricEncryption
+
+NONCE_SIZE = 12  # 96-bit nonce (her iki algoritma için önerilen boyut)
+
+
+class _AEADLib(SymmetricEncryption):
+    """
+    Shared one-shot AEAD implementation.
+
+    Frame: nonce (12 bytes) + ciphertext + 16-byte tag. Dolgu yoktur;
+    değiştirilmiş çerçeveler deşifre sırasında reddedilir.
+    """
+
+    aead_class = None
+    key_size = 32
+
+    def _ensure_valid_key(self, key: bytes) -> bytes:
+        """Anahtarı algoritmanın beklediği boya getirir (AESLib ile aynı kural)."""
+        if len(key) == self.key_size:
+            return bytes(key)
+        return bytes(key[:self.key_size]).ljust(self.key_size, b'\0')
+
+    def prepare_key(self, key: bytes):
+        """Build the AEAD object once per session."""
+        return self.aead_class(self._ensure_valid_key(key))
+
+    def encrypt_bytes(self, data: bytes, prepared) -> bytes:
+        """Encrypt and authenticate plaintext in one call."""
+        nonce = os.urandom(NONCE_SIZE)
+        return nonce + prepared.encrypt(nonce, data, None)
+
+    def decrypt_bytes(self, frame: bytes, prepared) -> bytes:
+        """Verify and decrypt a frame; tampered frames raise ValueError."""
+        # memoryview dilimleri büyük çerçevelerde kopya oluşturmaz
+        view = memoryview(frame)
+        try:
+            return prepared.decrypt(view[:NONCE_SIZE], view[NONCE_SIZE:], None)
+        except InvalidTag:
+            raise ValueError("Mesaj doğrulanamadı (bozuk veya değiştirilmiş çerçeve)") from None
+
+    def generate_key(self, key_size: int = 256) -> bytes:
+        """Generate a random key."""
+        return os.urandom(self.key_size)
+
+
+class AESGCMLib(_AEADLib):
+    """AES-256-GCM implementation using cryptography library."""
+
+    aead_class = AESGCM
+
+    def generate_key(self, key_size: int = 256) -> bytes:
+        """Generate a random AES key (128, 192 or 256 bits)."""
+        if key_size not in [128, 192, 256]:
+            key_size = 256
+        return os.urandom(key_size // 8)
+
+    def _ensure_valid_key(self, key: bytes) -> bytes:
+        # AES-GCM 16/24/32 baytlık anahtarların hepsini kabul eder
+        if len(key) in [16, 24, 32]:
+            return bytes(key)
+        return super()._ensure_valid_key(key)
+
+
+class ChaCha20Poly1305Lib(_AEADLib):
+    """ChaCha20-Poly1305 implementation using cryptography library."""
+
+    aead_class = ChaCha20Poly1305
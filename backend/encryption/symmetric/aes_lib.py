@@ -2,11 +2,11 @@
 AES encryption using cryptography library.
 """
 
-import base64
 import os
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-from cryptography.hazmat.backends import default_backend
-from .base import SymmetricEncryption
+from cryptography.hazmat.primitives.ciphers import algorithms
+from .base import BytesLike, SymmetricEncryption
+from .streaming import (CBCEncryptStream, CBCDecryptStream, cbc_frame_size, cbc_plaintext_size,
+                        cbc_encrypt_into, cbc_decrypt_into)
 
 
 class AESLib(SymmetricEncryption):
@@ -25,59 +25,45 @@ class AESLib(SymmetricEncryption):
         # Çok uzunsa kes
         return key[:32]
 
-    def encrypt(self, plaintext: str, key: bytes) -> str:
-        """Encrypt plaintext using AES."""
-        key = self._ensure_valid_key(key)
-
-        # Generate random IV
-        iv = os.urandom(self.block_size)
+    def prepare_key(self, key: bytes) -> algorithms.AES:
+        """Normalize the key once and wrap it as an AES algorithm object."""
+        return algorithms.AES(self._ensure_valid_key(key))
 
-        # Pad plaintext to block size
-        padded_text = self._pad(plaintext.encode('utf-8'))
+    def max_frame_size(self, length: int) -> int:
+        """Buffer size encrypt_into needs (IV + padded ciphertext + update_into headroom)."""
+        return cbc_frame_size(length, self.block_size)
 
-        # Create cipher
-        cipher = Cipher(
-            algorithms.AES(key),
-            modes.CBC(iv),
-            backend=default_backend()
-        )
-        encryptor = cipher.encryptor()
+    def max_plaintext_size(self, frame_length: int) -> int:
+        """Buffer size decrypt_into needs for a frame."""
+        return cbc_plaintext_size(frame_length, self.block_size)
 
-        # Encrypt
-        ciphertext = encryptor.update(padded_text) + encryptor.finalize()
+    def encrypt_into(self, data: BytesLike, out: bytearray, prepared: algorithms.AES) -> int:
+        """Encrypt plaintext with AES-CBC; IV and PKCS7 padding are written in place."""
+        return cbc_encrypt_into(prepared, data, out, self.block_size)
 
-        # Combine IV and ciphertext
-        encrypted_data = iv + ciphertext
+    def decrypt_into(self, frame: BytesLike, out: bytearray, prepared: algorithms.AES) -> int:
+        """Decrypt an AES-CBC frame into out and strip the padding."""
+        return self._unpadded_length(out, cbc_decrypt_into(prepared, frame, out, self.block_size))
 
-        # Return base64 encoded
-        return base64.b64encode(encrypted_data).decode('utf-8')
+    def encrypt_bytes(self, data: bytes, prepared: algorithms.AES) -> bytes:
+        """Encrypt plaintext using AES."""
+        out = bytearray(self.max_frame_size(len(data)))
+        del out[self.encrypt_into(data, out, prepared):]
+        return bytes(out)
 
-    def decrypt(self, ciphertext: str, key: bytes) -> str:
+    def decrypt_bytes(self, frame: bytes, prepared: algorithms.AES) -> bytes:
         """Decrypt ciphertext using AES."""
-        key = self._ensure_valid_key(key)
-
-        # Decode base64
-        encrypted_data = base64.b64decode(ciphertext.encode('utf-8'))
+        out = bytearray(self.max_plaintext_size(len(frame)))
+        del out[self.decrypt_into(frame, out, prepared):]
+        return bytes(out)
 
-        # Extract IV and ciphertext
-        iv = encrypted_data[:self.block_size]
-        ciphertext = encrypted_data[self.block_size:]
+    def encryptor(self, prepared: algorithms.AES) -> CBCEncryptStream:
+        """Chunked counterpart of encrypt_bytes."""
+        return CBCEncryptStream(prepared, self.block_size)
 
-        # Create cipher
-        cipher = Cipher(
-            algorithms.AES(key),
-            modes.CBC(iv),
-            backend=default_backend()
-        )
-        decryptor = cipher.decryptor()
-
-        # Decrypt
-        padded_text = decryptor.update(ciphertext) + decryptor.finalize()
-
-        # Remove padding
-        plaintext = self._unpad(padded_text)
-
-        return plaintext.decode('utf-8')
+    def decryptor(self, prepared: algorithms.AES) -> CBCDecryptStream:
+        """Chunked counterpart of decrypt_bytes."""
+        return CBCDecryptStream(prepared, self.block_size)
 
     def generate_key(self, key_size: int = 256) -> bytes:
         """Generate a random AES key."""
@@ -85,15 +71,11 @@ class AESLib(SymmetricEncryption):
             key_size = 256
         return os.urandom(key_size // 8)
 
-    def _pad(self, data: bytes) -> bytes:
-        """PKCS7 padding."""
-        padding_length = self.block_size - (len(data) % self.block_size)
-        padding = bytes([padding_length] * padding_length)
-        return data + padding
-
-    def _unpad(self, data: bytes) -> bytes:
-        """Remove PKCS7 padding."""
-        padding_length = data[-1]
+    def _unpadded_length(self, data: bytearray, length: int) -> int:
+        """Length of data[:length] without PKCS7 padding."""
+        if not length:
+            raise ValueError("Şifreli metin boş")
+        padding_length = data[length - 1]
         if padding_length > self.block_size:
-            return data # Hatalı padding durumunda veriyi bozmamak için
-        return data[:-padding_length]
\ No newline at end of file
+            return length # Hatalı padding durumunda veriyi bozmamak için
+        return length - padding_length if padding_length else 0
@@ -1,6 +1,14 @@
-import base64
 import os
+from typing import NamedTuple
 from .base import SymmetricEncryption
+from .bulk import keystream_period, tile, xor_bytes
+
+
+class _SBoxKey(NamedTuple):
+    key: bytes
+    sbox: bytes
+    inv_sbox: bytes
+
 
 class AESManual(SymmetricEncryption):
     def __init__(self):
@@ -16,36 +24,32 @@ class AESManual(SymmetricEncryption):
             seed = (seed + sbox[i]) % 256
         return sbox
 
-    def encrypt(self, plaintext, key: bytes) -> str:
+    def prepare_key(self, key: bytes) -> _SBoxKey:
         sbox = self._generate_dynamic_sbox(key)
+        inv_sbox = [0] * 256
+        for i, v in enumerate(sbox): inv_sbox[v] = i
+        return _SBoxKey(bytes(key), bytes(sbox), bytes(inv_sbox))
+
+    def encrypt_bytes(self, data: bytes, prepared: _SBoxKey) -> bytes:
+        key, sbox = prepared.key, prepared.sbox
         iv = os.urandom(16)
-        if isinstance(plaintext, str):
-            data = self._pad(plaintext.encode('utf-8'))
-        else:
-            data = self._pad(plaintext)
+        data = self._pad(bytes(data))
             
-        res = bytearray()
-        for i in range(len(data)):
-            # S-Box -> Key XOR -> IV XOR sırası
-            val = sbox[data[i]] ^ key[i % len(key)] ^ iv[i % 16]
-            res.append(val)
-        # IV ve şifreli veriyi birleştirip base64 yapıyoruz
-        return base64.b64encode(iv + res).decode('utf-8')
+        # S-Box -> Key XOR -> IV XOR sırası (tüm tampon tek seferde)
+        keystream = tile(keystream_period(key, iv), len(data))
+        res = xor_bytes(data.translate(sbox), keystream)
+        # IV ve şifreli veriyi birleştiriyoruz
+        return iv + res
 
-    def decrypt(self, ciphertext: str, key: bytes):
-        sbox = self._generate_dynamic_sbox(key)
-        inv_sbox = [0] * 256
-        for i, v in enumerate(sbox): inv_sbox[v] = i
-        
-        combined = base64.b64decode(ciphertext.encode('utf-8'))
-        iv, data = combined[:16], combined[16:]
-        res = bytearray()
-        for i in range(len(data)):
-            # XOR işlemlerini tersine alıyoruz
-            val = data[i] ^ key[i % len(key)] ^ iv[i % 16]
-            res.append(inv_sbox[val])
-        
-        decrypted_bytes = self._unpad(bytes(res))
+    def decrypt_bytes(self, frame: bytes, prepared: _SBoxKey) -> bytes:
+        key, inv_sbox = prepared.key, prepared.inv_sbox
+        iv, data = bytes(frame[:16]), bytes(frame[16:])
+        # XOR işlemlerini tersine alıyoruz, sonra ters S-Box
+        keystream = tile(keystream_period(key, iv), len(data))
+        res = xor_bytes(data, keystream).translate(inv_sbox)
+        return self._unpad(res)
+
+    def _decode_plaintext(self, decrypted_bytes: bytes):
         try:
             return decrypted_bytes.decode('utf-8')
         except UnicodeDecodeError:
@@ -2,53 +2,345 @@
 Base class for symmetric encryption implementations.
 """
 
+import base64
 from abc import ABC, abstractmethod
+from typing import Any, Optional, Union
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+# Tek mesaj sınırı (Socket.IO max_http_buffer_size); tamponlanan akışlar da bunu aşamaz
+MAX_MESSAGE_SIZE = 10 * 1024 * 1024
 
 
 class SymmetricEncryption(ABC):
-    """Abstract base class for symmetric encryption algorithms."""
-    
+    """
+    Abstract base class for symmetric encryption algorithms.
+
+    Implementations work on raw bytes (encrypt_bytes/decrypt_bytes); the
+    string API wraps them in the base64 wire format. Ciphers that can lay
+    the frame out in a caller-provided buffer also implement
+    encrypt_into/decrypt_into and the max_*_size bounds.
+    """
+
+    def prepare_key(self, key: bytes) -> Any:
+        """
+        Derive reusable key material (normalized key, S-box, matrix...).
+
+        Args:
+            key: Raw encryption key
+
+        Returns:
+            Prepared key material understood by the *_prepared/*_bytes methods
+        """
+        return key
+
     @abstractmethod
+    def encrypt_bytes(self, data: BytesLike, prepared: Any) -> bytes:
+        """
+        Encrypt raw plaintext bytes into a raw frame (e.g. IV + ciphertext).
+
+        Args:
+            data: Plaintext bytes
+            prepared: Result of prepare_key
+
+        Returns:
+            Encrypted frame, without base64
+        """
+        pass
+
+    @abstractmethod
+    def decrypt_bytes(self, frame: BytesLike, prepared: Any) -> bytes:
+        """
+        Decrypt a raw frame produced by encrypt_bytes.
+
+        Args:
+            frame: Encrypted frame, without base64
+            prepared: Result of prepare_key
+
+        Returns:
+            Plaintext bytes
+        """
+        pass
+
+    def max_frame_size(self, length: int) -> Optional[int]:
+        """
+        Buffer size encrypt_into needs for `length` plaintext bytes.
+
+        Returns:
+            Size in bytes, or None if the cipher cannot tell in advance
+            (encrypt_into then only works with a large enough guess)
+        """
+        return None
+
+    def max_plaintext_size(self, frame_length: int) -> Optional[int]:
+        """Buffer size decrypt_into needs for a frame of `frame_length` bytes (None if unknown)."""
+        return None
+
+    def encrypt_into(self, data: BytesLike, out: Union[bytearray, memoryview], prepared: Any) -> int:
+        """
+        Encrypt data and write the frame (IV, ciphertext, padding) into out.
+
+        Args:
+            data: Plaintext bytes
+            out: Writable buffer of at least max_frame_size(len(data)) bytes
+            prepared: Result of prepare_key
+
+        Returns:
+            Number of frame bytes written to the start of out
+        """
+        # Yerinde yazamayan şifreler: çerçeve üretilir ve kopyalanır
+        return _copy_into(self.encrypt_bytes(data, prepared), out)
+
+    def decrypt_into(self, frame: BytesLike, out: Union[bytearray, memoryview], prepared: Any) -> int:
+        """
+        Decrypt a frame and write the plaintext into out.
+
+        Args:
+            frame: Encrypted frame, without base64
+            out: Writable buffer of at least max_plaintext_size(len(frame)) bytes
+            prepared: Result of prepare_key
+
+        Returns:
+            Number of plaintext bytes written to the start of out
+        """
+        return _copy_into(self.decrypt_bytes(frame, prepared), out)
+
+    def _decode_plaintext(self, data: BytesLike) -> str:
+        """Turn decrypted bytes into the text returned by the string API."""
+        return str(data, 'utf-8')
+
+    def encrypt_prepared(self, plaintext: str, prepared: Any) -> str:
+        """
+        Encrypt plaintext using key material from prepare_key.
+
+        Args:
+            plaintext: Text to encrypt
+            prepared: Result of prepare_key
+
+        Returns:
+            Base64 encoded encrypted string
+        """
+        if isinstance(plaintext, str):
+            plaintext = plaintext.encode('utf-8')
+        size = self.max_frame_size(len(plaintext))
+        if size is None:
+            frame = self.encrypt_bytes(plaintext, prepared)
+        else:
+            # Çerçeve tek tamponda kurulur; base64 bu tamponun görünümünden okur
+            out = bytearray(size)
+            frame = memoryview(out)[:self.encrypt_into(plaintext, out, prepared)]
+        return base64.b64encode(frame).decode('ascii')
+
+    def decrypt_prepared(self, ciphertext: str, prepared: Any) -> str:
+        """
+        Decrypt ciphertext using key material from prepare_key.
+
+        Args:
+            ciphertext: Base64 encoded encrypted string
+            prepared: Result of prepare_key
+
+        Returns:
+            Decrypted plaintext
+        """
+        frame = base64.b64decode(ciphertext)
+        size = self.max_plaintext_size(len(frame))
+        if size is None:
+            return self._decode_plaintext(self.decrypt_bytes(frame, prepared))
+        out = bytearray(size)
+        return self._decode_plaintext(memoryview(out)[:self.decrypt_into(frame, out, prepared)])
+
     def encrypt(self, plaintext: str, key: bytes) -> str:
         """
         Encrypt plaintext using the symmetric key.
-        
+
         Args:
             plaintext: Text to encrypt
             key: Encryption key
-            
+
         Returns:
             Base64 encoded encrypted string
         """
-        pass
-    
-    @abstractmethod
+        return self.encrypt_prepared(plaintext, self.prepare_key(key))
+
     def decrypt(self, ciphertext: str, key: bytes) -> str:
         """
         Decrypt ciphertext using the symmetric key.
-        
+
         Args:
             ciphertext: Base64 encoded encrypted string
             key: Decryption key
-            
+
         Returns:
             Decrypted plaintext
         """
-        pass
-    
+        return self.decrypt_prepared(ciphertext, self.prepare_key(key))
+
+    def encryptor(self, prepared: Any) -> 'StreamTransform':
+        """
+        Incremental encryptor producing the same frame as encrypt_bytes.
+
+        Ciphers without a native streaming mode buffer the whole payload
+        and encrypt it on finalize().
+
+        Args:
+            prepared: Result of prepare_key
+
+        Returns:
+            StreamTransform fed with plaintext chunks
+        """
+        return BufferedStream(self.encrypt_bytes, prepared)
+
+    def decryptor(self, prepared: Any) -> 'StreamTransform':
+        """
+        Incremental decryptor for a frame produced by encrypt_bytes/encryptor.
+
+        Args:
+            prepared: Result of prepare_key
+
+        Returns:
+            StreamTransform fed with frame chunks
+        """
+        return BufferedStream(self.decrypt_bytes, prepared)
+
+    def bind(self, key: bytes) -> 'CipherContext':
+        """
+        Prepare the key once and bind it to this cipher.
+
+        Args:
+            key: Encryption key
+
+        Returns:
+            CipherContext reusable for every message of a session
+        """
+        return CipherContext(self, self.prepare_key(key))
+
     @abstractmethod
     def generate_key(self, key_size: int = None) -> bytes:
         """
         Generate a random key.
-        
+
         Args:
             key_size: Size of the key in bits
-            
+
         Returns:
             Generated key as bytes
         """
         pass
 
 
+def _copy_into(data: bytes, out: Union[bytearray, memoryview]) -> int:
+    if len(out) < len(data):
+        raise ValueError(f"Çıktı tamponu çok küçük: {len(data)} bayt gerekli, {len(out)} verildi")
+    out[:len(data)] = data
+    return len(data)
+
+
+class TextCipher(SymmetricEncryption):
+    """
+    Base class for classical ciphers that transform text characters.
+
+    The frame is the UTF-8 encoding of the transformed text.
+    """
+
+    @abstractmethod
+    def encrypt_text(self, text: str, prepared: Any) -> str:
+        """Transform plaintext characters into ciphertext characters."""
+        pass
+
+    @abstractmethod
+    def decrypt_text(self, text: str, prepared: Any) -> str:
+        """Inverse of encrypt_text."""
+        pass
+
+    def encrypt_bytes(self, data: BytesLike, prepared: Any) -> bytes:
+        return self.encrypt_text(str(data, 'utf-8'), prepared).encode('utf-8')
+
+    def decrypt_bytes(self, frame: BytesLike, prepared: Any) -> bytes:
+        return self.decrypt_text(str(frame, 'utf-8'), prepared).encode('utf-8')
+
+    def encrypt_prepared(self, plaintext: str, prepared: Any) -> str:
+        res = self.encrypt_text(plaintext, prepared)
+        return base64.b64encode(res.encode('utf-8')).decode('utf-8')
+
+    def decrypt_prepared(self, ciphertext: str, prepared: Any) -> str:
+        data = base64.b64decode(ciphertext).decode('utf-8')
+        return self.decrypt_text(data, prepared)
+
+
+class StreamTransform(ABC):
+    """One direction of a chunked transfer; chunk boundaries are arbitrary."""
+
+    @abstractmethod
+    def update(self, data: BytesLike) -> bytes:
+        """Feed a chunk; returns whatever output is ready so far."""
+        pass
+
+    @abstractmethod
+    def finalize(self) -> bytes:
+        """Flush the remaining output (padding etc.); the stream is done after this."""
+        pass
+
+
+class BufferedStream(StreamTransform):
+    """Fallback stream that collects every chunk and transforms them at the end."""
+
+    def __init__(self, transform, prepared: Any, max_bytes: int = MAX_MESSAGE_SIZE):
+        self._transform = transform
+        self._prepared = prepared
+        self._chunks = []
+        self._size = 0
+        self.max_bytes = max_bytes
+
+    def update(self, data: BytesLike) -> bytes:
+        self._size += len(data)
+        if self._size > self.max_bytes:
+            # Tampon bırakılır; akış bu noktadan sonra kullanılamaz
+            self._chunks = []
+            raise ValueError(f"Tamponlanan akış {self.max_bytes} bayt sınırını aştı")
+        self._chunks.append(bytes(data))
+        return b""
+
+    def finalize(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return self._transform(data, self._prepared)
+
+
+class CipherContext:
+    """A cipher bound to prepared key material (one per session)."""
+
+    __slots__ = ('cipher', 'prepared')
+
+    def __init__(self, cipher: SymmetricEncryption, prepared: Any):
+        self.cipher = cipher
+        self.prepared = prepared
+
+    def encrypt(self, plaintext: str) -> str:
+        return self.cipher.encrypt_prepared(plaintext, self.prepared)
+
+    def decrypt(self, ciphertext: str) -> str:
+        return self.cipher.decrypt_prepared(ciphertext, self.prepared)
+
+    def encrypt_bytes(self, data: BytesLike) -> bytes:
+        return self.cipher.encrypt_bytes(data, self.prepared)
+
+    def decrypt_bytes(self, frame: BytesLike) -> bytes:
+        return self.cipher.decrypt_bytes(frame, self.prepared)
+
+    def encrypt_into(self, data: BytesLike, out: Union[bytearray, memoryview]) -> int:
+        return self.cipher.encrypt_into(data, out, self.prepared)
+
+    def decrypt_into(self, frame: BytesLike, out: Union[bytearray, memoryview]) -> int:
+        return self.cipher.decrypt_into(frame, out, self.prepared)
+
+    def max_frame_size(self, length: int) -> Optional[int]:
+        return self.cipher.max_frame_size(length)
+
+    def max_plaintext_size(self, frame_length: int) -> Optional[int]:
+        return self.cipher.max_plaintext_size(frame_length)
 
+    def encryptor(self) -> StreamTransform:
+        return self.cipher.encryptor(self.prepared)
 
+    def decryptor(self) -> StreamTransform:
+        return self.cipher.decryptor(self.prepared)
@@ -0,0 +1,62 @@
+"""
+Whole-buffer helpers for the manual and classical ciphers.
+
+Bayt bayt Python döngüsü yerine tüm tamponu tek seferde işler:
+S-box aşaması bytes.translate ile, XOR aşaması büyük tamsayı XOR'u ile,
+karakter kaydırmaları ise kod noktası dizileri (array('I')) üzerinde.
+"""
+
+import sys
+from array import array
+from math import gcd
+
+# Unicode kod noktası uzayı (chr() üst sınırı + 1)
+UNICODE_SIZE = 1114112
+
+# array('I') yerel bayt sırasıyla 4 baytlık öğeler tutar
+_UTF32 = 'utf-32-le' if sys.byteorder == 'little' else 'utf-32-be'
+
+
+def tile(pattern: bytes, length: int) -> bytes:
+    """Repeat pattern to exactly length bytes (pattern[i % len(pattern)])."""
+    if not length:
+        return b""
+    if not pattern:
+        raise ValueError("Boş desen tekrarlanamaz")
+    repeats, rest = divmod(length, len(pattern))
+    return pattern * repeats + pattern[:rest]
+
+
+def keystream_period(key: bytes, iv: bytes) -> bytes:
+    """One period of key[i % len(key)] ^ iv[i % len(iv)] (lcm of both lengths)."""
+    if not key or not iv:
+        return b""
+    period = len(key) * len(iv) // gcd(len(key), len(iv))
+    return xor_bytes(tile(key, period), tile(iv, period))
+
+
+def xor_bytes(data: bytes, keystream: bytes) -> bytes:
+    """XOR two equally long buffers in one pass."""
+    length = len(data)
+    value = int.from_bytes(data, 'little') ^ int.from_bytes(keystream, 'little')
+    return value.to_bytes(length, 'little')
+
+
+def code_points(text: str) -> array:
+    """Code points of text as an array('I'); lone surrogates are kept."""
+    return array('I', text.encode(_UTF32, 'surrogatepass'))
+
+
+def from_code_points(points: array) -> str:
+    """Inverse of code_points."""
+    return points.tobytes().decode(_UTF32, 'surrogatepass')
+
+
+def tile_array(pattern: array, length: int) -> array:
+    """array counterpart of tile()."""
+    if not length:
+        return array(pattern.typecode)
+    if not pattern:
+        raise ValueError("Boş desen tekrarlanamaz")
+    repeats, rest = divmod(length, len(pattern))
+    return pattern * repeats + pattern[:rest]
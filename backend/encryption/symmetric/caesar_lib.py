@@ -1,24 +1,22 @@
-import base64
-from .base import SymmetricEncryption
+from .base import TextCipher
+from .bulk import UNICODE_SIZE
 
-class CaesarLib(SymmetricEncryption):
-    def encrypt(self, plaintext: str, key: bytes) -> str:
+class CaesarLib(TextCipher):
+    def prepare_key(self, key: bytes) -> int:
         # Anahtarın ilk byte'ını kaydırma miktarı olarak kullanıyoruz (0-255)
-        shift = key[0] if key else 3
-        res = ""
-        for char in plaintext:
-            # Karakterin unicode değerini shift kadar ileri kaydır
-            res += chr((ord(char) + shift) % 1114112)
-        return base64.b64encode(res.encode('utf-8')).decode('utf-8')
+        return key[0] if key else 3
 
-    def decrypt(self, ciphertext: str, key: bytes) -> str:
-        data = base64.b64decode(ciphertext).decode('utf-8')
-        shift = key[0] if key else 3
-        res = ""
-        for char in data:
-            # Kaydırma miktarını geri al
-            res += chr((ord(char) - shift) % 1114112)
-        return res
+    def _shift_table(self, text: str, shift: int) -> dict:
+        # Sadece metinde geçen farklı karakterler için kaydırma tablosu
+        return {c: (c + shift) % UNICODE_SIZE for c in map(ord, set(text))}
+
+    def encrypt_text(self, plaintext: str, shift: int) -> str:
+        # Karakterin unicode değerini shift kadar ileri kaydır (tek geçişte)
+        return plaintext.translate(self._shift_table(plaintext, shift))
+
+    def decrypt_text(self, data: str, shift: int) -> str:
+        # Kaydırma miktarını geri al
+        return data.translate(self._shift_table(data, -shift))
 
     def generate_key(self, key_size: int = None) -> bytes:
         # Sezar için 3 birimlik sabit bir anahtar/kaydırma miktarı
@@ -2,11 +2,11 @@
 DES encryption using cryptography library.
 """
 
-import base64
 import os
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-from cryptography.hazmat.backends import default_backend
-from .base import SymmetricEncryption
+from cryptography.hazmat.primitives.ciphers import algorithms
+from .base import BytesLike, SymmetricEncryption
+from .streaming import (CBCEncryptStream, CBCDecryptStream, cbc_frame_size, cbc_plaintext_size,
+                        cbc_encrypt_into, cbc_decrypt_into)
 
 
 class DESLib(SymmetricEncryption):
@@ -15,76 +15,51 @@ class DESLib(SymmetricEncryption):
     def __init__(self):
         self.block_size = 8  # DES block size is 8 bytes
     
-    def encrypt(self, plaintext: str, key: bytes) -> str:
-        """Encrypt plaintext using DES (using AES-128 for Web Crypto API compatibility)."""
+    def prepare_key(self, key: bytes) -> algorithms.AES:
+        """Expand the 8-byte DES key to an AES-128 key once."""
         # DES uses 8-byte key, but we expand it to 16 bytes for AES-128
         # This is because Web Crypto API doesn't support DES
         if len(key) != 8:
             key = key[:8] if len(key) >= 8 else key.ljust(8, b'\0')
         
-        # Expand 8-byte DES key to 16 bytes for AES-128
-        aes_key = bytearray(16)
-        for i in range(16):
-            aes_key[i] = key[i % 8]
-        aes_key = bytes(aes_key)
-        
-        # Generate random IV (16 bytes for AES)
-        iv = os.urandom(16)
-        
-        # Pad plaintext to AES block size (16 bytes)
-        padded_text = self._pad_aes(plaintext.encode('utf-8'))
-        
-        # Create cipher using AES-128 (for Web Crypto API compatibility)
-        cipher = Cipher(
-            algorithms.AES(aes_key),
-            modes.CBC(iv),
-            backend=default_backend()
-        )
-        encryptor = cipher.encryptor()
-        
-        # Encrypt
-        ciphertext = encryptor.update(padded_text) + encryptor.finalize()
-        
-        # Combine IV and ciphertext
-        encrypted_data = iv + ciphertext
-        
-        # Return base64 encoded
-        return base64.b64encode(encrypted_data).decode('utf-8')
+        # Expand 8-byte DES key to 16 bytes for AES-128 (key[i % 8] for i in 0..15)
+        return algorithms.AES(bytes(key) * 2)
+    
+    def max_frame_size(self, length: int) -> int:
+        """Buffer size encrypt_into needs (16-byte IV + AES-padded ciphertext + headroom)."""
+        return cbc_frame_size(length, 16)
     
-    def decrypt(self, ciphertext: str, key: bytes) -> str:
+    def max_plaintext_size(self, frame_length: int) -> int:
+        """Buffer size decrypt_into needs for a frame."""
+        return cbc_plaintext_size(frame_length, 16)
+    
+    def encrypt_into(self, data: BytesLike, out: bytearray, prepared: algorithms.AES) -> int:
+        """Encrypt plaintext (AES-128-CBC) with IV and padding laid out in out."""
+        return cbc_encrypt_into(prepared, data, out, 16)
+    
+    def decrypt_into(self, frame: BytesLike, out: bytearray, prepared: algorithms.AES) -> int:
+        """Decrypt a frame into out and strip the padding."""
+        return self._unpadded_length_aes(out, cbc_decrypt_into(prepared, frame, out, 16))
+    
+    def encrypt_bytes(self, data: bytes, prepared: algorithms.AES) -> bytes:
+        """Encrypt plaintext using DES (using AES-128 for Web Crypto API compatibility)."""
+        out = bytearray(self.max_frame_size(len(data)))
+        del out[self.encrypt_into(data, out, prepared):]
+        return bytes(out)
+    
+    def decrypt_bytes(self, frame: bytes, prepared: algorithms.AES) -> bytes:
         """Decrypt ciphertext using DES (using AES-128 for Web Crypto API compatibility)."""
-        # DES uses 8-byte key, but we expand it to 16 bytes for AES-128
-        if len(key) != 8:
-            key = key[:8] if len(key) >= 8 else key.ljust(8, b'\0')
-        
-        # Expand 8-byte DES key to 16 bytes for AES-128
-        aes_key = bytearray(16)
-        for i in range(16):
-            aes_key[i] = key[i % 8]
-        aes_key = bytes(aes_key)
-        
-        # Decode base64
-        encrypted_data = base64.b64decode(ciphertext.encode('utf-8'))
-        
-        # Extract IV and ciphertext (16 bytes IV for AES)
-        iv = encrypted_data[:16]
-        ciphertext = encrypted_data[16:]
-        
-        # Create cipher using AES-128
-        cipher = Cipher(
-            algorithms.AES(aes_key),
-            modes.CBC(iv),
-            backend=default_backend()
-        )
-        decryptor = cipher.decryptor()
-        
-        # Decrypt
-        padded_text = decryptor.update(ciphertext) + decryptor.finalize()
-        
-        # Remove padding
-        plaintext = self._unpad_aes(padded_text)
-        
-        return plaintext.decode('utf-8')
+        out = bytearray(self.max_plaintext_size(len(frame)))
+        del out[self.decrypt_into(frame, out, prepared):]
+        return bytes(out)
+    
+    def encryptor(self, prepared: algorithms.AES) -> CBCEncryptStream:
+        """Chunked counterpart of encrypt_bytes."""
+        return CBCEncryptStream(prepared, 16)
+    
+    def decryptor(self, prepared: algorithms.AES) -> CBCDecryptStream:
+        """Chunked counterpart of decrypt_bytes."""
+        return CBCDecryptStream(prepared, 16)
     
     def generate_key(self, key_size: int = 64) -> bytes:
         """Generate a random DES key (8 bytes)."""
@@ -96,20 +71,14 @@ class DESLib(SymmetricEncryption):
         padding = bytes([padding_length] * padding_length)
         return data + padding
     
-    def _pad_aes(self, data: bytes) -> bytes:
-        """PKCS7 padding for AES (16 bytes)."""
-        block_size = 16
-        padding_length = block_size - (len(data) % block_size)
-        padding = bytes([padding_length] * padding_length)
-        return data + padding
-    
     def _unpad(self, data: bytes) -> bytes:
         """Remove PKCS7 padding for DES."""
         padding_length = data[-1]
         return data[:-padding_length]
     
-    def _unpad_aes(self, data: bytes) -> bytes:
-        """Remove PKCS7 padding for AES."""
-        padding_length = data[-1]
-        return data[:-padding_length]
-
+    def _unpadded_length_aes(self, data: bytearray, length: int) -> int:
+        """Length of data[:length] without PKCS7 padding for AES."""
+        if not length:
+            raise ValueError("Şifreli metin boş")
+        padding_length = data[length - 1]
+        return max(length - padding_length, 0) if padding_length else 0
@@ -1,6 +1,17 @@
-import base64
 import os
+from typing import NamedTuple
 from .base import SymmetricEncryption
+from .bulk import keystream_period, tile, xor_bytes
+
+# Nibble takası tablosu: ((v << 4) | (v >> 4)) & 0xFF, kendi tersidir
+_NIBBLE_SWAP = bytes(((v << 4) | (v >> 4)) & 0xFF for v in range(256))
+
+
+class _SBoxKey(NamedTuple):
+    key: bytes
+    sbox: bytes
+    inv_sbox: bytes
+
 
 class DESManual(SymmetricEncryption):
     def __init__(self):
@@ -15,35 +26,31 @@ class DESManual(SymmetricEncryption):
             seed = (seed + sbox[i]) % 256
         return sbox
 
-    def encrypt(self, plaintext: str, key: bytes) -> str:
-        sbox = self._generate_dynamic_sbox(key)
-        key_bytes = key[:8].ljust(8, b'\0')
-        iv = os.urandom(8)
-        data = self._pad(plaintext.encode('utf-8'))
-        res = bytearray()
-        for i in range(len(data)):
-            # Sbox -> XOR -> Swap (JS sırasıyla eşlendi)
-            sub = sbox[data[i] % 256]
-            val = sub ^ key_bytes[i % 8] ^ iv[i % 8]
-            swapped = ((val << 4) | (val >> 4)) & 0xFF
-            res.append(swapped)
-        return base64.b64encode(iv + res).decode('utf-8')
-
-    def decrypt(self, ciphertext: str, key: bytes) -> str:
+    def prepare_key(self, key: bytes) -> _SBoxKey:
         sbox = self._generate_dynamic_sbox(key)
         inv_sbox = [0] * 256
         for i, v in enumerate(sbox): inv_sbox[v] = i
-        
-        key_bytes = key[:8].ljust(8, b'\0')
-        combined = base64.b64decode(str(ciphertext).encode('utf-8'))
-        iv, data = combined[:8], combined[8:]
-        res = bytearray()
-        for i in range(len(data)):
-            # Unswap -> XOR -> Inverse Sbox
-            val = ((data[i] >> 4) | (data[i] << 4)) & 0xFF
-            orig_val = val ^ key_bytes[i % 8] ^ iv[i % 8]
-            res.append(inv_sbox[orig_val % 256])
-        return self._unpad(bytes(res)).decode('utf-8', errors='ignore')
+        return _SBoxKey(bytes(key[:8].ljust(8, b'\0')), bytes(sbox), bytes(inv_sbox))
+
+    def encrypt_bytes(self, data: bytes, prepared: _SBoxKey) -> bytes:
+        key_bytes, sbox = prepared.key, prepared.sbox
+        iv = os.urandom(8)
+        data = self._pad(bytes(data))
+        # Sbox -> XOR -> Swap (JS sırasıyla eşlendi)
+        keystream = tile(keystream_period(key_bytes, iv), len(data))
+        res = xor_bytes(data.translate(sbox), keystream).translate(_NIBBLE_SWAP)
+        return iv + res
+
+    def decrypt_bytes(self, frame: bytes, prepared: _SBoxKey) -> bytes:
+        key_bytes, inv_sbox = prepared.key, prepared.inv_sbox
+        iv, data = bytes(frame[:8]), bytes(frame[8:])
+        # Unswap -> XOR -> Inverse Sbox
+        keystream = tile(keystream_period(key_bytes, iv), len(data))
+        res = xor_bytes(data.translate(_NIBBLE_SWAP), keystream).translate(inv_sbox)
+        return self._unpad(res)
+
+    def _decode_plaintext(self, data: bytes) -> str:
+        return data.decode('utf-8', errors='ignore')
 
     def _pad(self, data: bytes) -> bytes:
         p = 8 - (len(data) % 8)
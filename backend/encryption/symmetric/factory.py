@@ -2,15 +2,22 @@
 Factory for creating symmetric encryption instances.
 """
 
-from .aes_lib import AESLib
-from .aes_manual import AESManual
-from .des_lib import DESLib
-from .des_manual import DESManual
+from ..registry import CipherRegistry
 from .base import SymmetricEncryption
-from .vigenere_lib import VigenereLib
-from .caesar_lib import CaesarLib
-from .railfence_lib import RailFenceLib
-from .playfair_lib import PlayfairLib
+
+# Şifre modülleri ilk kullanımda içe aktarılır (bkz. encryption/registry.py)
+registry = CipherRegistry(__package__, 'crypto_chat.symmetric')
+registry.register('aes', 'lib', '.aes_lib:AESLib')
+registry.register('aes', 'manual', '.aes_manual:AESManual')
+registry.register('des', 'lib', '.des_lib:DESLib')
+registry.register('des', 'manual', '.des_manual:DESManual')
+registry.register('aes-gcm', 'lib', '.aead_lib:AESGCMLib')
+registry.register('chacha20-poly1305', 'lib', '.aead_lib:ChaCha20Poly1305Lib')
+registry.register('vigenere', 'lib', '.vigenere_lib:VigenereLib')
+registry.register('caesar', 'lib', '.caesar_lib:CaesarLib')
+registry.register('railfence', 'lib', '.railfence_lib:RailFenceLib')
+registry.register('playfair', 'lib', '.playfair_lib:PlayfairLib')
+
 
 class SymmetricEncryptionFactory:
     """Factory for creating symmetric encryption instances."""
@@ -21,34 +28,16 @@ class SymmetricEncryptionFactory:
         Create a symmetric encryption instance.
         
         Args:
-            algorithm: 'aes' or 'des'
-            implementation: 'lib' or 'manual'
+            algorithm: 'aes', 'des', 'aes-gcm', 'chacha20-poly1305', a classical
+                cipher or one added through the 'crypto_chat.symmetric' entry points
+            implementation: 'lib' or 'manual' (unknown implementations fall back to 'lib')
             
         Returns:
             SymmetricEncryption instance
         """
-        algorithm = algorithm.lower()
-        implementation = implementation.lower()
-        
-        if algorithm == 'vigenere':
-            return VigenereLib()
-        if algorithm == 'aes':
-            if implementation == 'manual':
-                return AESManual()
-            return AESLib()
-        elif algorithm == 'des':
-            if implementation == 'manual':
-                return DESManual()
-            return DESLib()
-        elif algorithm == 'caesar':
-            return CaesarLib()
-        elif algorithm == 'railfence':
-            return RailFenceLib()
-        elif algorithm == 'playfair':
-            return PlayfairLib()
-        else:
-            raise ValueError(f"Unknown algorithm: {algorithm}")
-
-
-
+        return registry.create(algorithm, implementation)
 
+    @staticmethod
+    def register(algorithm: str, implementation: str, target) -> None:
+        """Register a cipher class or "module:Class" string."""
+        registry.register(algorithm, implementation, target)
@@ -1,72 +1,98 @@
-import base64
-from .base import SymmetricEncryption
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Tuple
+from .base import TextCipher
 
-class PlayfairLib(SymmetricEncryption):
+ALPHABET = "ABCDEFGHIKLMNOPQRSTUVWXYZ" # J dışarıda
+
+
+class _DigraphTable(dict):
+    """Digraph -> digraph map; pairs outside the matrix are computed on demand."""
+
+    def __init__(self, matrix, positions, step):
+        super().__init__()
+        self.matrix = matrix
+        self.positions = positions
+        self.step = step
+
+    def __missing__(self, pair):
+        # Tabloda olmayan (matris dışı karakter içeren) çiftler önbelleğe alınmaz
+        return _transform_pair(self.matrix, self.positions, pair[0], pair[1], self.step)
+
+
+class _PlayfairKey(NamedTuple):
+    matrix: List[str]
+    positions: Dict[str, Tuple[int, int]]
+    encrypt_table: _DigraphTable
+    decrypt_table: _DigraphTable
+
+
+def _transform_pair(matrix, positions, a, b, step):
+    # Matriste olmayan karakterler (0, 0) kabul edilir
+    r1, c1 = positions.get(a, (0, 0))
+    r2, c2 = positions.get(b, (0, 0))
+    if r1 == r2: # Aynı satır
+        return matrix[r1][(c1+step)%5] + matrix[r2][(c2+step)%5]
+    elif c1 == c2: # Aynı sütun
+        return matrix[(r1+step)%5][c1] + matrix[(r2+step)%5][c2]
+    else: # Dikdörtgen kuralı
+        return matrix[r1][c2] + matrix[r2][c1]
+
+
+def _key_string(key_bytes, alphabet):
+    key_str = key_bytes.decode('utf-8', errors='ignore').upper().replace('J', 'I')
+    res = []
+    for char in key_str + alphabet:
+        if char.isalpha() and char not in res:
+            res.append(char)
+    return "".join(res)
+
+
+@lru_cache(maxsize=32)
+def _build_key(key_bytes: bytes, alphabet: str) -> _PlayfairKey:
+    key_str = _key_string(key_bytes, alphabet)
+    matrix = [key_str[i:i+5] for i in range(0, 25, 5)]
+    positions = {char: (r, c) for r, row in enumerate(matrix) for c, char in enumerate(row)}
+    encrypt_table = _DigraphTable(matrix, positions, 1)
+    decrypt_table = _DigraphTable(matrix, positions, -1)
+    # 25 x 25 = 625 çiftin tamamı önceden hesaplanır
+    for a in positions:
+        for b in positions:
+            encrypt_table[a + b] = _transform_pair(matrix, positions, a, b, 1)
+            decrypt_table[a + b] = _transform_pair(matrix, positions, a, b, -1)
+    return _PlayfairKey(matrix, positions, encrypt_table, decrypt_table)
+
+
+class PlayfairLib(TextCipher):
     def __init__(self):
-        self.alphabet = "ABCDEFGHIKLMNOPQRSTUVWXYZ" # J dışarıda
-
-    def _prepare_key(self, key_bytes):
-        key_str = key_bytes.decode('utf-8', errors='ignore').upper().replace('J', 'I')
-        res = ""
-        for char in key_str + self.alphabet:
-            if char.isalpha() and char not in res:
-                res += char
-        return res
-
-    def _get_matrix(self, key_str):
-        return [key_str[i:i+5] for i in range(0, 25, 5)]
-
-    def _find_pos(self, matrix, char):
-        for r, row in enumerate(matrix):
-            if char in row: return r, row.find(char)
-        return 0, 0
-
-    def encrypt(self, plaintext, key):
-        key_str = self._prepare_key(key)
-        matrix = self._get_matrix(key_str)
-        text = plaintext.upper().replace('J', 'I').replace(" ", "")
-        
+        self.alphabet = ALPHABET
+
+    def prepare_key(self, key_bytes) -> _PlayfairKey:
+        # Oturumlar az sayıda anahtarı tekrar kullandığı için LRU önbellekten gelir
+        return _build_key(bytes(key_bytes), self.alphabet)
+
+    def _digraphs(self, text):
         # İkilere ayır ve aynı harf ise araya X koy
-        prepared = ""
+        pairs = []
         i = 0
         while i < len(text):
             a = text[i]
             b = text[i+1] if i+1 < len(text) else 'X'
             if a == b:
-                prepared += a + 'X'
+                pairs.append(a + 'X')
                 i += 1
             else:
-                prepared += a + b
+                pairs.append(a + b)
                 i += 2
-        
-        res = ""
-        for i in range(0, len(prepared), 2):
-            r1, c1 = self._find_pos(matrix, prepared[i])
-            r2, c2 = self._find_pos(matrix, prepared[i+1])
-            if r1 == r2: # Aynı satır
-                res += matrix[r1][(c1+1)%5] + matrix[r2][(c2+1)%5]
-            elif c1 == c2: # Aynı sütun
-                res += matrix[(r1+1)%5][c1] + matrix[(r2+1)%5][c2]
-            else: # Dikdörtgen kuralı
-                res += matrix[r1][c2] + matrix[r2][c1]
-        
-        return base64.b64encode(res.encode('utf-8')).decode('utf-8')
-
-    def decrypt(self, ciphertext, key):
-        data = base64.b64decode(ciphertext).decode('utf-8')
-        key_str = self._prepare_key(key)
-        matrix = self._get_matrix(key_str)
-        res = ""
-        for i in range(0, len(data), 2):
-            r1, c1 = self._find_pos(matrix, data[i])
-            r2, c2 = self._find_pos(matrix, data[i+1])
-            if r1 == r2:
-                res += matrix[r1][(c1-1)%5] + matrix[r2][(c2-1)%5]
-            elif c1 == c2:
-                res += matrix[(r1-1)%5][c1] + matrix[(r2-1)%5][c2]
-            else:
-                res += matrix[r1][c2] + matrix[r2][c1]
-        return res
+        return pairs
+
+    def encrypt_text(self, plaintext, playfair_key):
+        text = plaintext.upper().replace('J', 'I').replace(" ", "")
+        pairs = self._digraphs(text)
+        return "".join(map(playfair_key.encrypt_table.__getitem__, pairs))
+
+    def decrypt_text(self, data, playfair_key):
+        pairs = [data[i:i+2] for i in range(0, len(data), 2)]
+        return "".join(map(playfair_key.decrypt_table.__getitem__, pairs))
 
     def generate_key(self, key_size=None):
-        return b"PLAYFAIRKEY"
\ No newline at end of file
+        return b"PLAYFAIRKEY"
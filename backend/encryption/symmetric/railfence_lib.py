@@ -1,46 +1,78 @@
-import base64
-from .base import SymmetricEncryption
+import threading
+from array import array
+from collections import OrderedDict
+from .base import TextCipher
 
-class RailFenceLib(SymmetricEncryption):
-    def encrypt(self, plaintext: str, key: bytes) -> str:
+# Önbellekteki permütasyonların toplam bellek sınırı (bayt)
+PERMUTATION_CACHE_BYTES = 8 * 1024 * 1024
+
+
+class _PermutationCache:
+    """LRU cache of (rails, length) -> zigzag permutations with a total byte budget."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, rails: int, length: int):
+        key = (rails, length)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        entry = _build_permutation(rails, length)
+        entry_bytes = sum(a.itemsize * len(a) for a in entry)
+        if entry_bytes > self.max_bytes:
+            # Bütçeden büyük permütasyonlar önbelleğe alınmaz
+            return entry
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = entry
+                self.size_bytes += entry_bytes
+                while self.size_bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.size_bytes -= sum(a.itemsize * len(a) for a in evicted)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+
+
+def _build_permutation(rails: int, length: int):
+    # Zigzag desenini oluştur: 0, 1, ..., rails-1, ..., 1 tekrar eder
+    cycle = list(range(rails)) + list(range(rails - 2, 0, -1))
+    repeats, rest = divmod(length, len(cycle))
+    rail_of = cycle * repeats + cycle[:rest]
+    # encrypt: ray sırasıyla okunan indeksler (aynı ray içinde sıra korunur)
+    forward = array('I', sorted(range(length), key=rail_of.__getitem__))
+    # decrypt: forward'ın tersi
+    inverse = array('I', sorted(range(length), key=forward.__getitem__))
+    return forward, inverse
+
+
+_permutations = _PermutationCache(PERMUTATION_CACHE_BYTES)
+
+
+class RailFenceLib(TextCipher):
+    def prepare_key(self, key: bytes) -> int:
         # Anahtarın ilk byte'ını 'ray' sayısı olarak kullanıyoruz (min 2)
-        rails = max(2, key[0] % 10) 
-        fence = [[] for _ in range(rails)]
-        rail = 0
-        direction = 1
-
-        for char in plaintext:
-            fence[rail].append(char)
-            rail += direction
-            if rail == rails - 1 or rail == 0:
-                direction *= -1
-        
-        res = "".join(["".join(r) for r in fence])
-        return base64.b64encode(res.encode('utf-8')).decode('utf-8')
-
-    def decrypt(self, ciphertext: str, key: bytes) -> str:
-        data = base64.b64decode(ciphertext).decode('utf-8')
-        rails = max(2, key[0] % 10)
-        
-        # Zigzag desenini oluştur
-        pattern = [None] * len(data)
-        fence = [[] for _ in range(rails)]
-        rail = 0
-        direction = 1
-        for i in range(len(data)):
-            fence[rail].append(i)
-            rail += direction
-            if rail == rails - 1 or rail == 0:
-                direction *= -1
-        
-        # Karakterleri desene yerleştir
-        idx = 0
-        for r in range(rails):
-            for pos in fence[r]:
-                pattern[pos] = data[idx]
-                idx += 1
-        
-        return "".join(pattern)
+        return max(2, key[0] % 10)
+
+    def encrypt_text(self, plaintext: str, rails: int) -> str:
+        forward, _ = _permutations.get(rails, len(plaintext))
+        return "".join(map(plaintext.__getitem__, forward))
+
+    def decrypt_text(self, data: str, rails: int) -> str:
+        # Karakterleri desene tek geçişte yerleştir
+        _, inverse = _permutations.get(rails, len(data))
+        return "".join(map(data.__getitem__, inverse))
 
     def generate_key(self, key_size: int = None) -> bytes:
-        return b'\x03' # 3 raylı bir çit varsayılanı
\ No newline at end of file
+        return b'\x03' # 3 raylı bir çit varsayılanı
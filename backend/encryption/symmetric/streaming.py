@@ -0,0 +1,118 @@
+"""
+Chunked CBC streams and in-place CBC framing for the cryptography-backed ciphers.
+
+Çerçeve biçimi encrypt_bytes ile aynıdır (IV + PKCS7 dolgulu şifreli metin),
+böylece parça parça şifrelenen bir akış tek seferde de çözülebilir.
+Bellek kullanımı parça boyutuyla sınırlıdır.
+
+cbc_encrypt_into/cbc_decrypt_into çerçeveyi çağıranın tamponunda kurar:
+düz metin tampona bir kez kopyalanır, dolgu yerinde yazılır ve şifreleme
+aynı bellekte (update_into) yapılır; ara bytes nesnesi oluşmaz.
+"""
+
+import os
+from cryptography.hazmat.primitives import padding
+from cryptography.hazmat.primitives.ciphers import Cipher, modes
+from cryptography.hazmat.backends import default_backend
+from .base import BytesLike, StreamTransform
+
+
+def cbc_frame_size(length: int, block_size: int = 16, iv_size: int = 16) -> int:
+    """Buffer size cbc_encrypt_into needs for `length` plaintext bytes."""
+    # update_into, çıktı tamponunda girdiden (blok boyu - 1) bayt fazla yer ister
+    return iv_size + (length // block_size + 1) * block_size + block_size - 1
+
+
+def cbc_plaintext_size(frame_length: int, block_size: int = 16, iv_size: int = 16) -> int:
+    """Buffer size cbc_decrypt_into needs for a frame of `frame_length` bytes."""
+    return max(frame_length - iv_size, 0) + block_size - 1
+
+
+def _check_size(out, needed: int) -> None:
+    if len(out) < needed:
+        raise ValueError(f"Çıktı tamponu çok küçük: {needed} bayt gerekli, {len(out)} verildi")
+
+
+def cbc_encrypt_into(algorithm, data: BytesLike, out, iv_size: int = 16) -> int:
+    """Write IV + PKCS7-padded CBC ciphertext of data into out; returns the frame length."""
+    view = memoryview(out)
+    length = len(data)
+    block = algorithm.block_size // 8
+    _check_size(view, cbc_frame_size(length, block, iv_size))
+    padding_length = block - length % block
+    end = iv_size + length + padding_length
+
+    iv = os.urandom(iv_size)
+    view[:iv_size] = iv
+    view[iv_size:iv_size + length] = data
+    view[iv_size + length:end] = bytes((padding_length,)) * padding_length
+
+    # Tampon yerinde şifrelenir (girdi ve çıktı aynı adresten başlar)
+    encryptor = Cipher(algorithm, modes.CBC(iv), backend=default_backend()).encryptor()
+    written = encryptor.update_into(view[iv_size:end], view[iv_size:])
+    encryptor.finalize()
+    return iv_size + written
+
+
+def cbc_decrypt_into(algorithm, frame: BytesLike, out, iv_size: int = 16) -> int:
+    """Decrypt a CBC frame into out; returns the padded plaintext length (caller strips padding)."""
+    frame = memoryview(frame)
+    _check_size(out, cbc_plaintext_size(len(frame), algorithm.block_size // 8, iv_size))
+    decryptor = Cipher(algorithm, modes.CBC(bytes(frame[:iv_size])), backend=default_backend()).decryptor()
+    written = decryptor.update_into(frame[iv_size:], out)
+    decryptor.finalize()
+    return written
+
+
+class CBCEncryptStream(StreamTransform):
+    """PKCS7 + CBC encryptor; the IV is emitted in front of the first output."""
+
+    def __init__(self, algorithm, iv_size: int = 16):
+        iv = os.urandom(iv_size)
+        self._header = iv
+        self._padder = padding.PKCS7(algorithm.block_size).padder()
+        self._encryptor = Cipher(algorithm, modes.CBC(iv), backend=default_backend()).encryptor()
+
+    def _emit(self, data: bytes) -> bytes:
+        if self._header and data:
+            data, self._header = self._header + data, b""
+        return data
+
+    def update(self, data: BytesLike) -> bytes:
+        return self._emit(self._encryptor.update(self._padder.update(bytes(data))))
+
+    def finalize(self) -> bytes:
+        # Dolgu her zaman en az bir blok üretir, IV burada mutlaka gönderilir
+        tail = self._encryptor.update(self._padder.finalize()) + self._encryptor.finalize()
+        return self._emit(tail)
+
+
+class CBCDecryptStream(StreamTransform):
+    """Inverse of CBCEncryptStream; buffers only until the IV is complete."""
+
+    def __init__(self, algorithm, iv_size: int = 16):
+        self._algorithm = algorithm
+        self._iv_size = iv_size
+        self._iv = b""
+        self._decryptor = None
+        self._unpadder = padding.PKCS7(algorithm.block_size).unpadder()
+
+    def update(self, data: BytesLike) -> bytes:
+        data = bytes(data)
+        if self._decryptor is None:
+            # IV parçalar arasında bölünmüş olabilir
+            missing = self._iv_size - len(self._iv)
+            self._iv += data[:missing]
+            data = data[missing:]
+            if len(self._iv) < self._iv_size:
+                return b""
+            self._decryptor = Cipher(
+                self._algorithm, modes.CBC(self._iv), backend=default_backend()
+            ).decryptor()
+        return self._unpadder.update(self._decryptor.update(data))
+
+    def finalize(self) -> bytes:
+        if self._decryptor is None:
+            raise ValueError("Akış IV'den önce bitti")
+        tail = self._unpadder.update(self._decryptor.finalize())
+        return tail + self._unpadder.finalize()
@@ -1,32 +1,28 @@
-import base64
-from .base import SymmetricEncryption
+from array import array
+from itertools import repeat
+from operator import add, mod, sub
+from .base import TextCipher
+from .bulk import UNICODE_SIZE, code_points, from_code_points, tile_array
 
-class VigenereLib(SymmetricEncryption):
-    def encrypt(self, plaintext: str, key: bytes) -> str:
+class VigenereLib(TextCipher):
+    def prepare_key(self, key: bytes) -> array:
         # Key'i stringe çeviriyoruz
         key_str = key.decode('utf-8', errors='ignore')
         if not key_str: key_str = "KEY"
-        
-        res = ""
-        for i in range(len(plaintext)):
-            p = ord(plaintext[i])
-            k = ord(key_str[i % len(key_str)])
-            # ASCII karakter aralığında kaydırma işlemi
-            res += chr((p + k) % 1114112) 
-        
-        return base64.b64encode(res.encode('utf-8')).decode('utf-8')
+        return code_points(key_str)
 
-    def decrypt(self, ciphertext: str, key: bytes) -> str:
-        data = base64.b64decode(ciphertext).decode('utf-8')
-        key_str = key.decode('utf-8', errors='ignore')
-        if not key_str: key_str = "KEY"
-        
-        res = ""
-        for i in range(len(data)):
-            c = ord(data[i])
-            k = ord(key_str[i % len(key_str)])
-            res += chr((c - k) % 1114112)
-        return res
+    def _shift(self, text: str, key_points: array, op) -> str:
+        # Metin ve tekrarlanan anahtar kod noktaları üzerinde tek geçiş
+        points = code_points(text)
+        key_stream = tile_array(key_points, len(points))
+        shifted = map(mod, map(op, points, key_stream), repeat(UNICODE_SIZE))
+        return from_code_points(array('I', shifted))
+
+    def encrypt_text(self, plaintext: str, key_points: array) -> str:
+        return self._shift(plaintext, key_points, add)
+
+    def decrypt_text(self, data: str, key_points: array) -> str:
+        return self._shift(data, key_points, sub)
 
     def generate_key(self, key_size: int = None) -> bytes:
         return b"CLASSICKEY"
\ No newline at end of file
@@ -0,0 +1,35 @@
+"""
+Server-side infrastructure for the crypto chat application.
+Keeps expensive work (key generation etc.) off the Socket.IO handlers.
+"""
+
+from .key_pool import KeyPairPool
+from .key_cache import KeyHandle
+from .executor import CryptoExecutor, ExecutorBusy
+from .metrics import LatencyHistogram, MetricsRegistry, FAST_BUCKETS
+from .session_store import (SessionStore, MemorySessionStore, SQLiteSessionStore,
+                            RemoteSessionStore, InMemoryRemoteClient, create_session_store)
+from .broker import LocalBroker, LocalSocketManager, InProcessManager, create_client_manager
+from .cluster import StickyRouter, run_cluster, use_worker_sid_prefix
+from .tickets import TicketIssuer, TicketError
+from .ecdh import ECDHKeyRing, UnknownServerKey
+from .streams import StreamRegistry, StreamState, StreamLimitExceeded
+from .handshakes import HandshakeTracker, HandshakeLimitExceeded
+from .session import Session, cipher_id, codec_id
+from .components import (ServerComponents, build_session, transform_message,
+                         ECDH_MODE, KEY_POOL_ALGORITHMS)
+from .handlers import ChatHandlers, Emit, Offload, run_steps, run_steps_async
+
+__all__ = ['KeyPairPool', 'KeyHandle', 'CryptoExecutor', 'ExecutorBusy', 'LatencyHistogram',
+           'MetricsRegistry', 'FAST_BUCKETS',
+           'SessionStore', 'MemorySessionStore', 'SQLiteSessionStore', 'RemoteSessionStore',
+           'InMemoryRemoteClient', 'create_session_store',
+           'LocalBroker', 'LocalSocketManager', 'InProcessManager', 'create_client_manager',
+           'StickyRouter', 'run_cluster', 'use_worker_sid_prefix',
+           'TicketIssuer', 'TicketError',
+           'ECDHKeyRing', 'UnknownServerKey',
+           'StreamRegistry', 'StreamState', 'StreamLimitExceeded',
+           'HandshakeTracker', 'HandshakeLimitExceeded',
+           'Session', 'cipher_id', 'codec_id',
+           'ServerComponents', 'build_session', 'transform_message', 'ECDH_MODE', 'KEY_POOL_ALGORITHMS',
+           'ChatHandlers', 'Emit', 'Offload', 'run_steps', 'run_steps_async']
@@ -0,0 +1,302 @@
+"""
+Socket.IO message queue backends for multi-worker deployments.
+
+Flask-SocketIO'nun `message_queue` desteği işçiler arasında yayın (broadcast)
+ve oda olaylarını taşır. Redis/Kafka/Kombu/ZMQ adresleri python-socketio'nun
+kendi yöneticilerine gider; test ve tek makine için iki yedek vardır:
+
+- local://host:port  -> LocalBroker sürecine TCP ile bağlanan LocalSocketManager
+- memory://kanal     -> aynı süreçteki sunucular arasında InProcessManager
+
+local:// çerçeveleri pickle ile taşınır (olay verisi bayt ve tuple içerebilir);
+TCP üzerinden gelen hiçbir çerçeve BROKER_SECRET ile anahtarlanmış HMAC
+doğrulanmadan açılmaz. Broker çerçeveleri açmadan yalnızca dağıtır.
+"""
+
+import hashlib
+import hmac
+import os
+import pickle
+import socket
+import socketserver
+import struct
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import socketio
+
+_FRAME_HEADER = struct.Struct('!I')
+_MAC_SIZE = hashlib.sha256().digest_size
+
+
+def _socket_module(async_mode: str):
+    """Blocking socket module matching the server's async mode."""
+    if async_mode == 'eventlet':
+        from eventlet.green import socket as green_socket
+        return green_socket
+    if async_mode == 'gevent':
+        from gevent import socket as gevent_socket
+        return gevent_socket
+    return socket
+
+
+def _recv_exactly(sock, size: int) -> Optional[bytes]:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 65536))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def read_frame(sock) -> Optional[bytes]:
+    """Read one length-prefixed frame; None when the peer closed the connection."""
+    header = _recv_exactly(sock, _FRAME_HEADER.size)
+    if header is None:
+        return None
+    return _recv_exactly(sock, _FRAME_HEADER.unpack(header)[0])
+
+
+def write_frame(sock, payload: bytes) -> None:
+    sock.sendall(_FRAME_HEADER.pack(len(payload)) + payload)
+
+
+def sign_message(secret: bytes, message) -> bytes:
+    """Pickle a queue message and prefix it with its HMAC-SHA256."""
+    payload = pickle.dumps(message)
+    return hmac.new(secret, payload, hashlib.sha256).digest() + payload
+
+
+def open_message(secret: bytes, frame: bytes):
+    """
+    Verify and unpickle a frame built by sign_message.
+
+    Raises:
+        ValueError: the frame is not authenticated by secret
+    """
+    mac, payload = frame[:_MAC_SIZE], frame[_MAC_SIZE:]
+    if len(mac) != _MAC_SIZE or not hmac.compare_digest(mac, hmac.new(secret, payload, hashlib.sha256).digest()):
+        raise ValueError("Broker çerçevesi doğrulanamadı")
+    return pickle.loads(payload)
+
+
+class _DirectReplyMixin:
+    """
+    Keep emits addressed to a locally connected sid off the queue.
+
+    Yapışkan oturumlarda bir sid'in tüm olayları aynı işçide olduğu için
+    handler cevaplarının diğer işçilere yayınlanması gereksizdir; bu olmadan
+    her mesaj N işçinin hepsinde çözülür ve ölçekleme doğrusal olmaz.
+    """
+
+    def emit(self, event, data, namespace=None, room=None, skip_sid=None,
+             callback=None, **kwargs):
+        if room is not None and not kwargs.get('ignore_queue') \
+                and self.is_connected(room, namespace or '/'):
+            kwargs['ignore_queue'] = True
+        return super().emit(event, data, namespace=namespace, room=room,
+                            skip_sid=skip_sid, callback=callback, **kwargs)
+
+
+class LocalSocketManager(_DirectReplyMixin, socketio.PubSubManager):
+    """
+    Client manager talking to a LocalBroker over TCP (local://host:port).
+
+    Aynı broker'a bağlanan tüm işçiler aynı secret'ı kullanmalıdır;
+    doğrulanamayan çerçeveler düşürülür.
+    """
+
+    name = 'local'
+
+    def __init__(self, url: str = 'local://127.0.0.1:6380', channel: str = 'socketio',
+                 write_only: bool = False, logger=None, secret: Optional[bytes] = None):
+        parsed = urlparse(url)
+        if parsed.scheme != 'local' or parsed.port is None:
+            raise ValueError(f"Beklenmeyen broker adresi: {url}")
+        if not secret:
+            raise ValueError("local:// message queue için BROKER_SECRET gerekli")
+        self.address = (parsed.hostname or '127.0.0.1', parsed.port)
+        self.secret = secret
+        self._sock = None
+        self._outbox = None
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+
+    def initialize(self):
+        # Bağlantı görevler başlamadan kurulur; sonrasında yalnızca dinleyici yeniden bağlanır
+        try:
+            self._connect()
+        except OSError:
+            self._get_logger().warning('Broker %s:%s erişilemiyor, yeniden denenecek', *self.address)
+        self._outbox = self.server.eio.create_queue()
+        super().initialize()
+        self.server.start_background_task(self._writer)
+
+    def _connect(self):
+        if self._sock is None:
+            async_mode = self.server.async_mode if self.server is not None else 'threading'
+            self._sock = _socket_module(async_mode).create_connection(self.address)
+        return self._sock
+
+    def _publish(self, data):
+        payload = sign_message(self.secret, {'channel': self.channel, 'data': data})
+        if self._outbox is None:
+            # Yalnızca yazan (write_only) yardımcı süreçler doğrudan gönderir
+            write_frame(self._connect(), payload)
+        else:
+            # Tek yazıcı görevi çerçevelerin iç içe geçmesini önler
+            self._outbox.put(payload)
+
+    def _writer(self):
+        while True:
+            payload = self._outbox.get()
+            sock = self._sock
+            if sock is None:
+                self._get_logger().warning('Broker bağlantısı yok, mesaj düşürüldü')
+                continue
+            try:
+                write_frame(sock, payload)
+            except OSError:
+                self._get_logger().warning('Broker bağlantısı koptu, mesaj düşürüldü')
+
+    def _listen(self):
+        while True:
+            try:
+                frame = read_frame(self._connect())
+            except OSError:
+                frame = None
+            if frame is None:
+                if self._sock is not None:
+                    self._sock.close()
+                    self._sock = None
+                self.server.sleep(1)
+                continue
+            try:
+                message = open_message(self.secret, frame)
+            except ValueError:
+                self._get_logger().warning('Doğrulanamayan broker çerçevesi düşürüldü')
+                continue
+            if message.get('channel') == self.channel:
+                yield message['data']
+
+
+class InProcessManager(_DirectReplyMixin, socketio.PubSubManager):
+    """Client manager connecting servers inside one process (memory://channel), for tests."""
+
+    name = 'memory'
+    _subscribers: Dict[str, List] = defaultdict(list)
+
+    def __init__(self, url: str = 'memory://', channel: str = 'socketio',
+                 write_only: bool = False, logger=None):
+        channel = urlparse(url).netloc or channel
+        self._queue = None
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+
+    def initialize(self):
+        self._queue = self.server.eio.create_queue()
+        InProcessManager._subscribers[self.channel].append(self._queue)
+        super().initialize()
+
+    def _publish(self, data):
+        for queue in list(InProcessManager._subscribers[self.channel]):
+            queue.put(data)
+
+    def _listen(self):
+        while True:
+            yield self._queue.get()
+
+
+class LocalBroker(socketserver.ThreadingTCPServer):
+    """
+    Minimal fan-out broker: every frame is forwarded to every connected manager.
+
+    Redis gibi harici bir servis olmadan tek makinede işçileri bağlamak ve
+    testlerde kullanmak içindir.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        self._clients = set()
+        self._clients_lock = threading.Lock()
+        super().__init__((host, port), _BrokerHandler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"local://{host}:{port}"
+
+    def start(self) -> threading.Thread:
+        """Serve in a daemon thread and return it."""
+        thread = threading.Thread(target=self.serve_forever, name='local-broker', daemon=True)
+        thread.start()
+        return thread
+
+    def _fan_out(self, payload: bytes):
+        with self._clients_lock:
+            clients = list(self._clients)
+        for client in clients:
+            try:
+                with client.send_lock:
+                    write_frame(client.request, payload)
+            except OSError:
+                self._drop(client)
+
+    def _add(self, client):
+        with self._clients_lock:
+            self._clients.add(client)
+
+    def _drop(self, client):
+        with self._clients_lock:
+            self._clients.discard(client)
+
+
+class _BrokerHandler(socketserver.BaseRequestHandler):
+    def setup(self):
+        self.send_lock = threading.Lock()
+        self.server._add(self)
+
+    def handle(self):
+        while True:
+            try:
+                frame = read_frame(self.request)
+            except OSError:
+                return
+            if frame is None:
+                return
+            self.server._fan_out(frame)
+
+    def finish(self):
+        self.server._drop(self)
+
+
+def create_client_manager(url: str, channel: str = 'flask-socketio', write_only: bool = False,
+                          secret: Optional[bytes] = None):
+    """
+    Client manager for a message queue URL.
+
+    Same URL schemes as Flask-SocketIO's `message_queue` plus local:// and
+    memory://; direct replies to local sids never go through the queue.
+    local:// frames are authenticated with secret (default: BROKER_SECRET).
+    """
+    scheme = urlparse(url).scheme
+    if scheme == 'local':
+        if secret is None and os.environ.get('BROKER_SECRET'):
+            secret = os.environ['BROKER_SECRET'].encode('utf-8')
+        return LocalSocketManager(url, channel=channel, write_only=write_only, secret=secret)
+    if scheme == 'memory':
+        return InProcessManager(url, channel=channel, write_only=write_only)
+    if scheme in ('redis', 'rediss'):
+        base = socketio.RedisManager
+    elif scheme == 'kafka':
+        base = socketio.KafkaManager
+    elif scheme.startswith('zmq'):
+        base = socketio.ZmqManager
+    else:
+        base = socketio.KombuManager
+    manager_class = type(base.__name__, (_DirectReplyMixin, base), {})
+    return manager_class(url, channel=channel, write_only=write_only)
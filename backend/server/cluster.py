@@ -0,0 +1,234 @@
+"""
+Multi-worker launch mode with sticky routing by Engine.IO sid.
+
+Her işçi ayrı bir süreçte (eventlet/gevent ile) kendi portunu dinler ve
+ürettiği sid'lerin başına kendi numarasını koyar ("<işçi>.<sid>"). Önde
+çalışan StickyRouter isteğin `sid` parametresine bakarak onu sid'i üreten
+işçiye yollar; sid'siz el sıkışmaları sırayla (round-robin) dağıtır.
+İşçiler arası yayınlar Socket.IO message queue (bkz. broker) ile taşınır.
+
+StickyRouter geliştirme içindir: tüm trafik tek bir Python sürecinden geçer
+ve polling bağlantıları her istekte kapatılır. Üretimde yönlendirici yerine
+nginx/HAProxy gibi bir proxy kullanılır; sid önekine göre yönlendirme veya
+ip_hash yeterlidir (örnek yapılandırma README'de).
+"""
+
+import itertools
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from typing import List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .broker import LocalBroker
+
+Address = Tuple[str, int]
+
+SID_SEPARATOR = '.'
+_MAX_HEAD_SIZE = 64 * 1024
+
+
+def use_worker_sid_prefix(socketio_server, worker_index: int) -> None:
+    """Prefix the Engine.IO sids generated by this worker with its index."""
+    eio = socketio_server.eio
+    generate_id = eio.generate_id
+    prefix = f"{worker_index}{SID_SEPARATOR}"
+    eio.generate_id = lambda: prefix + generate_id()
+
+
+def worker_for_sid(sid: str, workers: int) -> Optional[int]:
+    """Worker index encoded in a prefixed sid, or None if it has no valid prefix."""
+    index, separator, _ = sid.partition(SID_SEPARATOR)
+    if not separator or not index.isdigit():
+        return None
+    index = int(index)
+    return index if index < workers else None
+
+
+def _splice(source: socket.socket, target: socket.socket) -> None:
+    try:
+        while True:
+            data = source.recv(65536)
+            if not data:
+                break
+            target.sendall(data)
+    except OSError:
+        pass
+    finally:
+        # Karşı yönün de bitmesi için yazma tarafını kapat
+        try:
+            target.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+
+
+def _read_head(sock: socket.socket) -> Optional[bytes]:
+    data = b""
+    while b"\r\n\r\n" not in data:
+        chunk = sock.recv(65536)
+        if not chunk:
+            return None
+        data += chunk
+        if len(data) > _MAX_HEAD_SIZE:
+            return None
+    return data
+
+
+def _rewrite_connection_close(head: bytes, body_start: bytes) -> bytes:
+    # Uzun yoklama (polling) istekleri farklı sid'ler taşıyabileceğinden
+    # her bağlantı tek bir istekle sınırlanır
+    lines = [line for line in head.split(b"\r\n")
+             if not line.lower().startswith(b"connection:")]
+    lines.append(b"Connection: close")
+    return b"\r\n".join(lines) + b"\r\n\r\n" + body_start
+
+
+class StickyRouter:
+    """TCP-level HTTP/WebSocket router that keeps every sid on its worker."""
+
+    def __init__(self, backends: Sequence[Address], host: str = '0.0.0.0', port: int = 5000):
+        self.backends = list(backends)
+        self.host = host
+        self.port = port
+        self._round_robin = itertools.cycle(range(len(self.backends)))
+        self._round_robin_lock = threading.Lock()
+        self._listener = None
+
+    def pick_backend(self, target: str) -> int:
+        """Worker index for a request target ("/socket.io/?EIO=4&sid=...")."""
+        sid = parse_qs(urlsplit(target).query).get('sid', [''])[0]
+        index = worker_for_sid(sid, len(self.backends))
+        if index is None:
+            with self._round_robin_lock:
+                index = next(self._round_robin)
+        return index
+
+    def _handle(self, client: socket.socket) -> None:
+        upstream = None
+        try:
+            data = _read_head(client)
+            if data is None:
+                return
+            head, _, body_start = data.partition(b"\r\n\r\n")
+            request_line = head.split(b"\r\n", 1)[0].decode('latin-1')
+            parts = request_line.split(' ')
+            target = parts[1] if len(parts) > 1 else '/'
+            if b"upgrade: websocket" not in head.lower():
+                data = _rewrite_connection_close(head, body_start)
+
+            upstream = socket.create_connection(self.backends[self.pick_backend(target)])
+            upstream.sendall(data)
+            forward = threading.Thread(target=_splice, args=(client, upstream), daemon=True)
+            forward.start()
+            _splice(upstream, client)
+            forward.join()
+        except OSError:
+            pass
+        finally:
+            client.close()
+            if upstream is not None:
+                upstream.close()
+
+    def serve_forever(self) -> None:
+        self._listener = socket.create_server((self.host, self.port), backlog=1024)
+        while True:
+            try:
+                client, _ = self._listener.accept()
+            except OSError:
+                break
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            threading.Thread(target=self._handle, args=(client,), daemon=True).start()
+
+    def close(self) -> None:
+        if self._listener is not None:
+            # accept() içinde bekleyen thread'i uyandırmak için önce shutdown
+            try:
+                self._listener.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._listener.close()
+
+
+def wait_for_port(address: Address, timeout: float = 30.0) -> None:
+    """Block until something accepts connections on address."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection(address, timeout=1).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"İşçi {address[0]}:{address[1]} zamanında başlamadı")
+            time.sleep(0.1)
+
+
+def start_workers(script: str, workers: int, base_port: int,
+                  message_queue: str, extra_args: Sequence[str] = ()) -> List[subprocess.Popen]:
+    """
+    Start `script --worker-index i --port base_port+i` for every worker.
+
+    BROKER_SECRET verilmemişse işçiler için ortak rastgele bir sır üretilir
+    (local:// çerçevelerinin HMAC anahtarı).
+    """
+    env = dict(os.environ, SOCKETIO_MESSAGE_QUEUE=message_queue)
+    env.setdefault('BROKER_SECRET', os.urandom(32).hex())
+    processes = []
+    for index in range(workers):
+        command = [sys.executable, script, '--worker-index', str(index),
+                   '--host', '127.0.0.1', '--port', str(base_port + index), *extra_args]
+        processes.append(subprocess.Popen(command, env=env))
+    for index in range(workers):
+        wait_for_port(('127.0.0.1', base_port + index))
+    return processes
+
+
+def stop_workers(processes: Sequence[subprocess.Popen], timeout: float = 10.0) -> None:
+    """Stop workers with SIGINT so they can shut their key pools down, then SIGKILL."""
+    for process in processes:
+        if process.poll() is None:
+            process.send_signal(signal.SIGINT)
+    for process in processes:
+        try:
+            process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def run_cluster(script: str, workers: int, host: str = '0.0.0.0', port: int = 5000,
+                message_queue: Optional[str] = None) -> None:
+    """
+    Run `workers` copies of script behind a sticky router on host:port.
+
+    Args:
+        script: Server entry point accepting --worker-index/--host/--port
+        workers: Number of worker processes
+        message_queue: Shared queue URL; a LocalBroker is started when omitted
+    """
+    broker = None
+    if message_queue is None:
+        broker = LocalBroker()
+        broker.start()
+        message_queue = broker.url
+
+    base_port = port + 1
+    processes = start_workers(script, workers, base_port, message_queue)
+    router = StickyRouter([('127.0.0.1', base_port + i) for i in range(workers)], host, port)
+    print(f"{workers} workers behind sticky router on {host}:{port} (queue: {message_queue})")
+
+    def stop(*_):
+        router.close()
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        router.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_workers(processes)
+        if broker is not None:
+            broker.shutdown()
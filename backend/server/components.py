@@ -0,0 +1,272 @@
+"""
+Shared server state for the two entry points (app.py with Flask-SocketIO,
+asgi.py with python-socketio's AsyncServer).
+
+Oturum deposu, anahtar havuzu, executor, biletler, ECDH anahtarları,
+akışlar ve metrikler ortam değişkenlerinden tek yerde kurulur; iki sunucu
+da aynı yapılandırmayı ve aynı /metrics çıktısını kullanır.
+"""
+
+import os
+from functools import partial
+from typing import Any, Dict, Mapping, Optional
+
+from encryption import SymmetricEncryptionFactory
+from encryption.compression import (CODECS, DEFAULT_THRESHOLD, CompressionStats, compress_context,
+                                    validate as validate_compression)
+from .ecdh import ECDHKeyRing
+from .executor import CryptoExecutor
+from .handshakes import HandshakeTracker
+from .key_pool import KeyPairPool
+from .metrics import FAST_BUCKETS, MetricsRegistry
+from .session import Session
+from .session_store import create_session_store
+from .streams import StreamRegistry
+from .tickets import TicketIssuer
+
+# Anahtar havuzunda önceden üretilen algoritmalar
+KEY_POOL_ALGORITHMS = ('rsa', 'ecc')
+# key_exchange_params'ta sunucunun dönem anahtarını kullanan el sıkışma modu
+ECDH_MODE = 'ecdh'
+
+
+def build_session(record: Dict[str, Any], compression_threshold: int = DEFAULT_THRESHOLD,
+                  compression_stats: Optional[CompressionStats] = None) -> Session:
+    """Depodaki kayıttan oturum nesnesini kurar (şifreleyici bir kez bağlanır)."""
+    session = Session.from_record(record)
+    if session.symmetric_algorithm is not None:
+        symmetric_enc = SymmetricEncryptionFactory.create(
+            session.symmetric_algorithm, session.symmetric_implementation
+        )
+        session.cipher = symmetric_enc.bind(session.symmetric_key)
+        if session.compression:
+            # Sıkıştırma aşaması şifreleyicinin önüne eklenir; mesaj yolu değişmez
+            session.cipher = compress_context(
+                session.cipher, session.compression, session.compression_dictionary,
+                threshold=compression_threshold, stats=compression_stats
+            )
+        # Metrik etiketi (ör. AESLib): algoritma + implementasyonu sınırlı bir kümeyle adlandırır
+        session.cipher_name = type(symmetric_enc).__name__
+    return session
+
+
+def transform_message(cipher, binary: bool, encrypted_incoming, timer):
+    """
+    Tek bir şifreli mesajı çözer, cevabı hazırlar ve tekrar şifreler.
+    (log için açık metin, şifreli cevap) döner; aşama süreleri timer'a yazılır.
+    """
+    if binary:
+        # İkili mod: çerçeve ham bayt olarak gelir ve gider (base64 yok)
+        decrypted_bytes = cipher.decrypt_bytes(encrypted_incoming)
+        timer.lap('decrypt')
+        response_bytes = b"+" + decrypted_bytes
+        timer.lap('transform')
+        re_encrypted = cipher.encrypt_bytes(response_bytes)
+        timer.lap('encrypt')
+        return decrypted_bytes.decode('utf-8', errors='replace'), re_encrypted
+
+    # 1. Mesajı Deşifre Et (Sunucu içeriği görür)
+    decrypted_text = cipher.decrypt(encrypted_incoming)
+    timer.lap('decrypt')
+
+    # 2. Cevabı Hazırla
+    server_response_text = f"+{decrypted_text}"
+    timer.lap('transform')
+
+    # 3. Cevabı TEKRAR ŞİFRELE (Ağ güvenliği için en kritik adım)
+    # Artık 'decrypted' veya 'original_encrypted' gibi açık alanlar göndermiyoruz.
+    re_encrypted = cipher.encrypt(server_response_text)
+    timer.lap('encrypt')
+    return decrypted_text, re_encrypted
+
+
+def _secret(environ: Mapping[str, str], name: str) -> Optional[bytes]:
+    return environ[name].encode('utf-8') if environ.get(name) else None
+
+
+class ServerComponents:
+    """Session store, handshake tracker, key pool, executor, tickets, ECDH keys, streams and metrics."""
+
+    def __init__(self, async_mode: str = 'threading', environ: Mapping[str, str] = os.environ):
+        # İstemcinin set_encryption_settings'te seçebileceği sıkıştırma algoritmaları (boş: kapalı)
+        self.compression_codecs = tuple(
+            codec for codec in environ.get('COMPRESSION_CODECS', ','.join(CODECS)).split(',') if codec
+        )
+        self.compression_threshold = int(environ.get('COMPRESSION_THRESHOLD', DEFAULT_THRESHOLD))
+        self.compression_stats = CompressionStats()
+
+        # Sunucu anahtarı alıp el sıkışmayı tamamlamayan oturumlar (sınırlı sayıda, süreli)
+        self.handshakes = HandshakeTracker(
+            max_pending=int(environ.get('MAX_HALF_OPEN_HANDSHAKES', 1000)),
+            timeout=float(environ.get('HANDSHAKE_TIMEOUT', 30))
+        )
+
+        # Oturum durumu (sunucu private key'i + istemci şifreleme ayarları), sid bazlı.
+        # Çok süreçli kurulumlar için SESSION_STORE=sqlite veya remote kullanılır.
+        # SESSION_TTL boyunca etkinlik görmeyen oturumları süpürücü siler; SESSION_MAX_SESSIONS
+        # dolunca en uzun süredir etkinlik görmeyen oturum çıkarılır (0: sınırsız).
+        session_ttl = float(environ.get('SESSION_TTL', 3600))
+        max_sessions = int(environ.get('SESSION_MAX_SESSIONS', 100000))
+        self.sessions = create_session_store(
+            environ.get('SESSION_STORE', 'memory'),
+            ttl=session_ttl if session_ttl > 0 else None,
+            materialize=partial(build_session, compression_threshold=self.compression_threshold,
+                                compression_stats=self.compression_stats),
+            path=environ.get('SESSION_STORE_PATH', 'sessions.db'),
+            url=environ.get('SESSION_STORE_URL'),
+            max_sessions=max_sessions if max_sessions > 0 else None,
+            on_evict=self._session_evicted
+        )
+        self.sweep_interval = float(environ.get('SESSION_SWEEP_INTERVAL', 30))
+
+        # Önceden üretilmiş sunucu anahtar çiftleri (handler sadece hazır çifti alır)
+        self.key_pool = KeyPairPool(
+            low_watermark=int(environ.get('KEY_POOL_LOW_WATERMARK', 4)),
+            high_watermark=int(environ.get('KEY_POOL_HIGH_WATERMARK', 16)),
+            workers=int(environ.get('KEY_POOL_WORKERS', 2))
+        )
+
+        # Asimetrik işlemler (anahtar üretimi, anahtar çözme) bu katmanda çalışır;
+        # kuyruk doluysa istemciye "meşgul" hatası döner
+        self.crypto_executor = CryptoExecutor(
+            max_pending=int(environ.get('CRYPTO_EXECUTOR_MAX_PENDING', 64)),
+            workers=int(environ.get('CRYPTO_EXECUTOR_WORKERS', 4)),
+            async_mode=async_mode
+        )
+
+        # Oturum devam biletleri: yeniden bağlanan istemci asimetrik el sıkışmayı atlar.
+        # Çok işçili kurulumda tüm işçilerin biletleri açabilmesi için TICKET_SECRET ortak olmalı.
+        self.tickets = TicketIssuer(
+            secret=_secret(environ, 'TICKET_SECRET'),
+            rotation_interval=float(environ.get('TICKET_ROTATION', 3600)),
+            lifetime=float(environ.get('TICKET_LIFETIME', 6 * 3600))
+        )
+
+        # ECDH el sıkışma modu: dönem başına tek sunucu anahtarı, oturum başına anahtar üretimi yok.
+        # Çok işçili kurulumda tüm işçilerin aynı anahtarı yayınlaması için ECDH_SECRET ortak olmalı.
+        self.ecdh_keys = ECDHKeyRing(
+            secret=_secret(environ, 'ECDH_SECRET'),
+            rotation_interval=float(environ.get('ECDH_ROTATION', 3600))
+        )
+
+        # message_batch olayında kabul edilen en fazla mesaj sayısı
+        self.max_batch_size = int(environ.get('MAX_BATCH_SIZE', 1000))
+
+        # Parçalı aktarımlar: akış başına deşifre/şifreleme durumu
+        self.streams = StreamRegistry(
+            max_streams_per_session=int(environ.get('MAX_STREAMS_PER_SESSION', 4))
+        )
+
+        # Metrikler (/metrics). METRICS_ENABLED=0 iken sıcak yoldaki ölçümler boş çağrılara dönüşür;
+        # göstergeler ve bileşen istatistikleri yalnızca /metrics okunurken hesaplanır.
+        self.metrics = MetricsRegistry(enabled=environ.get('METRICS_ENABLED', '1') != '0')
+        self.handshake_seconds = self.metrics.histogram(
+            'handshake_stage_seconds', 'Anahtar değişimi aşamalarının süresi (keygen, decrypt_key, ecdh_derive)',
+            ('stage', 'algorithm'))
+        self.message_seconds = self.metrics.histogram(
+            'message_stage_seconds', 'Mesaj yolu aşamalarının süresi (decrypt, transform, encrypt)',
+            ('stage', 'cipher'), buckets=FAST_BUCKETS)
+        self.handshakes_total = self.metrics.counter(
+            'handshakes_total', 'Tamamlanan tam el sıkışmalar', ('algorithm', 'cipher'))
+        self.messages_total = self.metrics.counter(
+            'messages_total', 'İşlenen mesajlar (olay türüne göre)', ('cipher', 'event'))
+        self.errors_total = self.metrics.counter(
+            'errors_total', 'İstemciye hata ile dönen olaylar', ('event',))
+        self.metrics.gauge('sessions', 'Bu işçideki canlı oturumlar', lambda: len(self.sessions))
+        self.metrics.gauge('session_store_records', 'Oturum deposundaki kayıtlar', self.sessions.stored_count)
+        self.metrics.collector(self._component_metrics)
+
+    def check_compression(self, symmetric_enc, codec: Optional[str], dictionary: Optional[bytes]) -> None:
+        """Reject a compression setting this server does not allow (ValueError)."""
+        if codec is None:
+            return
+        if codec not in self.compression_codecs:
+            allowed = ', '.join(self.compression_codecs) or 'yok'
+            raise ValueError(f"Desteklenmeyen sıkıştırma: {codec} (desteklenenler: {allowed})")
+        validate_compression(symmetric_enc, codec, dictionary)
+
+    def _session_evicted(self, sid: str, reason: str) -> None:
+        # Süpürücü veya kapasite sınırı oturumu sildi: sid'e bağlı diğer durum da gider
+        self.streams.evict(sid)
+        self.handshakes.discard(sid)
+
+    def sweep(self) -> Dict[str, int]:
+        """One sweeper round: idle sessions, then handshakes that timed out."""
+        idle = self.sessions.sweep()
+        timed_out = 0
+        for sid in self.handshakes.expired():
+            session = self.sessions.get(sid)
+            if session is None or session.server_key is None:
+                continue
+            if session.cipher is None:
+                # Hiç tamamlanmamış el sıkışma: oturumda private key'den başka bir şey yok
+                self.sessions.evict(sid)
+            else:
+                # Yarım kalan yeniden anahtarlama: mevcut ayarlar kalır, yalnızca private key silinir
+                self.sessions.update(sid, server_key=None)
+            timed_out += 1
+        return {'idle': idle, 'handshake_timeout': timed_out}
+
+    def session_stats(self) -> Dict[str, Any]:
+        """Session ceiling, eviction counts and half-open handshakes (for /stats/sessions)."""
+        return {'sessions': self.sessions.stats(), 'handshakes': self.handshakes.stats()}
+
+    def warm_up(self) -> None:
+        """Fill the key pools before the first client arrives."""
+        for algorithm in KEY_POOL_ALGORITHMS:
+            self.key_pool.warm_up(algorithm)
+
+    def _component_metrics(self):
+        """Anahtar havuzu, executor, bilet ve akış istatistiklerini metrik ailelerine çevirir."""
+        pools = self.key_pool.stats()
+        for field, kind, help_text in (
+            ('depth', 'gauge', 'Havuzdaki hazır anahtar çiftleri'),
+            ('pending', 'gauge', 'Üretilmekte olan anahtar çiftleri'),
+            ('hits', 'counter', 'Havuzdan karşılanan istekler'),
+            ('misses', 'counter', 'Havuz boşken gelen istekler'),
+            ('generated', 'counter', 'Üretilen anahtar çiftleri'),
+            ('failures', 'counter', 'Başarısız anahtar üretimleri'),
+            ('refill_rate', 'gauge', 'Saniyedeki yenileme hızı'),
+        ):
+            name = f"key_pool_{field}_total" if kind == 'counter' else f"key_pool_{field}"
+            yield name, kind, help_text, [({'pool': pool}, stats[field]) for pool, stats in pools.items()]
+
+        executor = self.crypto_executor.stats()
+        yield 'executor_pending', 'gauge', 'Executor kuyruğundaki işler', [({}, executor['pending'])]
+        yield 'executor_rejected_total', 'counter', 'Kuyruk dolu olduğu için reddedilen işler', \
+            [({}, executor['rejected'])]
+        yield 'executor_seconds', 'histogram', 'Executor işlemlerinin kuyruk + çalışma süresi', \
+            [({'operation': operation}, snapshot) for operation, snapshot in executor['latency'].items()]
+
+        ticket = self.tickets.stats()
+        yield 'tickets_issued_total', 'counter', 'Verilen oturum devam biletleri', [({}, ticket['issued'])]
+        yield 'ticket_resumptions_total', 'counter', 'Bilet ile devam denemeleri (sonuca göre)', \
+            [({'result': 'hit'}, ticket['hits'])] + \
+            [({'result': reason}, count) for reason, count in ticket['misses'].items()]
+        yield 'full_handshakes_total', 'counter', 'Asimetrik el sıkışma ile kurulan oturumlar', \
+            [({}, ticket['full_handshakes'])]
+
+        sessions, handshakes = self.sessions.stats(), self.handshakes.stats()
+        yield 'session_evictions_total', 'counter', 'Süpürücü veya sınırlarca silinen oturumlar (nedene göre)', \
+            [({'reason': reason}, count) for reason, count in sessions['evictions'].items()] + \
+            [({'reason': 'handshake_timeout'}, handshakes['timed_out'])]
+        yield 'half_open_handshakes', 'gauge', 'set_encryption_settings bekleyen el sıkışmalar', \
+            [({}, handshakes['pending'])]
+        yield 'handshake_rejections_total', 'counter', 'Sınır dolu olduğu için reddedilen el sıkışmalar', \
+            [({}, handshakes['rejected'])]
+
+        yield 'open_streams', 'gauge', 'Açık parçalı aktarımlar', [({}, self.streams.stats()['open_streams'])]
+
+        compression = self.compression_stats.stats()
+        yield 'compression_messages_total', 'counter', 'Sıkıştırma aşamasından geçen mesajlar (sonuca göre)', \
+            [({'codec': codec, 'result': result}, totals[result])
+             for codec, totals in compression.items() for result in ('compressed', 'skipped', 'decompressed')]
+        yield 'compression_bytes_total', 'counter', 'Sıkıştırma öncesi (in) ve sonrası (out) giden yük baytları', \
+            [({'codec': codec, 'direction': direction}, totals[f'bytes_{direction}'])
+             for codec, totals in compression.items() for direction in ('in', 'out')]
+        yield 'compression_cpu_seconds_total', 'counter', 'Sıkıştırma ve açma için harcanan CPU süresi', \
+            [({'codec': codec, 'operation': operation}, totals[f'{operation}_cpu_seconds'])
+             for codec, totals in compression.items() for operation in ('compress', 'decompress')]
+        yield 'compression_ratio', 'gauge', 'Giden yük baytları / sıkıştırma öncesi baytlar', \
+            [({'codec': codec}, totals['ratio']) for codec, totals in compression.items()
+             if totals['ratio'] is not None]
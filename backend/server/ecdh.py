@@ -0,0 +1,88 @@
+"""
+Long-lived, rotating server key for the ECDH handshake mode.
+
+Oturum başına RSA/ECC anahtar çifti üretmek yerine sunucu her dönem için
+tek bir P-256 anahtarı kullanır; istemci geçici (ephemeral) anahtarını
+gönderir ve iki taraf oturum anahtarını HKDF ile doğrudan türetir.
+Simetrik anahtarın şifrelenip gönderilmesine gerek kalmaz.
+
+Dönem anahtarı ortak bir sırdan (ECDH_SECRET) türetildiği için tüm
+işçiler aynı açık anahtarı yayınlar; istemci açık anahtarı önbelleğe alıp
+key_exchange_params adımını da atlayabilir. Bir önceki dönemin anahtarı
+geçiş süresince kabul edilmeye devam eder.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+from encryption.asymmetric import ECCLib
+
+# P-256 grup mertebesi
+_P256_ORDER = 0xFFFFFFFF00000000FFFFFFFFFFFFFFFFBCE6FAADA7179E84F3B9CAC2FC632551
+
+
+class UnknownServerKey(Exception):
+    """Raised when a client refers to a server key that has been rotated out."""
+
+
+class ECDHKeyRing:
+    """Server ECDH keys per rotation epoch, derived from a secret."""
+
+    def __init__(self, secret: Optional[bytes] = None, rotation_interval: float = 3600.0):
+        if rotation_interval <= 0:
+            raise ValueError("rotation_interval pozitif olmalı")
+        self.secret = secret or os.urandom(32)
+        self.rotation_interval = rotation_interval
+        self._ecc = ECCLib()
+        self._keys: Dict[int, Tuple[ec.EllipticCurvePrivateKey, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def _epoch(self, now: float) -> int:
+        return int(now // self.rotation_interval)
+
+    def _key(self, epoch: int) -> Tuple[ec.EllipticCurvePrivateKey, bytes]:
+        key = self._keys.get(epoch)
+        if key is None:
+            seed = HKDF(
+                algorithm=hashes.SHA256(), length=48, salt=None,
+                info=b"crypto-chat ecdh server key " + str(epoch).encode('ascii')
+            ).derive(self.secret)
+            # 48 baytlık tohumun mod alınması sapmayı ihmal edilebilir kılar
+            scalar = int.from_bytes(seed, 'big') % (_P256_ORDER - 1) + 1
+            private_key = ec.derive_private_key(scalar, ec.SECP256R1(), default_backend())
+            key = (private_key, self._ecc.public_key_bytes(private_key))
+            with self._lock:
+                self._keys[epoch] = key
+                for stale in [e for e in self._keys if e < epoch - 1]:
+                    del self._keys[stale]
+        return key
+
+    def current(self) -> Tuple[int, bytes]:
+        """(key id, DER public key) clients should use now."""
+        epoch = self._epoch(time.time())
+        return epoch, self._key(epoch)[1]
+
+    def derive(self, key_id: int, client_public_key: bytes, length: int, info: bytes) -> bytes:
+        """
+        Derive the session key for a client's ephemeral public key.
+
+        The HKDF salt binds the key to both public keys.
+
+        Raises:
+            UnknownServerKey: If key_id is neither the current nor the previous epoch
+        """
+        epoch = self._epoch(time.time())
+        if key_id not in (epoch, epoch - 1):
+            raise UnknownServerKey(f"Sunucu anahtarı {key_id} artık geçerli değil")
+        private_key, public_key = self._key(key_id)
+        return self._ecc.derive_key(
+            private_key, client_public_key, length=length,
+            salt=client_public_key + public_key, info=info
+        )
@@ -0,0 +1,128 @@
+"""
+Executor layer for CPU-bound cryptographic operations.
+
+RSA/ECC işlemleri Socket.IO işçisini bloke etmesin diye iş parçacıklarına
+aktarılır. `cryptography` bu işlemler sırasında GIL'i bıraktığı için bir
+thread havuzu yeterlidir. asyncio sunucusu (asgi.py) aynı havuzu
+run_async ile bekler.
+"""
+
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict
+
+from .metrics import LatencyHistogram
+
+
+class ExecutorBusy(Exception):
+    """Raised when the executor queue is full (backpressure)."""
+
+
+class CryptoExecutor:
+    """Bounded thread-pool executor with a latency histogram per operation."""
+
+    def __init__(self, max_pending: int = 64, workers: int = 4, async_mode: str = 'threading'):
+        if max_pending < 1:
+            raise ValueError("max_pending en az 1 olmalı")
+        self.max_pending = max_pending
+        self.workers = workers
+        self.async_mode = async_mode
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._rejected = 0
+        self._histograms: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self._offload = None
+        self._pool = None
+
+    def _get_offload(self) -> Callable:
+        with self._lock:
+            if self._offload is None:
+                self._offload = self._create_offload()
+        return self._offload
+
+    def _create_offload(self) -> Callable:
+        if self.async_mode == 'eventlet':
+            # tpool, gerçek thread'lerde çalışıp sonucu hub'a kooperatif olarak döndürür
+            from eventlet import tpool
+            tpool.set_num_threads(self.workers)
+            return tpool.execute
+        if self.async_mode == 'gevent':
+            import gevent
+            threadpool = gevent.get_hub().threadpool
+            threadpool.maxsize = self.workers
+            return lambda fn, *args: threadpool.apply(fn, args)
+
+        pool = self._thread_pool()
+        return lambda fn, *args: pool.submit(fn, *args).result()
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='crypto')
+        return self._pool
+
+    def _enter(self) -> float:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise ExecutorBusy(f"Executor queue full ({self.max_pending} pending)")
+        with self._lock:
+            self._pending += 1
+        return time.perf_counter()
+
+    def _exit(self, operation: str, start: float) -> None:
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._pending -= 1
+            histogram = self._histograms[operation]
+        histogram.observe(elapsed)
+        self._slots.release()
+
+    def run(self, operation: str, fn: Callable, *args):
+        """
+        Run fn(*args) on a worker thread and return its result.
+
+        Only the calling handler waits for the result; other sessions keep
+        being served meanwhile.
+
+        Args:
+            operation: Name used for the latency histogram (e.g. 'keygen')
+            fn: CPU-bound callable to execute
+
+        Raises:
+            ExecutorBusy: If max_pending operations are already queued
+        """
+        start = self._enter()
+        try:
+            return self._get_offload()(fn, *args)
+        finally:
+            self._exit(operation, start)
+
+    async def run_async(self, operation: str, fn: Callable, *args):
+        """
+        asyncio counterpart of run(): awaits fn(*args) on the thread pool
+        without blocking the event loop. Same backpressure and histograms.
+
+        Raises:
+            ExecutorBusy: If max_pending operations are already queued
+        """
+        start = self._enter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._thread_pool(), fn, *args)
+        finally:
+            self._exit(operation, start)
+
+    def stats(self) -> Dict[str, object]:
+        """Queue depth, rejected submissions and per-operation latency histograms."""
+        with self._lock:
+            pending, rejected = self._pending, self._rejected
+            histograms = dict(self._histograms)
+        return {
+            'pending': pending,
+            'max_pending': self.max_pending,
+            'rejected': rejected,
+            'latency': {op: hist.snapshot() for op, hist in histograms.items()},
+        }
@@ -0,0 +1,514 @@
+"""
+Socket.IO event handlers shared by app.py (Flask-SocketIO) and asgi.py.
+
+Her olay, sunucudan bağımsız bir üreteç (generator) olarak bir kez yazılır
+ve iki tür adım verir:
+
+- Emit(event, data): olayı gönderen istemciye cevap
+- Offload(operation, fn, args, size): CPU ağırlıklı iş; sonucu üretece geri
+  gönderilir, hatası üretecin içine fırlatılır (handler'ın kendi try/except'i
+  yakalar)
+
+run_steps (eventlet/threading) ve run_steps_async (asyncio) bu adımları
+sunucunun emit'i ve CryptoExecutor ile yürütür; app.py ve asgi.py yalnızca
+olayları kaydeden ince adaptörlerdir.
+"""
+
+import base64
+import traceback
+from typing import Any, Callable, Generator, NamedTuple, Optional
+
+from encryption import AsymmetricEncryptionFactory, SymmetricEncryptionFactory
+from .components import ECDH_MODE, ServerComponents, transform_message
+from .ecdh import UnknownServerKey
+from .executor import ExecutorBusy
+from .handshakes import HandshakeLimitExceeded
+from .key_cache import KeyHandle
+from .session import cipher_id, codec_id
+from .streams import StreamLimitExceeded
+from .tickets import TicketError
+
+
+class Emit(NamedTuple):
+    """Reply to the client that sent the event."""
+    event: str
+    data: Any
+
+
+class Offload(NamedTuple):
+    """
+    CPU-bound step; size None always runs in the executor, otherwise the
+    driver may run it inline below its offload threshold.
+    """
+    operation: str
+    fn: Callable
+    args: tuple
+    size: Optional[int] = None
+
+
+Steps = Generator[Any, Any, None]
+
+
+def _payload_size(message) -> int:
+    # Bayt/dizge olmayan öğeler transform_message'da tek tek başarısız olur; boyuta katılmaz
+    return len(message) if isinstance(message, (str, bytes, bytearray)) else 0
+
+
+def _stream_payload(settings, data: bytes):
+    """Akış parçasını oturumun moduna göre (ham bayt veya base64) hazırla."""
+    if settings.binary:
+        return data
+    return base64.b64encode(data).decode('utf-8')
+
+
+def _stream_update(state, chunk: bytes) -> bytes:
+    return state.encryptor.update(state.decryptor.update(chunk))
+
+
+class ChatHandlers:
+    """Event handlers over ServerComponents; every method returns a step generator."""
+
+    def __init__(self, components: ServerComponents):
+        self.components = components
+        self.sessions = components.sessions
+        self.streams = components.streams
+        self.handshakes = components.handshakes
+        self.tickets = components.tickets
+
+    def connect(self, sid: str) -> Steps:
+        """İstemci bağlandığında tetiklenir."""
+        print(f"Client connected: {sid}")
+        yield Emit('connected', {'status': 'connected'})
+
+    def disconnect(self, sid: str) -> None:
+        """İstemci ayrıldığında verileri temizle."""
+        print(f"Client disconnected: {sid}")
+        self.sessions.evict(sid)
+        self.streams.evict(sid)
+        self.handshakes.discard(sid)
+
+    def key_exchange_params(self, sid: str, data) -> Steps:
+        """
+        İstemci algoritma değiştirdiğinde veya ilk bağlantıda yeni
+        sunucu anahtar çiftini üretir.
+        """
+        components = self.components
+        try:
+            asymmetric_algo = data.get('asymmetric_algorithm', 'rsa')
+            asymmetric_impl = 'lib' # Anahtar değişimi her zaman kütüphane ile yapılır
+
+            if asymmetric_algo == ECDH_MODE:
+                # Anahtar üretimi yok: dönemin sunucu açık anahtarı ve kimliği gönderilir
+                key_id, public_key = components.ecdh_keys.current()
+                yield Emit('server_public_key', {
+                    'public_key': base64.b64encode(public_key).decode('utf-8'),
+                    'algorithm': ECDH_MODE,
+                    'key_id': key_id
+                })
+                return
+
+            print(f"Assigning new {asymmetric_algo} keys for sid: {sid}")
+
+            # Bilinmeyen algoritmaları havuza sokmadan önce reddet
+            asymmetric_enc = AsymmetricEncryptionFactory.create(asymmetric_algo, asymmetric_impl)
+
+            # Tamamlanmamış el sıkışmalar sınırlıdır: yer, havuzdan anahtar alınmadan önce ayrılır.
+            # Tamamlanmazsa süpürücü HANDSHAKE_TIMEOUT sonunda private key'i siler.
+            self.handshakes.begin(sid)
+
+            # Sunucu için hazır anahtar çiftini havuzdan al, havuz boşsa executor'da üret
+            timer = components.handshake_seconds.start(asymmetric_algo.lower())
+            key_pair = components.key_pool.try_acquire(asymmetric_algo)
+            if key_pair is None:
+                key_pair = yield Offload('keygen', asymmetric_enc.generate_key_pair, ())
+            timer.lap('keygen')
+            public_key, private_key = key_pair
+
+            # Eski anahtar varsa üzerine yazar (Sıfırlama mantığı için kritik)
+            key_handle = KeyHandle(asymmetric_algo, asymmetric_enc.load_private_key(private_key))
+            self.sessions.update(sid, server_key=key_handle)
+
+            # Genel anahtarı istemciye gönder
+            yield Emit('server_public_key', {
+                'public_key': base64.b64encode(public_key).decode('utf-8'),
+                'algorithm': asymmetric_algo
+            })
+
+        except (ExecutorBusy, HandshakeLimitExceeded):
+            # Anahtar verilmedi: ayrılan yer süpürücüyü beklemeden boşaltılır
+            self.handshakes.discard(sid)
+            components.errors_total.inc('key_exchange_params')
+            yield Emit('error', {'message': 'Sunucu meşgul, lütfen tekrar deneyin.'})
+        except Exception as e:
+            self.handshakes.discard(sid)
+            components.errors_total.inc('key_exchange_params')
+            print(f"Key generation error: {e}")
+            yield Emit('error', {'message': f'Anahtar değişimi başarısız: {str(e)}'})
+
+    def set_encryption_settings(self, sid: str, data) -> Steps:
+        """
+        İstemciden gelen şifreli simetrik anahtarı çözer (ECDH modunda anahtarı
+        türetir) ve ayarları kaydeder.
+        """
+        components = self.components
+        try:
+            asymmetric_algo = data.get('asymmetric_algorithm', 'rsa')
+            symmetric_algo = data.get('symmetric_algorithm', 'aes')
+            symmetric_impl = data.get('symmetric_implementation', 'lib')
+            # İkili mod isteğe bağlıdır: mesajlar base64 yerine ham Socket.IO eki olarak taşınır
+            binary = bool(data.get('binary', False))
+
+            # Bilinmeyen algoritmaları depoya yazmadan önce reddet; yalnızca kayıttaki adlar saklanır
+            symmetric_enc = SymmetricEncryptionFactory.create(symmetric_algo, symmetric_impl)
+            symmetric_algorithm, symmetric_implementation = cipher_id(symmetric_algo, symmetric_impl)
+
+            # İsteğe bağlı sıkıştırma (zlib/lzma); sözlük verilmezse varsayılan zlib sözlüğü kullanılır
+            compression = data.get('compression') or None
+            compression_dictionary = (base64.b64decode(data['compression_dictionary'])
+                                      if data.get('compression_dictionary') else None)
+            components.check_compression(symmetric_enc, compression, compression_dictionary)
+
+            if asymmetric_algo == ECDH_MODE:
+                # Oturum anahtarı istemcinin geçici açık anahtarından doğrudan türetilir
+                client_public_key = base64.b64decode(data.get('client_public_key', ''))
+                info = f"crypto-chat session key|{symmetric_algo}|{symmetric_impl}".encode('utf-8')
+                timer = components.handshake_seconds.start(ECDH_MODE)
+                symmetric_key = yield Offload(
+                    'ecdh_derive', components.ecdh_keys.derive,
+                    (int(data.get('key_id', -1)), client_public_key, len(symmetric_enc.generate_key()), info)
+                )
+                timer.lap('ecdh_derive')
+            else:
+                session = self.sessions.get(sid)
+                key_handle = session.server_key if session is not None else None
+                if key_handle is None:
+                    yield Emit('error', {'message': 'Sunucu anahtarı bulunamadı, lütfen önce anahtar isteyin.'})
+                    return
+
+                server_private_key = key_handle.private_key
+                asymmetric_enc = AsymmetricEncryptionFactory.create(asymmetric_algo, 'lib')
+
+                encrypted_symmetric_key = data.get('encrypted_symmetric_key', '')
+
+                # Simetrik anahtarı sunucu özel anahtarı ile deşifre et
+                timer = components.handshake_seconds.start(asymmetric_algo.lower())
+                symmetric_key = yield Offload(
+                    'decrypt_key', asymmetric_enc.decrypt_key, (encrypted_symmetric_key, server_private_key)
+                )
+                timer.lap('decrypt_key')
+
+            # Ayarları istemciye özel sakla (şifreleyici build_session'da bir kez bağlanır).
+            # Simetrik anahtar doğrulandı: sunucu private key'i artık gerekmez, kayıttan düşülür.
+            self.sessions.update(
+                sid,
+                server_key=None,
+                symmetric_algorithm=symmetric_algorithm,
+                symmetric_implementation=symmetric_implementation,
+                symmetric_key=symmetric_key,
+                binary=binary,
+                compression=codec_id(compression),
+                compression_dictionary=compression_dictionary
+            )
+
+            self.handshakes.discard(sid)
+            print(f"Encryption settings verified for {sid}")
+            self.tickets.record_full_handshake()
+            components.handshakes_total.inc(asymmetric_algo.lower(), type(symmetric_enc).__name__)
+            yield Emit('settings_confirmed', {'status': 'ok', 'binary': binary, 'compression': compression})
+            yield self._ticket(self.sessions.get(sid))
+
+        except UnknownServerKey as e:
+            components.errors_total.inc('set_encryption_settings')
+            yield Emit('error', {'message': f'{str(e)}, lütfen anahtarı tekrar isteyin.'})
+        except ExecutorBusy:
+            components.errors_total.inc('set_encryption_settings')
+            yield Emit('error', {'message': 'Sunucu meşgul, lütfen tekrar deneyin.'})
+        except Exception as e:
+            components.errors_total.inc('set_encryption_settings')
+            traceback.print_exc()
+            yield Emit('error', {'message': f'Ayarlar kaydedilemedi: {str(e)}'})
+
+    def _ticket(self, settings) -> Emit:
+        """settings_confirmed ardından istemciye yeni bir devam bileti gönderir."""
+        return Emit('session_ticket', {'ticket': self.tickets.issue(settings.settings()),
+                                       'lifetime': self.tickets.lifetime})
+
+    def resume_session(self, sid: str, data) -> Steps:
+        """
+        Geçerli bir biletle oturumu tek simetrik deşifre ile geri yükler.
+        Bilet geçersizse istemci normal el sıkışmaya (key_exchange_params) döner.
+        """
+        try:
+            resumed = self.tickets.open(data.get('ticket', ''))
+
+            # Bilet sahte olamaz ama eski bir sürümün desteklemediği algoritmayı taşıyabilir
+            symmetric_enc = SymmetricEncryptionFactory.create(
+                resumed['symmetric_algorithm'], resumed['symmetric_implementation']
+            )
+            symmetric_algorithm, symmetric_implementation = cipher_id(
+                resumed['symmetric_algorithm'], resumed['symmetric_implementation']
+            )
+            self.components.check_compression(symmetric_enc, resumed.get('compression'),
+                                              resumed.get('compression_dictionary'))
+
+            settings = self.sessions.update(
+                sid,
+                server_key=None,
+                symmetric_algorithm=symmetric_algorithm,
+                symmetric_implementation=symmetric_implementation,
+                symmetric_key=resumed['symmetric_key'],
+                binary=resumed['binary'],
+                compression=codec_id(resumed.get('compression')),
+                compression_dictionary=resumed.get('compression_dictionary')
+            )
+
+            self.handshakes.discard(sid)
+            print(f"Session resumed from ticket for {sid}")
+            yield Emit('settings_confirmed', {'status': 'ok', 'binary': settings.binary,
+                                              'compression': settings.compression, 'resumed': True})
+            yield self._ticket(settings)
+
+        except TicketError as e:
+            yield Emit('resume_failed', {'reason': e.reason, 'message': str(e)})
+        except Exception as e:
+            traceback.print_exc()
+            yield Emit('resume_failed', {'reason': 'error', 'message': f'Oturum geri yüklenemedi: {str(e)}'})
+
+    def message(self, sid: str, data) -> Steps:
+        """Şifreli mesajı alır, çözer, işler ve tekrar şifreleyerek geri gönderir."""
+        components = self.components
+        try:
+            settings = self.sessions.get(sid)
+            if settings is None or settings.cipher is None:
+                yield Emit('error', {'message': 'Şifreleme ayarları bulunamadı!'})
+                return
+
+            # Oturuma bağlı şifreleyici (anahtar hazırlığı ayarlar kaydedilirken yapıldı)
+            encrypted_incoming = data.get('message', '')
+            decrypted_text, re_encrypted_response = yield Offload(
+                'message', transform_message,
+                (settings.cipher, settings.binary, encrypted_incoming,
+                 components.message_seconds.start(settings.cipher_name)),
+                _payload_size(encrypted_incoming)
+            )
+            components.messages_total.inc(settings.cipher_name, 'message')
+            print(f"Message from {sid}: {decrypted_text}")
+
+            # 4. Sadece şifreli yükü (payload) gönder
+            yield Emit('message_response', {
+                'encrypted_payload': re_encrypted_response
+            })
+
+        except Exception as e:
+            components.errors_total.inc('message')
+            print(f"Message handling error: {e}")
+            yield Emit('error', {'message': 'Mesaj işlenirken şifreleme hatası oluştu.'})
+
+    def _transform_batch(self, cipher, binary, cipher_name, messages):
+        responses, failed = [], []
+        for index, encrypted_incoming in enumerate(messages):
+            try:
+                responses.append(transform_message(
+                    cipher, binary, encrypted_incoming, self.components.message_seconds.start(cipher_name))[1])
+            except Exception:
+                responses.append(None)
+                failed.append(index)
+        return responses, failed
+
+    def message_batch(self, sid: str, data) -> Steps:
+        """
+        Birden fazla şifreli mesajı tek olayda işler ve tek bir
+        message_response_batch ile cevaplar. Cevaplar gelen sırayla döner;
+        çözülemeyen mesajların yerinde None bulunur ve indeksleri 'failed' içinde listelenir.
+        """
+        components = self.components
+        max_batch_size = components.max_batch_size
+        try:
+            settings = self.sessions.get(sid)
+            if settings is None or settings.cipher is None:
+                yield Emit('error', {'message': 'Şifreleme ayarları bulunamadı!'})
+                return
+
+            messages = data.get('messages', [])
+            if not isinstance(messages, list) or len(messages) > max_batch_size:
+                yield Emit('error', {'message': f'Toplu mesaj en fazla {max_batch_size} öğeden oluşan bir liste olmalı.'})
+                return
+
+            # Ayar araması ve şifreleyici tüm toplu mesaj için bir kez alınır
+            cipher_name = settings.cipher_name
+            responses, failed = yield Offload(
+                'message_batch', self._transform_batch, (settings.cipher, settings.binary, cipher_name, messages),
+                sum(map(_payload_size, messages))
+            )
+            components.messages_total.inc(cipher_name, 'message_batch', amount=len(messages) - len(failed))
+            if failed:
+                components.errors_total.inc('message_batch', amount=len(failed))
+
+            print(f"Message batch from {sid}: {len(messages)} messages, {len(failed)} failed")
+            yield Emit('message_response_batch', {
+                'encrypted_payloads': responses,
+                'failed': failed
+            })
+
+        except Exception as e:
+            components.errors_total.inc('message_batch')
+            print(f"Message batch handling error: {e}")
+            yield Emit('error', {'message': 'Toplu mesaj işlenirken şifreleme hatası oluştu.'})
+
+    def _stream_chunk(self, stream_id, settings, state, data: bytes) -> Optional[Emit]:
+        if not data:
+            return None
+        state.bytes_out += len(data)
+        return Emit('stream_chunk', {'stream_id': stream_id, 'data': _stream_payload(settings, data)})
+
+    def stream_start(self, sid: str, data) -> Steps:
+        """
+        Parçalı aktarımı başlatır. Cevap da aynı stream_id ile
+        stream_start / stream_chunk / stream_end olarak akar.
+        """
+        errors_total = self.components.errors_total
+        try:
+            settings = self.sessions.get(sid)
+            if settings is None or settings.cipher is None:
+                yield Emit('error', {'message': 'Şifreleme ayarları bulunamadı!'})
+                return
+
+            stream_id = str(data.get('stream_id', ''))
+            state = self.streams.open(sid, stream_id, settings.cipher)
+            yield Emit('stream_start', {'stream_id': stream_id})
+
+            # Cevap öneki şimdiden şifreleyiciye verilir (mesaj yolundaki "+" ile aynı)
+            yield self._stream_chunk(stream_id, settings, state, state.encryptor.update(b"+"))
+
+        except StreamLimitExceeded as e:
+            errors_total.inc('stream_start')
+            yield Emit('error', {'message': str(e)})
+        except Exception as e:
+            errors_total.inc('stream_start')
+            print(f"Stream start error: {e}")
+            yield Emit('error', {'message': 'Akış başlatılamadı.'})
+
+    def stream_chunk(self, sid: str, data) -> Steps:
+        """Gelen şifreli parçayı çözer ve hazır olan cevap parçasını hemen gönderir."""
+        errors_total = self.components.errors_total
+        stream_id = None
+        try:
+            stream_id = str(data.get('stream_id', ''))
+            settings = self.sessions.get(sid)
+            state = self.streams.get(sid, stream_id)
+            if settings is None or state is None:
+                yield Emit('error', {'message': 'Akış bulunamadı!'})
+                return
+
+            chunk = data.get('data', b'')
+            if isinstance(chunk, str):
+                chunk = base64.b64decode(chunk)
+            state.receive(len(chunk))
+
+            # Bellekte yalnızca bu parça ve şifre bloğu kadar artık tutulur
+            output = yield Offload('stream_chunk', _stream_update, (state, chunk), len(chunk))
+            yield self._stream_chunk(stream_id, settings, state, output)
+
+        except StreamLimitExceeded as e:
+            errors_total.inc('stream_chunk')
+            self.streams.close(sid, stream_id)
+            yield Emit('error', {'message': str(e)})
+        except Exception as e:
+            errors_total.inc('stream_chunk')
+            print(f"Stream chunk error: {e}")
+            self.streams.close(sid, stream_id)
+            yield Emit('error', {'message': 'Akış parçası işlenirken şifreleme hatası oluştu.'})
+
+    def stream_end(self, sid: str, data) -> Steps:
+        """Akışı sonlandırır: dolgu kontrol edilir, kalan cevap gönderilir."""
+        components = self.components
+        try:
+            stream_id = str(data.get('stream_id', ''))
+            settings = self.sessions.get(sid)
+            state = self.streams.close(sid, stream_id)
+            if settings is None or state is None:
+                yield Emit('error', {'message': 'Akış bulunamadı!'})
+                return
+
+            plaintext = state.decryptor.finalize()
+            tail = state.encryptor.update(plaintext) + state.encryptor.finalize()
+            yield self._stream_chunk(stream_id, settings, state, tail)
+
+            components.messages_total.inc(settings.cipher_name, 'stream')
+            print(f"Stream {stream_id} from {sid}: {state.bytes_in} bytes in, {state.bytes_out} bytes out")
+            yield Emit('stream_end', {'stream_id': stream_id, 'bytes': state.bytes_out})
+
+        except Exception as e:
+            components.errors_total.inc('stream_end')
+            print(f"Stream end error: {e}")
+            yield Emit('error', {'message': 'Akış sonlandırılırken şifreleme hatası oluştu.'})
+
+
+def _inline(step: Offload, offload_threshold: Optional[int]) -> bool:
+    return step.size is not None and (offload_threshold is None or step.size <= offload_threshold)
+
+
+def run_steps(steps: Steps, emit: Callable[[str, Any], None], executor,
+              offload_threshold: Optional[int] = None) -> None:
+    """
+    Drive a handler on a blocking server (eventlet/threading).
+
+    Args:
+        steps: Generator returned by a ChatHandlers method
+        emit: emit(event, data) replying to the client
+        executor: CryptoExecutor for Offload steps
+        offload_threshold: Sized steps up to this many bytes run inline
+            (None: every sized step runs inline)
+    """
+    result, error = None, None
+    while True:
+        try:
+            step = steps.throw(error) if error is not None else steps.send(result)
+        except StopIteration:
+            return
+        result, error = None, None
+        if step is None:
+            continue
+        if isinstance(step, Emit):
+            emit(step.event, step.data)
+            continue
+        try:
+            if _inline(step, offload_threshold):
+                result = step.fn(*step.args)
+            else:
+                result = executor.run(step.operation, step.fn, *step.args)
+        except Exception as e:
+            error = e
+
+
+async def run_steps_async(steps: Steps, emit, executor, offload_threshold: Optional[int] = None) -> None:
+    """
+    Drive a handler on an asyncio server.
+
+    Args:
+        steps: Generator returned by a ChatHandlers method
+        emit: Coroutine function emit(event, data) replying to the client
+        executor: CryptoExecutor; Offload steps are awaited with run_async
+            so the event loop keeps serving other connections
+        offload_threshold: Sized steps up to this many bytes run on the loop
+            (thread hand-off costs more than small symmetric work)
+    """
+    result, error = None, None
+    while True:
+        try:
+            step = steps.throw(error) if error is not None else steps.send(result)
+        except StopIteration:
+            return
+        result, error = None, None
+        if step is None:
+            continue
+        if isinstance(step, Emit):
+            await emit(step.event, step.data)
+            continue
+        try:
+            if _inline(step, offload_threshold):
+                result = step.fn(*step.args)
+            else:
+                result = await executor.run_async(step.operation, step.fn, *step.args)
+        except Exception as e:
+            error = e
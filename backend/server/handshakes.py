@@ -0,0 +1,88 @@
+"""
+Half-open handshake tracking.
+
+key_exchange_params ile sunucu private key'i alan ama el sıkışmayı
+set_encryption_settings ile tamamlamayan oturumlar sayılır. Sınır doluysa
+yeni anahtar verilmez (havuzdan anahtar da harcanmaz); süresi dolan el
+sıkışmaların anahtarı süpürücü tarafından silinir.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class HandshakeLimitExceeded(Exception):
+    """Raised when too many handshakes are waiting for set_encryption_settings."""
+
+
+class HandshakeTracker:
+    """sid -> start time of handshakes that hold a server private key."""
+
+    def __init__(self, max_pending: int = 1000, timeout: float = 30.0):
+        if max_pending <= 0 or timeout <= 0:
+            raise ValueError("max_pending ve timeout pozitif olmalı")
+        self.max_pending = max_pending
+        self.timeout = timeout
+        # Ekleme sırası başlama sırasıdır (aynı sid yeniden başlarsa sona taşınır);
+        # süresi dolanlar baştan toplanır
+        self._pending: Dict[str, float] = {}
+        self._timed_out: List[str] = []
+        self._timeouts = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    def _collect(self, now: float) -> None:
+        deadline = now - self.timeout
+        expired = []
+        for sid, started_at in self._pending.items():
+            if started_at > deadline:
+                break
+            expired.append(sid)
+        for sid in expired:
+            del self._pending[sid]
+        self._timed_out.extend(expired)
+        self._timeouts += len(expired)
+
+    def begin(self, sid: str) -> None:
+        """
+        Reserve a slot before a server key is handed out.
+
+        Raises:
+            HandshakeLimitExceeded: max_pending handshakes are already waiting
+        """
+        now = time.time()
+        with self._lock:
+            if self._pending.pop(sid, None) is None and len(self._pending) >= self.max_pending:
+                self._collect(now)
+                if len(self._pending) >= self.max_pending:
+                    self._rejected += 1
+                    raise HandshakeLimitExceeded(
+                        f"Tamamlanmamış el sıkışma sınırına ulaşıldı ({self.max_pending})"
+                    )
+            self._pending[sid] = now
+
+    def discard(self, sid: str) -> bool:
+        """Stop tracking sid (handshake finished, failed or disconnected)."""
+        with self._lock:
+            return self._pending.pop(sid, None) is not None
+
+    def expired(self, now: Optional[float] = None) -> List[str]:
+        """Sids whose handshake timed out since the last call; their server key should be dropped."""
+        with self._lock:
+            self._collect(time.time() if now is None else now)
+            expired, self._timed_out = self._timed_out, []
+            return expired
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'pending': len(self._pending),
+                'max_pending': self.max_pending,
+                'timeout': self.timeout,
+                'timed_out': self._timeouts,
+                'rejected': self._rejected,
+            }
+
+    def __len__(self) -> int:
+        return len(self._pending)
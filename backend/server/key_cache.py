@@ -0,0 +1,28 @@
+"""
+Loaded server private key handle.
+
+Private key'ler her deşifrede PEM'den tekrar yüklenmesin diye yüklenmiş
+nesne olarak oturum kaydında (server_key) tutulur.
+"""
+
+from encryption import AsymmetricEncryptionFactory
+
+
+class KeyHandle:
+    """Opaque holder for a loaded server private key."""
+
+    __slots__ = ('algorithm', 'private_key')
+
+    def __init__(self, algorithm: str, private_key):
+        self.algorithm = algorithm
+        self.private_key = private_key
+
+    def export(self) -> bytes:
+        """PEM encoding of the private key, for persisting or exporting only."""
+        asymmetric_enc = AsymmetricEncryptionFactory.create(self.algorithm, 'lib')
+        return asymmetric_enc.export_private_key(self.private_key)
+
+    def __repr__(self):
+        # Anahtar materyali log'lara sızmasın
+        return f"<KeyHandle {self.algorithm}>"
+
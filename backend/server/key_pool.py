@@ -0,0 +1,171 @@
+"""
+Background pool of pre-generated server key pairs.
+
+Anahtar üretimi (özellikle 2048-bit RSA) Socket.IO olay döngüsünü bloke
+etmesin diye çiftler arka planda işçi süreçlerinde üretilir; handler sadece
+hazır bir çifti havuzdan alır.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, Optional, Tuple
+
+from encryption import AsymmetricEncryptionFactory
+
+PoolKey = Tuple[str, Optional[int]]
+
+
+def _generate_key_pair(algorithm: str, key_size: Optional[int]):
+    """Generate one key pair as (public DER, private key handle)."""
+    asymmetric_enc = AsymmetricEncryptionFactory.create(algorithm, 'lib')
+    if key_size is None:
+        return asymmetric_enc.generate_key_pair()
+    return asymmetric_enc.generate_key_pair(key_size)
+
+
+def _generate_exportable_key_pair(algorithm: str, key_size: Optional[int]) -> Tuple[bytes, bytes]:
+    """Generate one key pair inside a worker process (PEM, since handles do not pickle)."""
+    public_key, private_key = _generate_key_pair(algorithm, key_size)
+    asymmetric_enc = AsymmetricEncryptionFactory.create(algorithm, 'lib')
+    return public_key, asymmetric_enc.export_private_key(private_key)
+
+
+class _PoolState:
+    """Ready key pairs and counters for one (algorithm, key_size) pair."""
+
+    def __init__(self):
+        self.ready = deque()
+        self.pending = 0
+        self.hits = 0
+        self.misses = 0
+        self.generated = 0
+        self.failures = 0
+        self.generated_at = deque()
+
+
+class KeyPairPool:
+    """Per algorithm/key size pool refilled by worker processes between watermarks."""
+
+    def __init__(self, low_watermark: int = 4, high_watermark: int = 16,
+                 workers: int = 2, rate_window: float = 60.0):
+        if low_watermark < 0 or high_watermark < low_watermark:
+            raise ValueError("Watermark değerleri hatalı: 0 <= low <= high olmalı")
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self.workers = workers
+        self.rate_window = rate_window
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pools: Dict[PoolKey, _PoolState] = {}
+
+    def _state(self, pool_key: PoolKey) -> _PoolState:
+        state = self._pools.get(pool_key)
+        if state is None:
+            state = self._pools.setdefault(pool_key, _PoolState())
+        return state
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def warm_up(self, algorithm: str, key_size: Optional[int] = None):
+        """Start filling the pool for an algorithm up to the high watermark."""
+        self._refill((algorithm.lower(), key_size))
+
+    def try_acquire(self, algorithm: str, key_size: Optional[int] = None) -> Optional[tuple]:
+        """
+        Pop a ready key pair without ever generating one.
+
+        Args:
+            algorithm: 'rsa' or 'ecc'
+            key_size: Key size in bits, None for the algorithm default
+
+        Returns:
+            Tuple of (public_key, private key handle), or None when the pool is empty
+        """
+        pool_key = (algorithm.lower(), key_size)
+        with self._lock:
+            state = self._state(pool_key)
+            if state.ready:
+                pair = state.ready.popleft()
+                state.hits += 1
+            else:
+                pair = None
+                state.misses += 1
+
+        self._refill(pool_key)
+        return pair
+
+    def _refill(self, pool_key: PoolKey):
+        if self.high_watermark == 0:
+            return
+        with self._lock:
+            state = self._state(pool_key)
+            available = len(state.ready) + state.pending
+            if available > self.low_watermark:
+                return
+            count = self.high_watermark - available
+            state.pending += count
+
+        executor = self._get_executor()
+        for _ in range(count):
+            future = executor.submit(_generate_exportable_key_pair, *pool_key)
+            future.add_done_callback(partial(self._on_generated, pool_key))
+
+    def _on_generated(self, pool_key: PoolKey, future):
+        error = None if future.cancelled() else future.exception()
+        pair = None
+        if not future.cancelled() and error is None:
+            # PEM sadece süreçler arası taşıma için; havuzda yüklenmiş handle tutulur
+            public_key, private_pem = future.result()
+            try:
+                asymmetric_enc = AsymmetricEncryptionFactory.create(pool_key[0], 'lib')
+                pair = (public_key, asymmetric_enc.load_private_key(private_pem))
+            except Exception as e:
+                error = e
+        with self._lock:
+            state = self._state(pool_key)
+            state.pending -= 1
+            if pair is None:
+                state.failures += 1
+            else:
+                state.ready.append(pair)
+                state.generated += 1
+                now = time.monotonic()
+                state.generated_at.append(now)
+                self._trim_rate_window(state, now)
+        if error is not None:
+            print(f"Key pool refill error ({pool_key[0]}): {error}")
+
+    def _trim_rate_window(self, state: _PoolState, now: float):
+        while state.generated_at and now - state.generated_at[0] > self.rate_window:
+            state.generated_at.popleft()
+
+    def stats(self) -> Dict[str, dict]:
+        """Pool depth, refill rate (pairs/second) and hit/miss counters per pool."""
+        now = time.monotonic()
+        result = {}
+        with self._lock:
+            for (algorithm, key_size), state in self._pools.items():
+                self._trim_rate_window(state, now)
+                name = algorithm if key_size is None else f"{algorithm}-{key_size}"
+                result[name] = {
+                    'depth': len(state.ready),
+                    'pending': state.pending,
+                    'hits': state.hits,
+                    'misses': state.misses,
+                    'generated': state.generated,
+                    'failures': state.failures,
+                    'refill_rate': len(state.generated_at) / self.rate_window,
+                }
+        return result
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,246 @@
+"""
+Lightweight latency metrics for server-side operations, and a registry
+that exposes them (with counters and scrape-time gauges) in the
+Prometheus text format.
+"""
+
+import bisect
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (seconds), safe to share between threads."""
+
+    DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                       0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        """Record one measurement."""
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += seconds
+            self._count += 1
+
+    def snapshot(self) -> Dict[str, object]:
+        """Return count, sum and cumulative bucket counts keyed by upper bound."""
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+
+        cumulative = {}
+        running = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            running += bucket_count
+            cumulative[repr(bound)] = running
+        cumulative['+Inf'] = count
+        return {'count': count, 'sum': total, 'buckets': cumulative}
+
+
+# Simetrik mesaj aşamaları gibi mikrosaniye mertebesindeki işlemler için
+FAST_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+                0.001, 0.0025, 0.005, 0.01, 0.025, 0.1)
+
+# Örnek: (metrik adı, tür, açıklama, [(etiketler, değer veya histogram anlık görüntüsü), ...])
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], Any]]]
+
+
+class Counter:
+    """Monotonic counter, one value per label combination."""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """Add amount to the counter for the given label values."""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def collect(self) -> Family:
+        with self._lock:
+            values = list(self._values.items())
+        return (self.name, 'counter', self.help,
+                [(dict(zip(self.labelnames, labels)), value) for labels, value in values])
+
+
+class StageTimer:
+    """Times consecutive stages of one operation into a labeled histogram."""
+
+    __slots__ = ('_histogram', '_labels', '_last')
+
+    def __init__(self, histogram: 'Histogram', labels: Tuple[str, ...]):
+        self._histogram = histogram
+        self._labels = labels
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        """Record the time since the previous lap (or start) under `stage`."""
+        now = time.perf_counter()
+        self._histogram.labels(stage, *self._labels).observe(now - self._last)
+        self._last = now
+
+
+class Histogram:
+    """Latency histograms per label combination (LatencyHistogram children)."""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LatencyHistogram.DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = buckets
+        self._children: Dict[Tuple[str, ...], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *labels: str) -> LatencyHistogram:
+        """Child histogram for the given label values."""
+        child = self._children.get(labels)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(labels, LatencyHistogram(self.buckets))
+        return child
+
+    def start(self, *labels: str) -> StageTimer:
+        """
+        Start timing an operation whose stages are recorded with lap(stage).
+        The first label of this histogram must be the stage name.
+        """
+        return StageTimer(self, labels)
+
+    def collect(self) -> Family:
+        with self._lock:
+            children = list(self._children.items())
+        return (self.name, 'histogram', self.help,
+                [(dict(zip(self.labelnames, labels)), child.snapshot()) for labels, child in children])
+
+
+class _NullInstrument:
+    """Stands in for every instrument when metrics are disabled; all calls are no-ops."""
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        pass
+
+    def observe(self, seconds: float) -> None:
+        pass
+
+    def labels(self, *labels: str) -> '_NullInstrument':
+        return self
+
+    def start(self, *labels: str) -> '_NullInstrument':
+        return self
+
+    def lap(self, stage: str) -> None:
+        pass
+
+
+_NULL = _NullInstrument()
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """
+    Instruments plus scrape-time collectors, rendered in the Prometheus
+    text exposition format.
+
+    When disabled, counter() and histogram() return a shared no-op object,
+    so instrumented hot paths only pay for an empty method call. Gauges and
+    collectors are evaluated at scrape time and are always exported.
+    """
+
+    def __init__(self, prefix: str = 'crypto_chat', enabled: bool = True):
+        self.prefix = prefix
+        self.enabled = enabled
+        self._instruments: List[Any] = []
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+
+    def _name(self, name: str) -> str:
+        return f"{self.prefix}_{name}" if self.prefix else name
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        """Register a counter (a no-op object when disabled)."""
+        if not self.enabled:
+            return _NULL
+        counter = Counter(self._name(name), help, labelnames)
+        self._instruments.append(counter)
+        return counter
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LatencyHistogram.DEFAULT_BUCKETS):
+        """Register a labeled latency histogram (a no-op object when disabled)."""
+        if not self.enabled:
+            return _NULL
+        histogram = Histogram(self._name(name), help, labelnames, buckets)
+        self._instruments.append(histogram)
+        return histogram
+
+    def gauge(self, name: str, help: str, fn: Callable[[], Optional[float]]) -> None:
+        """Register a gauge read from fn() at scrape time (skipped when fn returns None)."""
+        full_name = self._name(name)
+
+        def collect():
+            value = fn()
+            if value is not None:
+                yield full_name, 'gauge', help, [({}, value)]
+
+        self._collectors.append(collect)
+
+    def collector(self, fn: Callable[[], Iterable[Family]]) -> None:
+        """
+        Register a function yielding (name, type, help, samples) families at
+        scrape time; names are prefixed like the registry's own metrics.
+        """
+        def collect():
+            for name, kind, help, samples in fn():
+                yield self._name(name), kind, help, samples
+
+        self._collectors.append(collect)
+
+    def collect(self) -> List[Family]:
+        families = [instrument.collect() for instrument in self._instruments]
+        for collector in self._collectors:
+            families.extend(collector())
+        return families
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for name, kind, help, samples in self.collect():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                if kind != 'histogram':
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                    continue
+                for bound, count in value['buckets'].items():
+                    lines.append(f"{name}_bucket{_format_labels(dict(labels, le=bound))} {count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(value['sum'])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {value['count']}")
+        return '\n'.join(lines) + '\n'
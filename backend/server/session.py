@@ -0,0 +1,98 @@
+"""
+Compact per-connection session record.
+
+Her bağlantı için tek bir __slots__ nesnesi tutulur: dict yerine sabit
+alanlar, algoritma adları için kayıt defterindeki tek kopya ve
+hazırlanmış şifreleyici bağlamı. Sunucu private key'i yalnızca el
+sıkışma sürerken tutulur; simetrik anahtar doğrulandıktan sonra
+kayıttan silinir.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+from encryption.compression import CODECS
+from encryption.registry import DEFAULT_IMPLEMENTATION
+from encryption.symmetric.factory import registry as symmetric_registry
+
+# Depodaki kayıtta saklanan (ve Session'a kopyalanan) alanlar
+RECORD_FIELDS = ('server_key', 'symmetric_algorithm', 'symmetric_implementation', 'symmetric_key',
+                 'binary', 'compression', 'compression_dictionary')
+
+
+def cipher_id(algorithm: str, implementation: str = DEFAULT_IMPLEMENTATION) -> Tuple[str, str]:
+    """
+    Registered (algorithm, implementation) names for a client's choice.
+
+    İstemciden gelen her ad ayrı bir str nesnesidir; önce kayıt defterinde
+    doğrulanır ve kayıttaki (intern edilmiş) ad döner, böylece tüm oturumlar
+    tek kopyayı paylaşır ve istemci intern tablosunu büyütemez.
+
+    Raises:
+        ValueError: Unknown algorithm
+    """
+    return symmetric_registry.canonical(algorithm, implementation)
+
+
+def codec_id(name: Optional[str]) -> Optional[str]:
+    """
+    Registered name of a compression codec (None: no compression).
+
+    Raises:
+        ValueError: Unknown codec
+    """
+    if name is None:
+        return None
+    codec = CODECS.get(name)
+    if codec is None:
+        raise ValueError(f"Desteklenmeyen sıkıştırma: {name}")
+    return codec.name
+
+
+class Session:
+    """
+    Materialized session: stored record fields plus the bound cipher.
+
+    Attributes:
+        server_key: KeyHandle until the symmetric key is confirmed, then None
+        symmetric_algorithm / symmetric_implementation: Registered algorithm names (cipher_id)
+        symmetric_key: Raw session key
+        binary: Messages travel as raw bytes instead of base64
+        compression / compression_dictionary: Negotiated compression (codec_id), if any
+        cipher: Prepared cipher context (None until settings are confirmed)
+        cipher_name: Metric label of the cipher class (e.g. AESLib)
+    """
+
+    __slots__ = RECORD_FIELDS + ('cipher', 'cipher_name')
+
+    def __init__(self, server_key=None, symmetric_algorithm: Optional[str] = None,
+                 symmetric_implementation: Optional[str] = None, symmetric_key: Optional[bytes] = None,
+                 binary: bool = False, compression: Optional[str] = None,
+                 compression_dictionary: Optional[bytes] = None):
+        if symmetric_algorithm is not None:
+            # Depodan (SQLite/Redis) okunan adlar da kayıttaki tek kopyaya çevrilir
+            symmetric_algorithm, symmetric_implementation = cipher_id(
+                symmetric_algorithm, symmetric_implementation or DEFAULT_IMPLEMENTATION)
+        self.server_key = server_key
+        self.symmetric_algorithm = symmetric_algorithm
+        self.symmetric_implementation = symmetric_implementation
+        self.symmetric_key = symmetric_key
+        self.binary = bool(binary)
+        self.compression = codec_id(compression)
+        self.compression_dictionary = compression_dictionary
+        self.cipher = None
+        self.cipher_name = None
+
+    @classmethod
+    def from_record(cls, record: Dict[str, Any]) -> 'Session':
+        """Build a session from a stored record (unknown keys are ignored)."""
+        return cls(**{field: record[field] for field in RECORD_FIELDS if field in record})
+
+    def settings(self) -> Dict[str, Any]:
+        """Symmetric settings as a dict (the shape TicketIssuer.issue expects)."""
+        return {field: getattr(self, field) for field in RECORD_FIELDS if field != 'server_key'}
+
+    def __repr__(self) -> str:
+        return (f"Session(symmetric_algorithm={self.symmetric_algorithm!r}, "
+                f"symmetric_implementation={self.symmetric_implementation!r}, "
+                f"binary={self.binary!r}, compression={self.compression!r}, "
+                f"cipher_name={self.cipher_name!r}, server_key={'set' if self.server_key else None})")
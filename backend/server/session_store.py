@@ -0,0 +1,476 @@
+"""
+Pluggable per-session state store.
+
+Oturum ayarları (simetrik anahtar, algoritma, sunucu private key'i) bir
+arka uçta tutulur: tek süreç için bellek, aynı makinedeki çok süreçli
+kurulumlar için SQLite, birden fazla makine için uzak bir anahtar-değer
+deposu (Redis benzeri). Her süreç kayıtları okuma sırasında yerel bir
+önbelleğe alır; mesaj başına arama tek bir dict erişimidir.
+
+Yapışkan (sticky) oturumlar varsayılır: bir sid'in olaylarını hep aynı
+süreç işler, bu yüzden yerel önbellek yalnızca yazarken güncellenir.
+
+Disconnect olayı kaçırılırsa (kopan bağlantı, çöken işçi) oturum
+kendiliğinden silinmez; sweep() son etkinlik zamanına göre sıralı bir
+yığın (heap) üzerinden TTL boyunca etkinlik görmeyen oturumları çıkarır.
+max_sessions dolduğunda en uzun süredir etkinlik görmeyen (LRU) oturum
+yer açmak için çıkarılır.
+"""
+
+import base64
+import heapq
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from encryption import AsymmetricEncryptionFactory
+from .key_cache import KeyHandle
+
+Record = Dict[str, Any]
+NEVER = float('inf')
+
+
+def encode_record(record: Record) -> str:
+    """JSON form of a record; bytes and key handles get tagged objects."""
+    def default(value):
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return {'__bytes__': base64.b64encode(value).decode('ascii')}
+        if isinstance(value, KeyHandle):
+            return {'__key__': value.algorithm, 'pem': value.export().decode('ascii')}
+        raise TypeError(f"Oturum kaydında saklanamayan tür: {type(value).__name__}")
+    return json.dumps(record, default=default, separators=(',', ':'))
+
+
+def decode_record(data) -> Record:
+    """Inverse of encode_record; private keys are loaded back into handles."""
+    def object_hook(obj):
+        if '__bytes__' in obj:
+            return base64.b64decode(obj['__bytes__'])
+        if '__key__' in obj:
+            asymmetric_enc = AsymmetricEncryptionFactory.create(obj['__key__'], 'lib')
+            return KeyHandle(obj['__key__'], asymmetric_enc.load_private_key(obj['pem'].encode('ascii')))
+        return obj
+    return json.loads(data, object_hook=object_hook)
+
+
+class _Entry:
+    """Cache slot of one session."""
+
+    __slots__ = ('session', 'record', 'refresh_at', 'last_active', 'queued_at')
+
+    def __init__(self, session: Any, record: Record, refresh_at: float, last_active: float, queued_at: float):
+        self.session = session
+        self.record = record
+        self.refresh_at = refresh_at
+        self.last_active = last_active
+        # Etkinlik yığınındaki geçerli öğenin anahtarı (daha eski öğeler bayattır)
+        self.queued_at = queued_at
+
+
+class SessionStore(ABC):
+    """
+    Base class for session stores with an in-process read-through cache.
+
+    Subclasses only implement the backend primitives (_load, _save, _delete,
+    purge_expired). The TTL slides: a session read after half of its TTL
+    has passed is written back with a fresh expiry.
+    """
+
+    def __init__(self, ttl: Optional[float] = None,
+                 materialize: Optional[Callable[[Record], Any]] = None,
+                 max_sessions: Optional[int] = None,
+                 on_evict: Optional[Callable[[str, str], None]] = None):
+        """
+        Args:
+            ttl: Seconds a session lives without activity (None: no expiry)
+            materialize: Builds the cached session object (e.g. with a bound
+                cipher) from a stored record; defaults to a plain dict copy
+            max_sessions: Ceiling on cached sessions; the least recently
+                active one is evicted to make room (None: unlimited)
+            on_evict: Called as on_evict(sid, reason) after sweep() or the
+                ceiling removed a session ('idle' / 'capacity'); not called
+                for evict()
+        """
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl pozitif olmalı")
+        if max_sessions is not None and max_sessions <= 0:
+            raise ValueError("max_sessions pozitif olmalı")
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._materialize = materialize or dict
+        self._on_evict = on_evict
+        self._cache: Dict[str, _Entry] = {}
+        # (son etkinlik, sid) min-yığını. get() yalnızca _Entry.last_active'i günceller;
+        # öğeler çıkarılırken doğrulanır ve gerekiyorsa yeni zamanla tekrar eklenir.
+        self._activity: List[Tuple[float, str]] = []
+        self._evictions = {'idle': 0, 'capacity': 0}
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _load(self, sid: str) -> Optional[Record]:
+        """Return the stored record, or None if missing or expired."""
+        pass
+
+    @abstractmethod
+    def _save(self, sid: str, record: Record, expires_at: float) -> None:
+        """Store (or replace) the record with an absolute expiry time."""
+        pass
+
+    @abstractmethod
+    def _delete(self, sid: str) -> bool:
+        """Remove the record; returns True if one existed."""
+        pass
+
+    @abstractmethod
+    def purge_expired(self) -> int:
+        """Delete expired records from the backend; returns how many."""
+        pass
+
+    def _expiry(self, now: float) -> Tuple[float, float]:
+        if self.ttl is None:
+            return NEVER, NEVER
+        return now + self.ttl, now + self.ttl / 2
+
+    def _cache_put(self, sid: str, record: Record, now: float, evicted: List[str]) -> Any:
+        _, refresh_at = self._expiry(now)
+        session = self._materialize(record)
+        entry = self._cache.get(sid)
+        if entry is None:
+            self._make_room(evicted)
+            heapq.heappush(self._activity, (now, sid))
+            queued_at = now
+        else:
+            queued_at = entry.queued_at
+        self._cache[sid] = _Entry(session, record, refresh_at, now, queued_at)
+        return session
+
+    def _pop_inactive(self, before: float) -> Optional[str]:
+        """
+        Pop the least recently active sid if its last activity is older than
+        before; stale heap items are dropped, items of sessions active since
+        they were queued go back with their new activity time.
+        """
+        heap = self._activity
+        while heap and heap[0][0] < before:
+            queued_at, sid = heapq.heappop(heap)
+            entry = self._cache.get(sid)
+            if entry is None or entry.queued_at != queued_at:
+                continue
+            if entry.last_active > queued_at:
+                entry.queued_at = entry.last_active
+                heapq.heappush(heap, (entry.last_active, sid))
+                continue
+            return sid
+        return None
+
+    def _drop(self, sid: str, reason: str, evicted: List[str]) -> None:
+        del self._cache[sid]
+        self._delete(sid)
+        self._evictions[reason] += 1
+        evicted.append(sid)
+
+    def _make_room(self, evicted: List[str]) -> None:
+        """Evict LRU sessions until a new one fits under max_sessions."""
+        if self.max_sessions is None:
+            return
+        while len(self._cache) >= self.max_sessions:
+            sid = self._pop_inactive(NEVER)
+            if sid is None:
+                break
+            self._drop(sid, 'capacity', evicted)
+
+    def _notify(self, evicted: List[str], reason: str) -> None:
+        # Kilit dışında çağrılır: geri çağırma başka kayıtlara (akışlar vb.) dokunabilir
+        if self._on_evict is not None:
+            for sid in evicted:
+                self._on_evict(sid, reason)
+
+    def get(self, sid: str) -> Optional[Any]:
+        """Session object for sid, or None if it does not exist (or expired)."""
+        entry = self._cache.get(sid)
+        if entry is not None:
+            now = time.time()
+            if now < entry.refresh_at:
+                entry.last_active = now
+                return entry.session
+        return self._read_through(sid)
+
+    def _read_through(self, sid: str) -> Optional[Any]:
+        evicted = []
+        with self._lock:
+            now = time.time()
+            entry = self._cache.get(sid)
+            record = self._load(sid)
+            if record is None:
+                self._cache.pop(sid, None)
+                return None
+            expires_at, refresh_at = self._expiry(now)
+            self._save(sid, record, expires_at)
+            if entry is not None and entry.record == record:
+                # Kayıt değişmediyse oturum nesnesi yeniden kurulmaz
+                entry.record, entry.refresh_at, entry.last_active = record, refresh_at, now
+                return entry.session
+            session = self._cache_put(sid, record, now, evicted)
+        self._notify(evicted, 'capacity')
+        return session
+
+    def update(self, sid: str, **fields) -> Any:
+        """
+        Merge fields into the session's record (creating it if needed).
+        A field passed as None is removed from the record.
+
+        Returns:
+            The freshly materialized session object
+        """
+        evicted = []
+        with self._lock:
+            now = time.time()
+            entry = self._cache.get(sid)
+            current = entry.record if entry is not None else self._load(sid)
+            merged = dict(current or {})
+            merged.update(fields)
+            # None alanı siler (ör. doğrulanan anahtardan sonra server_key); kayıt küçük kalır
+            record = {name: value for name, value in merged.items() if value is not None}
+            expires_at, _ = self._expiry(now)
+            self._save(sid, record, expires_at)
+            session = self._cache_put(sid, record, now, evicted)
+        self._notify(evicted, 'capacity')
+        return session
+
+    def evict(self, sid: str) -> bool:
+        """Drop every piece of the session's state at once (on disconnect)."""
+        with self._lock:
+            cached = self._cache.pop(sid, None) is not None
+            return self._delete(sid) or cached
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """
+        Evict sessions without activity for a whole TTL (e.g. missed disconnects).
+
+        Walks the activity heap from the oldest entry, so the cost depends on
+        the sessions visited, not on the total. Returns how many were evicted.
+        """
+        now = time.time() if now is None else now
+        evicted = []
+        with self._lock:
+            if self.ttl is not None:
+                while True:
+                    sid = self._pop_inactive(now - self.ttl)
+                    if sid is None:
+                        break
+                    self._drop(sid, 'idle', evicted)
+            if len(self._activity) > 2 * len(self._cache) + 64:
+                # Ayrılan oturumların bayat öğeleri birikmesin (TTL yokken hiç çıkarılmazlar)
+                self._activity = [(entry.queued_at, sid) for sid, entry in self._cache.items()]
+                heapq.heapify(self._activity)
+        self._notify(evicted, 'idle')
+        return len(evicted)
+
+    def stats(self) -> Dict[str, Any]:
+        """Cached sessions, the ceiling and eviction counts by reason."""
+        with self._lock:
+            return {'sessions': len(self._cache), 'max_sessions': self.max_sessions, 'ttl': self.ttl,
+                    'evictions': dict(self._evictions)}
+
+    def stored_count(self) -> Optional[int]:
+        """Records held by the backend, or None if the backend cannot tell cheaply."""
+        return None
+
+    def __contains__(self, sid: str) -> bool:
+        return self.get(sid) is not None
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+class MemorySessionStore(SessionStore):
+    """Single-process store; records are kept as live objects, nothing is serialized."""
+
+    def __init__(self, ttl: Optional[float] = None, materialize=None, max_sessions=None, on_evict=None):
+        super().__init__(ttl, materialize, max_sessions, on_evict)
+        self._records: Dict[str, Tuple[Record, float]] = {}
+
+    def _load(self, sid: str) -> Optional[Record]:
+        item = self._records.get(sid)
+        if item is None:
+            return None
+        if item[1] <= time.time():
+            del self._records[sid]
+            return None
+        return item[0]
+
+    def _save(self, sid: str, record: Record, expires_at: float) -> None:
+        self._records[sid] = (record, expires_at)
+
+    def _delete(self, sid: str) -> bool:
+        return self._records.pop(sid, None) is not None
+
+    def stored_count(self) -> Optional[int]:
+        return len(self._records)
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            now = time.time()
+            expired = [sid for sid, (_, expires_at) in self._records.items() if expires_at <= now]
+            for sid in expired:
+                del self._records[sid]
+                self._cache.pop(sid, None)
+        return len(expired)
+
+
+class SQLiteSessionStore(SessionStore):
+    """Store shared by the worker processes of one host through a SQLite file."""
+
+    def __init__(self, path: str, ttl: Optional[float] = None, materialize=None, max_sessions=None,
+                 on_evict=None):
+        super().__init__(ttl, materialize, max_sessions, on_evict)
+        self.path = path
+        self._conn = None
+        self._conn_pid = None
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "sid TEXT PRIMARY KEY, record TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        # Bağlantılar fork sonrası paylaşılamaz; her süreç kendi bağlantısını açar
+        if self._conn is None or self._conn_pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn, self._conn_pid = conn, os.getpid()
+        return self._conn
+
+    def _load(self, sid: str) -> Optional[Record]:
+        row = self._connection().execute(
+            "SELECT record FROM sessions WHERE sid = ? AND expires_at > ?", (sid, time.time())
+        ).fetchone()
+        return decode_record(row[0]) if row else None
+
+    def _save(self, sid: str, record: Record, expires_at: float) -> None:
+        # SQLite REAL sonsuzluğu saklayabilir; TTL yoksa kayıt hiç dolmaz
+        self._connection().execute(
+            "INSERT OR REPLACE INTO sessions (sid, record, expires_at) VALUES (?, ?, ?)",
+            (sid, encode_record(record), expires_at)
+        )
+
+    def _delete(self, sid: str) -> bool:
+        cursor = self._connection().execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+        return cursor.rowcount > 0
+
+    def stored_count(self) -> Optional[int]:
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM sessions WHERE expires_at > ?", (time.time(),)
+        ).fetchone()[0]
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cursor = self._connection().execute(
+                "DELETE FROM sessions WHERE expires_at <= ?", (time.time(),)
+            )
+            now = time.time()
+            for sid in [sid for sid, entry in self._cache.items() if entry.refresh_at <= now]:
+                del self._cache[sid]
+            return cursor.rowcount
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        evicted = super().sweep(now)
+        # Çöken işçilerin kayıtları hiçbir önbellekte değildir; süresi dolan satırlar burada silinir
+        with self._lock:
+            self._connection().execute("DELETE FROM sessions WHERE expires_at <= ?", (time.time(),))
+        return evicted
+
+
+class RemoteSessionStore(SessionStore):
+    """
+    Store backed by a Redis-like key-value client.
+
+    The client needs get(key), set(key, value, px=milliseconds) and
+    delete(key) with redis-py semantics; expiry is enforced by the server.
+    """
+
+    def __init__(self, client, ttl: Optional[float] = None, materialize=None, max_sessions=None,
+                 on_evict=None, prefix: str = 'crypto-chat:session:'):
+        super().__init__(ttl, materialize, max_sessions, on_evict)
+        self.client = client
+        self.prefix = prefix
+
+    def _load(self, sid: str) -> Optional[Record]:
+        data = self.client.get(self.prefix + sid)
+        return decode_record(data) if data is not None else None
+
+    def _save(self, sid: str, record: Record, expires_at: float) -> None:
+        px = None if expires_at == NEVER else max(1, int((expires_at - time.time()) * 1000))
+        self.client.set(self.prefix + sid, encode_record(record), px=px)
+
+    def _delete(self, sid: str) -> bool:
+        return bool(self.client.delete(self.prefix + sid))
+
+    def purge_expired(self) -> int:
+        # Uzak depo süresi dolan anahtarları kendisi siler
+        return 0
+
+
+class InMemoryRemoteClient:
+    """Local stand-in for a Redis client (get/set with px/delete), for tests and development."""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[bytes, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            if item[1] <= time.time():
+                del self._data[key]
+                return None
+            return item[0]
+
+    def set(self, key: str, value, px: Optional[int] = None) -> bool:
+        if isinstance(value, str):
+            value = value.encode('utf-8')
+        expires_at = NEVER if px is None else time.time() + px / 1000
+        with self._lock:
+            self._data[key] = (value, expires_at)
+        return True
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(self._data.pop(key, None) is not None for key in keys)
+
+
+def create_session_store(backend: str = 'memory', ttl: Optional[float] = None,
+                         materialize=None, path: str = 'sessions.db',
+                         url: Optional[str] = None, max_sessions: Optional[int] = None,
+                         on_evict=None) -> SessionStore:
+    """
+    Build a session store from configuration values.
+
+    Args:
+        backend: 'memory', 'sqlite' or 'remote'
+        ttl: Session TTL in seconds (None: no expiry)
+        materialize: See SessionStore
+        path: SQLite database file (sqlite backend)
+        url: Redis URL (remote backend); without it a local stand-in is used
+        max_sessions, on_evict: See SessionStore
+    """
+    if backend == 'memory':
+        return MemorySessionStore(ttl, materialize, max_sessions, on_evict)
+    if backend == 'sqlite':
+        return SQLiteSessionStore(path, ttl, materialize, max_sessions, on_evict)
+    if backend == 'remote':
+        if url is None:
+            return RemoteSessionStore(InMemoryRemoteClient(), ttl, materialize, max_sessions, on_evict)
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("Uzak oturum deposu için 'redis' paketi gerekli (pip install redis)")
+        return RemoteSessionStore(redis.Redis.from_url(url), ttl, materialize, max_sessions, on_evict)
+    raise ValueError(f"Desteklenmeyen oturum deposu: {backend}")
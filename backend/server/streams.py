@@ -0,0 +1,101 @@
+"""
+Per-session state of chunked stream transfers.
+
+Her akış (stream_id) kendi deşifre ve şifreleme durumunu taşır; parçalar
+geldikçe işlenir, böylece yük tamamı gelmeden cevap akışı başlayabilir.
+Yerel akış modu olan şifreler (AES/DES lib) yalnızca bir blokluk durum tutar
+ve sınırsız yük taşıyabilir. Olmayanlar (BufferedStream) yükün tamamını
+bellekte biriktirdiği için bunların akışı tek mesaj sınırıyla
+(MAX_MESSAGE_SIZE) sınırlıdır.
+"""
+
+import threading
+from typing import Dict, Optional
+
+from encryption.symmetric.base import MAX_MESSAGE_SIZE, BufferedStream, CipherContext, StreamTransform
+
+
+class StreamLimitExceeded(Exception):
+    """Raised when a session opens more concurrent streams than allowed or a stream grows too large."""
+
+
+class StreamState:
+    """Incoming decryptor and outgoing encryptor of one transfer."""
+
+    __slots__ = ('decryptor', 'encryptor', 'bytes_in', 'bytes_out', 'max_bytes')
+
+    def __init__(self, decryptor: StreamTransform, encryptor: StreamTransform,
+                 max_bytes: Optional[int] = None):
+        self.decryptor = decryptor
+        self.encryptor = encryptor
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.max_bytes = max_bytes
+
+    def receive(self, size: int) -> None:
+        """
+        Count an incoming chunk.
+
+        Raises:
+            StreamLimitExceeded: the stream went over max_bytes (None: no limit)
+        """
+        self.bytes_in += size
+        if self.max_bytes is not None and self.bytes_in > self.max_bytes:
+            raise StreamLimitExceeded(f"Akış en fazla {self.max_bytes} bayt olabilir")
+
+
+class StreamRegistry:
+    """(session id, stream id) -> StreamState, evicted when the session disconnects."""
+
+    def __init__(self, max_streams_per_session: int = 4, max_stream_bytes: Optional[int] = MAX_MESSAGE_SIZE):
+        self.max_streams_per_session = max_streams_per_session
+        self.max_stream_bytes = max_stream_bytes
+        self._streams: Dict[str, Dict[str, StreamState]] = {}
+        self._lock = threading.Lock()
+
+    def open(self, sid: str, stream_id: str, cipher: CipherContext) -> StreamState:
+        """
+        Start a stream (an existing one with the same id is replaced).
+
+        max_stream_bytes applies only to ciphers without a native stream mode;
+        native streams hold one block of state and are not limited.
+        """
+        decryptor, encryptor = cipher.decryptor(), cipher.encryptor()
+        buffered = isinstance(decryptor, BufferedStream) or isinstance(encryptor, BufferedStream)
+        state = StreamState(decryptor, encryptor, self.max_stream_bytes if buffered else None)
+        with self._lock:
+            streams = self._streams.setdefault(sid, {})
+            if stream_id not in streams and len(streams) >= self.max_streams_per_session:
+                raise StreamLimitExceeded(
+                    f"Oturum başına en fazla {self.max_streams_per_session} eşzamanlı akış açılabilir"
+                )
+            streams[stream_id] = state
+        return state
+
+    def get(self, sid: str, stream_id: str) -> Optional[StreamState]:
+        return self._streams.get(sid, {}).get(stream_id)
+
+    def close(self, sid: str, stream_id: str) -> Optional[StreamState]:
+        with self._lock:
+            streams = self._streams.get(sid)
+            if not streams:
+                return None
+            state = streams.pop(stream_id, None)
+            if not streams:
+                del self._streams[sid]
+            return state
+
+    def evict(self, sid: str) -> int:
+        """Drop every open stream of the session; returns how many there were."""
+        with self._lock:
+            return len(self._streams.pop(sid, {}))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'sessions': len(self._streams),
+                'open_streams': sum(len(streams) for streams in self._streams.values())
+            }
+
+    def __len__(self) -> int:
+        return sum(len(streams) for streams in self._streams.values())
@@ -0,0 +1,183 @@
+"""
+Session resumption tickets.
+
+settings_confirmed sonrasında istemciye, simetrik ayarları ve anahtarı
+içeren, sunucu bilet anahtarıyla AES-GCM ile şifrelenmiş ve doğrulanmış
+(MAC) bir bilet verilir. Yeniden bağlanan istemci bileti sunarak asimetrik
+el sıkışmayı (anahtar üretimi + RSA/ECC deşifre) atlar; sunucu yalnızca
+tek bir simetrik deşifre yapar.
+
+Bilet anahtarı her `rotation_interval` saniyede bir değişir. Anahtarlar
+ortak bir sırdan (TICKET_SECRET) dönem numarasıyla HKDF ile türetildiği
+için tüm işçiler aynı anahtarları koordinasyonsuz bilir. Sır verilmezse
+süreç başına rastgele üretilir (tek süreç için yeterli).
+"""
+
+import base64
+import json
+import os
+import struct
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+TICKET_VERSION = 1
+_HEADER = struct.Struct('!BI')   # sürüm, anahtar dönemi
+_NONCE_SIZE = 12
+
+
+class TicketError(Exception):
+    """Raised when a ticket cannot be used; `reason` is a short metric label."""
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+class TicketIssuer:
+    """Seals and opens resumption tickets under rotating, derived ticket keys."""
+
+    def __init__(self, secret: Optional[bytes] = None, rotation_interval: float = 3600.0,
+                 lifetime: float = 6 * 3600.0):
+        if rotation_interval <= 0 or lifetime <= 0:
+            raise ValueError("rotation_interval ve lifetime pozitif olmalı")
+        self.secret = secret or os.urandom(32)
+        self.rotation_interval = rotation_interval
+        self.lifetime = lifetime
+        self._keys: Dict[int, AESGCM] = {}
+        self._lock = threading.Lock()
+        self._issued = 0
+        self._hits = 0
+        self._misses: Dict[str, int] = {}
+        self._full_handshakes = 0
+
+    def _epoch(self, now: float) -> int:
+        return int(now // self.rotation_interval)
+
+    def _key(self, epoch: int) -> AESGCM:
+        key = self._keys.get(epoch)
+        if key is None:
+            material = HKDF(
+                algorithm=hashes.SHA256(), length=32, salt=None,
+                info=b"crypto-chat ticket key " + str(epoch).encode('ascii')
+            ).derive(self.secret)
+            key = AESGCM(material)
+            with self._lock:
+                self._keys[epoch] = key
+                # Bilet ömrünü aşan dönemlerin anahtarları atılır
+                oldest = epoch - int(self.lifetime // self.rotation_interval) - 1
+                for stale in [e for e in self._keys if e < oldest]:
+                    del self._keys[stale]
+        return key
+
+    def issue(self, settings: Dict[str, Any]) -> str:
+        """
+        Seal session settings into a ticket.
+
+        Args:
+            settings: symmetric_algorithm, symmetric_implementation,
+                symmetric_key (bytes), binary and optionally compression /
+                compression_dictionary (bytes)
+
+        Returns:
+            URL-safe base64 ticket
+        """
+        now = time.time()
+        epoch = self._epoch(now)
+        header = _HEADER.pack(TICKET_VERSION, epoch)
+        dictionary = settings.get('compression_dictionary')
+        body = json.dumps({
+            'symmetric_algorithm': settings['symmetric_algorithm'],
+            'symmetric_implementation': settings['symmetric_implementation'],
+            'symmetric_key': base64.b64encode(settings['symmetric_key']).decode('ascii'),
+            'binary': bool(settings.get('binary', False)),
+            'compression': settings.get('compression'),
+            'compression_dictionary': base64.b64encode(dictionary).decode('ascii') if dictionary else None,
+            'issued_at': now,
+        }, separators=(',', ':')).encode('utf-8')
+        nonce = os.urandom(_NONCE_SIZE)
+        sealed = self._key(epoch).encrypt(nonce, body, header)
+        with self._lock:
+            self._issued += 1
+        return base64.urlsafe_b64encode(header + nonce + sealed).decode('ascii')
+
+    def open(self, ticket: str) -> Dict[str, Any]:
+        """
+        Verify and decrypt a ticket.
+
+        Returns:
+            The settings passed to issue (symmetric_key as bytes)
+
+        Raises:
+            TicketError: If the ticket is malformed, forged, from an unknown
+                key epoch or expired
+        """
+        try:
+            settings = self._open(ticket)
+        except TicketError as e:
+            with self._lock:
+                self._misses[e.reason] = self._misses.get(e.reason, 0) + 1
+            raise
+        with self._lock:
+            self._hits += 1
+        return settings
+
+    def _open(self, ticket: str) -> Dict[str, Any]:
+        try:
+            raw = base64.urlsafe_b64decode(ticket)
+        except (TypeError, ValueError):
+            raise TicketError('malformed', "Bilet çözülemedi")
+        if len(raw) < _HEADER.size + _NONCE_SIZE + 16:
+            raise TicketError('malformed', "Bilet çok kısa")
+
+        header = raw[:_HEADER.size]
+        version, epoch = _HEADER.unpack(header)
+        if version != TICKET_VERSION:
+            raise TicketError('malformed', "Desteklenmeyen bilet sürümü")
+
+        now = time.time()
+        if epoch > self._epoch(now) or epoch < self._epoch(now - self.lifetime):
+            raise TicketError('unknown_key', "Bilet anahtarı artık geçerli değil")
+
+        nonce = raw[_HEADER.size:_HEADER.size + _NONCE_SIZE]
+        try:
+            body = self._key(epoch).decrypt(nonce, raw[_HEADER.size + _NONCE_SIZE:], header)
+        except InvalidTag:
+            raise TicketError('invalid', "Bilet doğrulanamadı")
+
+        settings = json.loads(body)
+        if settings['issued_at'] + self.lifetime < now:
+            raise TicketError('expired', "Biletin süresi dolmuş")
+        settings['symmetric_key'] = base64.b64decode(settings['symmetric_key'])
+        if settings.get('compression_dictionary'):
+            settings['compression_dictionary'] = base64.b64decode(settings['compression_dictionary'])
+        return settings
+
+    def record_full_handshake(self) -> None:
+        """Count a session established through the asymmetric handshake."""
+        with self._lock:
+            self._full_handshakes += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Issued tickets, resumption hits, misses by reason and hit rate.
+
+        hit_rate is the share of sessions established by resumption instead
+        of the full handshake (a failed resumption falls back to the latter).
+        """
+        with self._lock:
+            misses = dict(self._misses)
+            hits, issued, full = self._hits, self._issued, self._full_handshakes
+        established = hits + full
+        return {
+            'issued': issued,
+            'hits': hits,
+            'misses': misses,
+            'full_handshakes': full,
+            'hit_rate': hits / established if established else 0.0,
+        }
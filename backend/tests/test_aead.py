@@ -0,0 +1,67 @@
+"""
+Authenticated ciphers (AES-GCM, ChaCha20-Poly1305).
+"""
+
+import pytest
+
+from encryption import SymmetricEncryptionFactory
+
+AEAD = ['aes-gcm', 'chacha20-poly1305']
+NONCE_SIZE = 12
+TAG_SIZE = 16
+
+
+def _context(algorithm: str):
+    cipher = SymmetricEncryptionFactory.create(algorithm, 'lib')
+    return cipher.bind(cipher.generate_key())
+
+
+@pytest.mark.parametrize('algorithm', AEAD)
+@pytest.mark.parametrize('message', ['', 'a', 'Merhaba dünya!', 'x' * 100000])
+def test_round_trip(algorithm, message):
+    context = _context(algorithm)
+    assert context.decrypt(context.encrypt(message)) == message
+    frame = context.encrypt_bytes(message.encode('utf-8'))
+    # Dolgu yok: nonce + şifreli metin + etiket
+    assert len(frame) == NONCE_SIZE + len(message.encode('utf-8')) + TAG_SIZE
+
+
+@pytest.mark.parametrize('algorithm', AEAD)
+@pytest.mark.parametrize('position', [0, NONCE_SIZE, -1])
+def test_tampered_frame_raises_value_error(algorithm, position):
+    context = _context(algorithm)
+    frame = bytearray(context.encrypt_bytes(b'transfer 100 TL'))
+    frame[position] ^= 0x01
+    with pytest.raises(ValueError):
+        context.decrypt_bytes(bytes(frame))
+
+
+@pytest.mark.parametrize('algorithm', AEAD)
+def test_truncated_frame_raises_value_error(algorithm):
+    context = _context(algorithm)
+    frame = context.encrypt_bytes(b'transfer 100 TL')
+    with pytest.raises(ValueError):
+        context.decrypt_bytes(frame[:-1])
+
+
+@pytest.mark.parametrize('algorithm', AEAD)
+def test_wrong_key_raises_value_error(algorithm):
+    frame = _context(algorithm).encrypt_bytes(b'gizli')
+    with pytest.raises(ValueError):
+        _context(algorithm).decrypt_bytes(frame)
+
+
+@pytest.mark.parametrize('algorithm', AEAD)
+def test_nonce_is_fresh_per_message(algorithm):
+    context = _context(algorithm)
+    assert context.encrypt_bytes(b'ayni')[:NONCE_SIZE] != context.encrypt_bytes(b'ayni')[:NONCE_SIZE]
+
+
+@pytest.mark.parametrize('algorithm', AEAD)
+def test_stream_fallback_round_trip(algorithm):
+    # Etiket çerçevenin sonunda olduğu için akış yükü stream_end'de doğrulanır
+    context = _context(algorithm)
+    frame = context.encrypt_bytes(b'y' * 5000)
+    decryptor = context.decryptor()
+    output = b''.join(decryptor.update(frame[i:i + 1000]) for i in range(0, len(frame), 1000))
+    assert output + decryptor.finalize() == b'y' * 5000
@@ -0,0 +1,38 @@
+"""
+Authenticated local:// broker frames.
+"""
+
+import pickle
+
+import pytest
+
+from server.broker import LocalSocketManager, open_message, sign_message
+
+SECRET = b'broker-test-secret'
+
+
+def test_signed_message_round_trip():
+    message = {'channel': 'socketio', 'data': {'event': 'chunk', 'data': b'\x00\xff', 'args': (1, 2)}}
+    assert open_message(SECRET, sign_message(SECRET, message)) == message
+
+
+@pytest.mark.parametrize('frame', [
+    pickle.dumps({'channel': 'socketio', 'data': {}}),
+    sign_message(b'other-secret', {'channel': 'socketio', 'data': {}}),
+    b'',
+])
+def test_unauthenticated_frame_is_rejected(frame):
+    with pytest.raises(ValueError):
+        open_message(SECRET, frame)
+
+
+def test_tampered_frame_is_rejected():
+    frame = bytearray(sign_message(SECRET, {'channel': 'socketio', 'data': {}}))
+    frame[-2] ^= 1
+    with pytest.raises(ValueError):
+        open_message(SECRET, bytes(frame))
+
+
+def test_local_manager_requires_secret():
+    with pytest.raises(ValueError):
+        LocalSocketManager('local://127.0.0.1:6380')
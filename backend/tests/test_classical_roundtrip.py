@@ -0,0 +1,61 @@
+"""
+Round-trip tests for the classical text ciphers.
+"""
+
+import pytest
+
+from encryption import SymmetricEncryptionFactory
+
+# Playfair metni normalize ettiği (büyük harf, boşluksuz, J -> I, çift harf
+# arasına X) için yalnızca bu kurallara uyan metinler birebir geri döner
+LOSSLESS = ['caesar', 'vigenere', 'railfence']
+CLASSICAL = LOSSLESS + ['playfair']
+
+
+def _cipher(algorithm: str):
+    return SymmetricEncryptionFactory.create(algorithm, 'lib')
+
+
+@pytest.mark.parametrize('algorithm', LOSSLESS)
+@pytest.mark.parametrize('message', ['', 'HELLOWORLD', 'Merhaba dünya! 🙂', 'a b c 123', 'x' * 257])
+def test_round_trip(algorithm, message):
+    cipher = _cipher(algorithm)
+    key = cipher.generate_key()
+    assert cipher.decrypt(cipher.encrypt(message, key), key) == message
+
+
+@pytest.mark.parametrize('algorithm, key', [
+    ('caesar', b'\x07'),
+    ('vigenere', b'ANAHTAR'),
+    ('playfair', b'MONARCHY'),
+    ('railfence', b'\x05'),
+])
+def test_round_trip_bound_context(algorithm, key):
+    context = _cipher(algorithm).bind(key)
+    message = 'ATTACKATDAWN'
+    ciphertext = context.encrypt(message)
+    assert ciphertext != message
+    assert context.decrypt(ciphertext) == message
+
+
+@pytest.mark.parametrize('algorithm', CLASSICAL)
+def test_bytes_round_trip(algorithm):
+    context = _cipher(algorithm).bind(_cipher(algorithm).generate_key())
+    data = 'ATTACKATDAWN'.encode('utf-8')
+    assert context.decrypt_bytes(context.encrypt_bytes(data)) == data
+
+
+def test_playfair_normalizes_plaintext():
+    cipher = _cipher('playfair')
+    key = cipher.generate_key()
+    assert cipher.decrypt(cipher.encrypt('hello jolly world', key), key) == 'HELXLOIOLXLYWORLDX'
+
+
+def test_caesar_shift():
+    cipher = _cipher('caesar')
+    assert cipher.encrypt_text('ABC', cipher.prepare_key(b'\x03')) == 'DEF'
+
+
+def test_railfence_three_rails():
+    cipher = _cipher('railfence')
+    assert cipher.encrypt_text('WEAREDISCOVERED', cipher.prepare_key(b'\x03')) == 'WECRERDSOEEAIVD'
@@ -0,0 +1,67 @@
+"""
+Compression stage in front of the ciphers.
+"""
+
+import pytest
+
+from encryption import SymmetricEncryptionFactory
+from encryption.compression import CODECS, COMPRESSED, STORED, Codec, compress_context, validate
+
+MESSAGE = 'Merhaba, bugün nasılsın? ' * 40
+
+
+def _context(codec_name: str, dictionary=None, algorithm: str = 'aes'):
+    cipher = SymmetricEncryptionFactory.create(algorithm, 'lib')
+    return compress_context(cipher.bind(cipher.generate_key()), codec_name, dictionary)
+
+
+def test_codec_is_abstract():
+    with pytest.raises(TypeError):
+        Codec()
+
+
+@pytest.mark.parametrize('codec_name', list(CODECS))
+def test_round_trip(codec_name):
+    context = _context(codec_name)
+    assert context.decrypt(context.encrypt(MESSAGE)) == MESSAGE
+    assert context.pack(MESSAGE.encode('utf-8'))[0] == COMPRESSED
+    assert context.pack(b'hi')[0] == STORED
+
+
+@pytest.mark.parametrize('codec_name', list(CODECS))
+@pytest.mark.parametrize('message', ['', 'kısa', MESSAGE])
+def test_into_matches_bytes(codec_name, message):
+    context = _context(codec_name)
+    data = message.encode('utf-8')
+    frame = bytearray(context.max_frame_size(len(data)))
+    frame_length = context.encrypt_into(data, frame)
+    out = bytearray(context.max_plaintext_size(frame_length))
+    assert bytes(out[:context.decrypt_into(frame[:frame_length], out)]) == data
+    assert context.decrypt_bytes(bytes(frame[:frame_length])) == data
+
+
+def test_zlib_uses_default_dictionary():
+    assert _context('zlib').dictionary
+    assert _context('lzma').dictionary is None
+
+
+def test_lzma_rejects_dictionary():
+    cipher = SymmetricEncryptionFactory.create('aes', 'lib')
+    with pytest.raises(ValueError):
+        validate(cipher, 'lzma', b'preset words')
+    with pytest.raises(ValueError):
+        _context('lzma', b'preset words')
+    with pytest.raises(ValueError):
+        CODECS['lzma'].compress(b'data', b'preset words')
+
+
+def test_text_ciphers_are_rejected():
+    with pytest.raises(ValueError):
+        _context('zlib', algorithm='caesar')
+
+
+def test_decompression_limit():
+    context = _context('zlib')
+    context.max_output = 100
+    with pytest.raises(ValueError):
+        context.decrypt_bytes(context.encrypt_bytes(b'a' * 1000))
@@ -0,0 +1,100 @@
+"""
+ECDH handshake mode with a rotating server key (server/ecdh.py).
+"""
+
+import base64
+import time
+
+import pytest
+
+from encryption.asymmetric import ECCLib
+from server import ChatHandlers, ECDHKeyRing, ServerComponents, UnknownServerKey, run_steps
+
+INFO = b'crypto-chat session key|aes|lib'
+
+
+class Clock:
+    def __init__(self, now=100000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def ring(clock):
+    return ECDHKeyRing(secret=b'ortak sir', rotation_interval=100)
+
+
+def _client_key(ecc: ECCLib, server_public_key: bytes):
+    """(client public key, key derived on the client side) like the browser does."""
+    _, private_key = ecc.generate_key_pair()
+    public_key = ecc.public_key_bytes(private_key)
+    key = ecc.derive_key(private_key, server_public_key, length=32,
+                         salt=public_key + server_public_key, info=INFO)
+    return public_key, key
+
+
+def test_both_sides_derive_the_same_key(ring):
+    ecc = ECCLib()
+    key_id, server_public_key = ring.current()
+    client_public_key, client_key = _client_key(ecc, server_public_key)
+    assert ring.derive(key_id, client_public_key, 32, INFO) == client_key
+    # info (seçilen algoritma) anahtara bağlıdır
+    assert ring.derive(key_id, client_public_key, 32, b'other') != client_key
+
+
+def test_workers_sharing_the_secret_publish_the_same_key(ring):
+    assert ECDHKeyRing(secret=b'ortak sir', rotation_interval=100).current() == ring.current()
+    assert ECDHKeyRing(secret=b'baska sir', rotation_interval=100).current()[1] != ring.current()[1]
+
+
+def test_key_rotates_and_previous_epoch_is_accepted(ring, clock):
+    ecc = ECCLib()
+    key_id, server_public_key = ring.current()
+    client_public_key, client_key = _client_key(ecc, server_public_key)
+
+    clock.now += 100
+    new_id, new_public_key = ring.current()
+    assert (new_id, new_public_key != server_public_key) == (key_id + 1, True)
+    # Geçiş süresince bir önceki dönemin anahtarı kabul edilir
+    assert ring.derive(key_id, client_public_key, 32, INFO) == client_key
+
+    clock.now += 100
+    with pytest.raises(UnknownServerKey):
+        ring.derive(key_id, client_public_key, 32, INFO)
+
+
+@pytest.mark.parametrize('offset', [1, -2, -1000])
+def test_unknown_key_id_is_rejected(ring, offset):
+    key_id, server_public_key = ring.current()
+    client_public_key, _ = _client_key(ECCLib(), server_public_key)
+    with pytest.raises(UnknownServerKey):
+        ring.derive(key_id + offset, client_public_key, 32, INFO)
+
+
+def test_stale_key_id_asks_client_for_a_new_key(clock):
+    components = ServerComponents(environ={'ECDH_ROTATION': '100'})
+    key_id, server_public_key = components.ecdh_keys.current()
+    client_public_key, _ = _client_key(ECCLib(), server_public_key)
+    clock.now += 200
+    emitted = []
+    run_steps(ChatHandlers(components).set_encryption_settings('sid', {
+        'asymmetric_algorithm': 'ecdh', 'key_id': key_id,
+        'client_public_key': base64.b64encode(client_public_key).decode('ascii'),
+    }), lambda event, data: emitted.append((event, data)), components.crypto_executor)
+    assert emitted == [('error', {'message': f'Sunucu anahtarı {key_id} artık geçerli değil, '
+                                             'lütfen anahtarı tekrar isteyin.'})]
+    assert components.sessions.get('sid') is None
+
+
+def test_rejects_invalid_rotation_interval():
+    with pytest.raises(ValueError):
+        ECDHKeyRing(rotation_interval=0)
@@ -0,0 +1,135 @@
+"""
+Idle session eviction, the session ceiling and half-open handshake limits.
+"""
+
+import time
+
+import pytest
+
+from encryption import SymmetricEncryptionFactory
+from server import (ChatHandlers, HandshakeLimitExceeded, HandshakeTracker, KeyHandle, MemorySessionStore,
+                    ServerComponents, run_steps)
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def evicted():
+    return []
+
+
+def _store(evicted, **options):
+    return MemorySessionStore(on_evict=lambda sid, reason: evicted.append((sid, reason)), **options)
+
+
+def test_sweep_evicts_only_idle_sessions(clock, evicted):
+    store = _store(evicted, ttl=10)
+    store.update('idle', binary=True)
+    store.update('active', binary=True)
+    clock.now += 6
+    store.get('active')
+    clock.now += 5
+    assert store.sweep() == 1
+    assert evicted == [('idle', 'idle')]
+    assert store.get('idle') is None and store.get('active') is not None
+    assert store.stats()['evictions'] == {'idle': 1, 'capacity': 0}
+
+
+def test_ceiling_evicts_least_recently_active(clock, evicted):
+    store = _store(evicted, max_sessions=2)
+    store.update('a', binary=True)
+    clock.now += 1
+    store.update('b', binary=True)
+    clock.now += 1
+    store.get('a')
+    clock.now += 1
+    store.update('c', binary=True)
+    assert evicted == [('b', 'capacity')]
+    assert len(store) == 2 and store.get('b') is None
+
+
+def test_explicit_evict_does_not_notify(evicted):
+    store = _store(evicted, max_sessions=2)
+    store.update('a', binary=True)
+    assert store.evict('a')
+    assert evicted == []
+
+
+def test_handshake_cap_and_release():
+    tracker = HandshakeTracker(max_pending=2, timeout=30)
+    tracker.begin('a')
+    tracker.begin('b')
+    # Aynı sid'in yeniden başlaması yeni yer istemez
+    tracker.begin('a')
+    with pytest.raises(HandshakeLimitExceeded):
+        tracker.begin('c')
+    assert tracker.discard('a') and not tracker.discard('a')
+    tracker.begin('c')
+    assert tracker.stats()['rejected'] == 1
+
+
+def test_handshake_timeout(clock):
+    tracker = HandshakeTracker(max_pending=1, timeout=30)
+    tracker.begin('a')
+    clock.now += 31
+    # Sınır doluyken süresi dolan el sıkışmalar yer açar
+    tracker.begin('b')
+    assert tracker.expired() == ['a']
+    assert tracker.expired() == []
+    assert tracker.stats()['timed_out'] == 1
+
+
+def test_sweep_drops_keys_of_timed_out_handshakes(clock):
+    components = ServerComponents(environ={'HANDSHAKE_TIMEOUT': '30'})
+    symmetric_enc = SymmetricEncryptionFactory.create('aes', 'lib')
+    server_key = KeyHandle('rsa', object())
+
+    # Hiç tamamlanmamış el sıkışma: oturum tamamen silinir
+    components.handshakes.begin('new')
+    components.sessions.update('new', server_key=server_key)
+    # Yarım kalan yeniden anahtarlama: ayarlar kalır, yalnızca private key düşer
+    components.sessions.update('rekey', symmetric_algorithm='aes', symmetric_implementation='lib',
+                               symmetric_key=symmetric_enc.generate_key())
+    components.handshakes.begin('rekey')
+    components.sessions.update('rekey', server_key=server_key)
+
+    clock.now += 31
+    assert components.sweep() == {'idle': 0, 'handshake_timeout': 2}
+    assert components.sessions.get('new') is None
+    session = components.sessions.get('rekey')
+    assert session.server_key is None and session.cipher is not None
+
+
+def test_evicted_session_releases_streams_and_handshake(clock):
+    components = ServerComponents(environ={'SESSION_TTL': '10'})
+    components.sessions.update('sid', symmetric_algorithm='aes', symmetric_implementation='lib',
+                               symmetric_key=bytes(32))
+    components.streams.open('sid', 's', components.sessions.get('sid').cipher)
+    components.handshakes.begin('sid')
+    clock.now += 11
+    assert components.sweep()['idle'] == 1
+    assert len(components.streams) == 0 and len(components.handshakes) == 0
+
+
+def test_busy_key_exchange_releases_handshake():
+    components = ServerComponents(environ={'MAX_HALF_OPEN_HANDSHAKES': '1'})
+    components.handshakes.begin('other')
+    emitted = []
+    run_steps(ChatHandlers(components).key_exchange_params('sid', {'asymmetric_algorithm': 'rsa'}),
+              lambda event, data: emitted.append((event, data)), components.crypto_executor)
+    assert emitted == [('error', {'message': 'Sunucu meşgul, lütfen tekrar deneyin.'})]
+    assert components.handshakes.stats()['pending'] == 1
+    assert components.handshakes.stats()['rejected'] == 1
@@ -0,0 +1,76 @@
+"""
+Bounded crypto executor (server/executor.py).
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from server import CryptoExecutor, ExecutorBusy
+
+
+@pytest.fixture
+def executor():
+    return CryptoExecutor(max_pending=1, workers=2)
+
+
+def _occupy(executor):
+    """Hold the executor's only slot until the returned event is set."""
+    started, release = threading.Event(), threading.Event()
+
+    def blocking():
+        started.set()
+        release.wait(5)
+        return 'done'
+
+    result = []
+    thread = threading.Thread(target=lambda: result.append(executor.run('blocking', blocking)))
+    thread.start()
+    assert started.wait(5)
+    return release, thread, result
+
+
+def test_run_returns_result_and_records_latency(executor):
+    assert executor.run('keygen', pow, 2, 10) == 1024
+    stats = executor.stats()
+    assert stats['pending'] == 0
+    assert stats['latency']['keygen']['count'] == 1
+
+
+def test_full_queue_raises_executor_busy(executor):
+    release, thread, result = _occupy(executor)
+    try:
+        assert executor.stats()['pending'] == 1
+        with pytest.raises(ExecutorBusy):
+            executor.run('keygen', pow, 2, 10)
+    finally:
+        release.set()
+        thread.join(5)
+    assert result == ['done']
+    assert executor.stats()['rejected'] == 1
+    # Yer boşalınca yeni işler yine kabul edilir
+    assert executor.run('keygen', pow, 2, 10) == 1024
+
+
+def test_failed_job_releases_its_slot(executor):
+    with pytest.raises(ZeroDivisionError):
+        executor.run('decrypt_key', lambda: 1 / 0)
+    assert executor.stats()['pending'] == 0
+    assert executor.run('decrypt_key', pow, 3, 2) == 9
+
+
+def test_run_async_shares_the_backpressure(executor):
+    release, thread, _ = _occupy(executor)
+    try:
+        with pytest.raises(ExecutorBusy):
+            asyncio.run(executor.run_async('keygen', pow, 2, 10))
+    finally:
+        release.set()
+        thread.join(5)
+    assert asyncio.run(executor.run_async('keygen', pow, 2, 10)) == 1024
+
+
+def test_rejects_empty_queue():
+    with pytest.raises(ValueError):
+        CryptoExecutor(max_pending=0)
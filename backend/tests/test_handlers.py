@@ -0,0 +1,121 @@
+"""
+Shared Socket.IO handlers driven without a server (server/handlers.py).
+"""
+
+import asyncio
+
+import pytest
+
+from encryption import SymmetricEncryptionFactory
+from server import ChatHandlers, ExecutorBusy, ServerComponents, run_steps, run_steps_async
+
+SID = 'sid-1'
+
+
+class Executor:
+    """Runs offloaded steps inline and records their operation names."""
+
+    def __init__(self, busy=False):
+        self.busy = busy
+        self.operations = []
+
+    def run(self, operation, fn, *args):
+        self.operations.append(operation)
+        if self.busy:
+            raise ExecutorBusy(operation)
+        return fn(*args)
+
+    async def run_async(self, operation, fn, *args):
+        return self.run(operation, fn, *args)
+
+
+@pytest.fixture
+def components():
+    return ServerComponents(environ={})
+
+
+@pytest.fixture
+def cipher(components):
+    symmetric_enc = SymmetricEncryptionFactory.create('aes', 'lib')
+    key = symmetric_enc.generate_key()
+    components.sessions.update(SID, symmetric_algorithm='aes', symmetric_implementation='lib',
+                               symmetric_key=key, binary=False)
+    return symmetric_enc.bind(key)
+
+
+def drive(steps, executor=None, offload_threshold=None):
+    emitted = []
+    run_steps(steps, lambda event, data: emitted.append((event, data)), executor or Executor(),
+              offload_threshold)
+    return emitted
+
+
+def drive_async(steps, executor=None, offload_threshold=None):
+    emitted = []
+
+    async def emit(event, data):
+        emitted.append((event, data))
+    asyncio.run(run_steps_async(steps, emit, executor or Executor(), offload_threshold))
+    return emitted
+
+
+@pytest.mark.parametrize('driver', [drive, drive_async])
+def test_message_round_trip(components, cipher, driver):
+    emitted = driver(ChatHandlers(components).message(SID, {'message': cipher.encrypt('merhaba')}))
+    assert [event for event, _ in emitted] == ['message_response']
+    assert cipher.decrypt(emitted[0][1]['encrypted_payload']) == '+merhaba'
+
+
+@pytest.mark.parametrize('driver', [drive, drive_async])
+def test_batch_with_unsized_items(components, cipher, driver):
+    messages = [cipher.encrypt('a'), 42, None, {'x': 1}, cipher.encrypt('b')]
+    emitted = driver(ChatHandlers(components).message_batch(SID, {'messages': messages}),
+                     offload_threshold=0)
+    assert [event for event, _ in emitted] == ['message_response_batch']
+    payload = emitted[0][1]
+    assert payload['failed'] == [1, 2, 3]
+    assert [cipher.decrypt(payload['encrypted_payloads'][i]) for i in (0, 4)] == ['+a', '+b']
+
+
+def test_offload_threshold(components, cipher):
+    executor = Executor()
+    small = {'message': cipher.encrypt('kısa')}
+    drive(ChatHandlers(components).message(SID, small), executor, offload_threshold=1024)
+    assert executor.operations == []
+    drive(ChatHandlers(components).message(SID, small), executor, offload_threshold=0)
+    assert executor.operations == ['message']
+
+
+def test_offload_error_reaches_handler(components):
+    emitted = drive(ChatHandlers(components).key_exchange_params(SID, {'asymmetric_algorithm': 'rsa'}),
+                    Executor(busy=True))
+    assert emitted == [('error', {'message': 'Sunucu meşgul, lütfen tekrar deneyin.'})]
+    assert len(components.handshakes) == 0
+
+
+def test_key_loading_error_releases_handshake(components, monkeypatch):
+    monkeypatch.setattr(components.key_pool, 'try_acquire', lambda algorithm: (b'public', b'not a key'))
+    emitted = drive(ChatHandlers(components).key_exchange_params(SID, {'asymmetric_algorithm': 'rsa'}))
+    assert [event for event, _ in emitted] == ['error']
+    assert len(components.handshakes) == 0
+
+
+def test_message_without_session(components):
+    emitted = drive(ChatHandlers(components).message(SID, {'message': 'x'}))
+    assert emitted == [('error', {'message': 'Şifreleme ayarları bulunamadı!'})]
+
+
+@pytest.mark.parametrize('event', ['message', 'message_batch', 'key_exchange_params', 'set_encryption_settings',
+                                   'resume_session', 'stream_start', 'stream_chunk', 'stream_end'])
+@pytest.mark.parametrize('data', [None, 'stream', ['stream_id']])
+def test_non_dict_payload_is_rejected(components, cipher, event, data):
+    emitted = drive(getattr(ChatHandlers(components), event)(SID, data))
+    assert [name for name, _ in emitted] in (['error'], ['resume_failed'])
+
+
+def test_disconnect_clears_state(components, cipher):
+    handlers = ChatHandlers(components)
+    drive(handlers.stream_start(SID, {'stream_id': 's'}))
+    handlers.disconnect(SID)
+    assert components.sessions.get(SID) is None
+    assert components.streams.get(SID, 's') is None
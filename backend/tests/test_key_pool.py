@@ -0,0 +1,99 @@
+"""
+Pre-generated key pair pool (server/key_pool.py).
+
+Havuz normalde işçi süreçlerinde üretir; testlerde üretim aynı süreçte ve
+anında tamamlanır, böylece doldurma adımları deterministik olur.
+"""
+
+from concurrent.futures import Future
+
+import pytest
+
+from encryption import AsymmetricEncryptionFactory
+from server import KeyPairPool
+from server import key_pool as key_pool_module
+
+
+class InlineExecutor:
+    """ProcessPoolExecutor stand-in that completes every job on submit."""
+
+    def __init__(self):
+        self.submitted = 0
+
+    def submit(self, fn, *args):
+        self.submitted += 1
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, wait=True):
+        pass
+
+
+@pytest.fixture
+def pool():
+    pool = KeyPairPool(low_watermark=1, high_watermark=3, workers=1)
+    pool._executor = InlineExecutor()
+    return pool
+
+
+def test_empty_pool_misses_and_refills_to_high_watermark(pool):
+    assert pool.try_acquire('ECC') is None
+    stats = pool.stats()['ecc']
+    assert (stats['misses'], stats['hits'], stats['depth'], stats['pending']) == (1, 0, 3, 0)
+    assert stats['generated'] == 3
+
+
+def test_refill_starts_at_low_watermark(pool):
+    pool.warm_up('ecc')
+    assert pool._executor.submitted == 3
+
+    assert pool.try_acquire('ecc') is not None
+    # 2 hazır çift > low_watermark: yenileme yok
+    assert pool._executor.submitted == 3
+    assert pool.stats()['ecc']['depth'] == 2
+
+    assert pool.try_acquire('ecc') is not None
+    # low_watermark'a inildi: üst sınıra kadar 2 çift daha üretilir
+    assert pool._executor.submitted == 5
+    assert pool.stats()['ecc']['depth'] == 3
+    assert pool.stats()['ecc']['hits'] == 2
+
+
+def test_pooled_pair_is_usable(pool):
+    # Süreçler arası PEM ile taşınan çift, havuzda yüklenmiş bir handle olarak durur
+    pool.warm_up('rsa')
+    public_key, private_key = pool.try_acquire('rsa')
+    rsa = AsymmetricEncryptionFactory.create('rsa', 'lib')
+    symmetric_key = bytes(range(32))
+    assert rsa.decrypt_key(rsa.encrypt_key(symmetric_key, public_key), private_key) == symmetric_key
+
+
+def test_pools_are_kept_per_algorithm_and_key_size(pool):
+    pool.warm_up('ecc')
+    assert pool.try_acquire('ecc', 384) is None
+    assert set(pool.stats()) == {'ecc', 'ecc-384'}
+
+
+def test_generation_failure_is_counted(pool, monkeypatch):
+    def broken(algorithm, key_size):
+        raise RuntimeError("keygen failed")
+    monkeypatch.setattr(key_pool_module, '_generate_exportable_key_pair', broken)
+    assert pool.try_acquire('ecc') is None
+    stats = pool.stats()['ecc']
+    assert (stats['failures'], stats['pending'], stats['depth']) == (3, 0, 0)
+
+
+def test_zero_high_watermark_never_generates():
+    pool = KeyPairPool(low_watermark=0, high_watermark=0)
+    assert pool.try_acquire('rsa') is None
+    assert pool._executor is None
+
+
+@pytest.mark.parametrize('low, high', [(-1, 4), (5, 4)])
+def test_rejects_invalid_watermarks(low, high):
+    with pytest.raises(ValueError):
+        KeyPairPool(low_watermark=low, high_watermark=high)
@@ -0,0 +1,46 @@
+"""
+Session records and canonical algorithm names.
+"""
+
+import pytest
+
+from server import Session, cipher_id, codec_id
+
+
+def test_cipher_id_returns_registered_names():
+    algorithm, implementation = cipher_id(''.join(['A', 'E', 'S']), ''.join(['Man', 'ual']))
+    assert (algorithm, implementation) == ('aes', 'manual')
+    # Her oturum kayıttaki aynı dizge nesnelerini paylaşır
+    assert algorithm is cipher_id('aes', 'lib')[0]
+    assert implementation is cipher_id('AES', 'MANUAL')[1]
+
+
+def test_unknown_implementation_falls_back_to_lib():
+    assert cipher_id('des', 'no-such-impl') == ('des', 'lib')
+
+
+@pytest.mark.parametrize('algorithm', ['no-such-cipher', 'aes ' * 100])
+def test_cipher_id_rejects_unknown_algorithm(algorithm):
+    with pytest.raises(ValueError):
+        cipher_id(algorithm, 'lib')
+
+
+def test_codec_id():
+    assert codec_id(None) is None
+    assert codec_id('zlib') == 'zlib'
+    with pytest.raises(ValueError):
+        codec_id('brotli')
+
+
+def test_session_from_record_canonicalizes_names():
+    session = Session.from_record({'symmetric_algorithm': 'AES', 'symmetric_implementation': 'Lib',
+                                   'symmetric_key': b'k' * 32, 'binary': 1, 'unknown_field': 1})
+    assert session.symmetric_algorithm is cipher_id('aes', 'lib')[0]
+    assert session.symmetric_implementation == 'lib'
+    assert session.binary is True
+    assert 'server_key' not in session.settings()
+
+
+def test_session_rejects_unknown_algorithm():
+    with pytest.raises(ValueError):
+        Session(symmetric_algorithm='rot13')
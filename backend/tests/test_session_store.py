@@ -0,0 +1,109 @@
+"""
+Pluggable session stores (server/session_store.py).
+"""
+
+import time
+
+import pytest
+
+from encryption import AsymmetricEncryptionFactory
+from server import (InMemoryRemoteClient, KeyHandle, MemorySessionStore, RemoteSessionStore,
+                    SQLiteSessionStore, create_session_store)
+
+
+class Clock:
+    """Controllable time.time replacement."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, 'time', clock)
+    return clock
+
+
+@pytest.fixture(params=['memory', 'sqlite', 'remote'])
+def make_store(request, tmp_path):
+    def make(**options):
+        if request.param == 'memory':
+            return MemorySessionStore(**options)
+        if request.param == 'sqlite':
+            return SQLiteSessionStore(str(tmp_path / 'sessions.db'), **options)
+        return RemoteSessionStore(InMemoryRemoteClient(), **options)
+    return make
+
+
+def test_update_merges_and_none_removes_fields(make_store):
+    store = make_store()
+    store.update('a', symmetric_algorithm='aes', symmetric_key=b'\x00\x01')
+    session = store.update('a', binary=True, symmetric_key=None)
+    assert session == {'symmetric_algorithm': 'aes', 'binary': True}
+    assert store.get('a') == session
+    assert store.get('missing') is None
+
+
+def test_evict_drops_the_session(make_store):
+    store = make_store()
+    store.update('a', binary=False)
+    assert store.evict('a')
+    assert store.get('a') is None
+    assert not store.evict('a')
+
+
+def test_server_key_survives_serialization(make_store):
+    ecc = AsymmetricEncryptionFactory.create('ecc', 'lib')
+    _, private_key = ecc.generate_key_pair()
+    store = make_store()
+    store.update('a', server_key=KeyHandle('ecc', private_key), symmetric_key=b'\xff' * 32)
+    # Önbellek atlanır: kayıt arka uçtan okunup çözülür
+    store._cache.clear()
+    session = store.get('a')
+    assert session['symmetric_key'] == b'\xff' * 32
+    assert session['server_key'].export() == KeyHandle('ecc', private_key).export()
+
+
+def test_materialize_builds_cached_object(make_store):
+    built = []
+    store = make_store(materialize=lambda record: built.append(record) or dict(record, built=True))
+    store.update('a', binary=True)
+    assert store.get('a') == {'binary': True, 'built': True}
+    assert store.get('a') is store.get('a')
+    assert len(built) == 1
+
+
+def test_ttl_slides_on_activity(make_store, clock):
+    store = make_store(ttl=10)
+    store.update('a', binary=True)
+    clock.now += 6
+    # TTL'in yarısı geçtikten sonraki okuma kaydı yeni bir süreyle tekrar yazar
+    assert store.get('a') is not None
+    clock.now += 8
+    assert store.get('a') is not None
+    clock.now += 11
+    assert store.get('a') is None
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / 'sessions.db')
+    first, second = SQLiteSessionStore(path), SQLiteSessionStore(path)
+    first.update('a', symmetric_algorithm='des')
+    assert second.get('a') == {'symmetric_algorithm': 'des'}
+    second.evict('a')
+    first._cache.clear()
+    assert first.get('a') is None
+
+
+def test_create_session_store(tmp_path):
+    assert isinstance(create_session_store('memory'), MemorySessionStore)
+    assert isinstance(create_session_store('sqlite', path=str(tmp_path / 's.db')), SQLiteSessionStore)
+    assert isinstance(create_session_store('remote'), RemoteSessionStore)
+    with pytest.raises(ValueError):
+        create_session_store('etcd')
+    with pytest.raises(ValueError):
+        MemorySessionStore(ttl=0)
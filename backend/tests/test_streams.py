@@ -0,0 +1,64 @@
+"""
+Stream registry and buffered stream limits.
+"""
+
+import pytest
+
+from encryption import SymmetricEncryptionFactory
+from encryption.symmetric import MAX_MESSAGE_SIZE
+from server import StreamLimitExceeded, StreamRegistry
+
+
+def _context(algorithm: str, implementation: str):
+    cipher = SymmetricEncryptionFactory.create(algorithm, implementation)
+    return cipher.bind(cipher.generate_key())
+
+
+@pytest.mark.parametrize('algorithm, implementation', [('aes', 'lib'), ('aes', 'manual'), ('caesar', 'lib')])
+def test_stream_round_trip(algorithm, implementation):
+    context = _context(algorithm, implementation)
+    frame = context.encrypt_bytes(b'x' * 5000)
+    decryptor = context.decryptor()
+    output = b''.join(decryptor.update(frame[i:i + 7]) for i in range(0, len(frame), 7))
+    assert output + decryptor.finalize() == b'x' * 5000
+
+
+def test_buffered_stream_rejects_oversized_payload():
+    decryptor = _context('aes', 'manual').decryptor()
+    decryptor.max_bytes = 100
+    decryptor.update(b'a' * 100)
+    with pytest.raises(ValueError):
+        decryptor.update(b'a')
+
+
+def test_registry_caps_bytes_per_stream():
+    registry = StreamRegistry(max_streams_per_session=1, max_stream_bytes=64)
+    state = registry.open('sid', 'stream', _context('aes', 'manual'))
+    state.receive(64)
+    with pytest.raises(StreamLimitExceeded):
+        state.receive(1)
+    with pytest.raises(StreamLimitExceeded):
+        registry.open('sid', 'other', _context('aes', 'lib'))
+    assert registry.close('sid', 'stream') is state
+    assert len(registry) == 0
+
+
+def test_native_stream_is_not_capped():
+    # Yerel CBC akışı yalnızca bir blok tutar: tek mesaj sınırını aşabilir
+    registry = StreamRegistry(max_streams_per_session=1)
+    context = _context('aes', 'lib')
+    state = registry.open('sid', 'stream', context)
+    assert state.max_bytes is None
+
+    chunk = b'y' * (1024 * 1024)
+    encryptor = context.encryptor()
+    size = 0
+    for _ in range(11):
+        frame_chunk = encryptor.update(chunk)
+        state.receive(len(frame_chunk))
+        size += len(state.decryptor.update(frame_chunk))
+    frame_chunk = encryptor.finalize()
+    state.receive(len(frame_chunk))
+    size += len(state.decryptor.update(frame_chunk)) + len(state.decryptor.finalize())
+    assert state.bytes_in > MAX_MESSAGE_SIZE
+    assert size == 11 * len(chunk)
@@ -0,0 +1,100 @@
+"""
+Fixed-vector tests for the block ciphers.
+
+IV os.urandom üzerinden üretildiği için testlerde sabitlenir. Manuel
+şifrelerin vektörleri frontend'deki aes_manual.js / des_manual.js ile
+aynı anahtar ve IV kullanılarak üretilmiştir; tarayıcı ile sunucu aynı
+çıktıyı vermelidir.
+"""
+
+import base64
+import os
+
+import pytest
+
+from encryption.symmetric import AESLib, AESManual, DESLib, DESManual
+
+MESSAGE = 'Merhaba dünya, şifreli sohbet!'
+
+# NIST SP 800-38A, F.2.1 CBC-AES128.Encrypt (ilk iki blok)
+NIST_KEY = bytes.fromhex('2b7e151628aed2a6abf7158809cf4f3c')
+NIST_IV = bytes.fromhex('000102030405060708090a0b0c0d0e0f')
+NIST_PLAINTEXT = bytes.fromhex('6bc1bee22e409f96e93d7e117393172a'
+                               'ae2d8a571e03ac9c9eb76fac45af8e51')
+NIST_CIPHERTEXT = bytes.fromhex('7649abac8119b246cee98e9b12e9197d'
+                                '5086cb9b507219ee95db113a917678b2')
+
+AES_MANUAL_KEY = NIST_KEY
+AES_MANUAL_IV = NIST_IV
+AES_MANUAL_FRAME = bytes.fromhex(
+    '000102030405060708090a0b0c0d0e0f'
+    'c9ea6c3718b1e0222acdd856a0f6d9b0d1c2067e573e16b0208c52a11f573c05'
+    '1c4820221b9ce39694c928b432f57604')
+
+DES_MANUAL_KEY = bytes.fromhex('133457799bbcdff1')
+DES_MANUAL_IV = bytes.fromhex('a0a1a2a3a4a5a6a7')
+DES_MANUAL_FRAME = bytes.fromhex(
+    'a0a1a2a3a4a5a6a7'
+    'c22ecd978a06ee3522258330a5e82a35f32ff1e061e60ecb6bbda89764e6dd77'
+    'd9bbbd4f11737587')
+
+
+@pytest.fixture
+def fixed_iv(monkeypatch):
+    """Make os.urandom return the given IV (truncated to the requested size)."""
+    def install(iv: bytes):
+        monkeypatch.setattr(os, 'urandom', lambda size: iv[:size])
+    return install
+
+
+def test_aes_lib_matches_nist_cbc_vector(fixed_iv):
+    fixed_iv(NIST_IV)
+    cipher = AESLib()
+    frame = cipher.encrypt_bytes(NIST_PLAINTEXT, cipher.prepare_key(NIST_KEY))
+    assert frame[:16] == NIST_IV
+    # PKCS7 tam bir dolgu bloğu ekler; NIST blokları önünde aynen bulunur
+    assert frame[16:16 + len(NIST_CIPHERTEXT)] == NIST_CIPHERTEXT
+    assert len(frame) == 16 + len(NIST_CIPHERTEXT) + 16
+    assert cipher.decrypt_bytes(frame, cipher.prepare_key(NIST_KEY)) == NIST_PLAINTEXT
+
+
+def test_des_lib_is_aes128_with_doubled_key(fixed_iv):
+    fixed_iv(NIST_IV)
+    key = NIST_KEY[:8]
+    des_frame = DESLib().encrypt_bytes(NIST_PLAINTEXT, DESLib().prepare_key(key))
+    aes_frame = AESLib().encrypt_bytes(NIST_PLAINTEXT, AESLib().prepare_key(key * 2))
+    assert des_frame == aes_frame
+    assert DESLib().decrypt_bytes(aes_frame, DESLib().prepare_key(key)) == NIST_PLAINTEXT
+
+
+@pytest.mark.parametrize('cipher_class, key, iv, frame', [
+    (AESManual, AES_MANUAL_KEY, AES_MANUAL_IV, AES_MANUAL_FRAME),
+    (DESManual, DES_MANUAL_KEY, DES_MANUAL_IV, DES_MANUAL_FRAME),
+])
+def test_manual_cipher_matches_frontend_vector(fixed_iv, cipher_class, key, iv, frame):
+    fixed_iv(iv)
+    cipher = cipher_class()
+    assert cipher.encrypt(MESSAGE, key) == base64.b64encode(frame).decode('ascii')
+    assert cipher.decrypt(base64.b64encode(frame).decode('ascii'), key) == MESSAGE
+
+
+@pytest.mark.parametrize('cipher_class', [AESLib, AESManual, DESLib, DESManual])
+@pytest.mark.parametrize('message', ['', 'a', MESSAGE, 'x' * 1000])
+def test_block_cipher_round_trip(cipher_class, message):
+    cipher = cipher_class()
+    key = cipher.generate_key()
+    context = cipher.bind(key)
+    assert cipher.decrypt(cipher.encrypt(message, key), key) == message
+    assert context.decrypt_bytes(context.encrypt_bytes(message.encode('utf-8'))) == message.encode('utf-8')
+
+
+@pytest.mark.parametrize('cipher_class', [AESLib, DESLib])
+def test_into_matches_bytes(cipher_class, fixed_iv):
+    fixed_iv(bytes(range(16)))
+    context = cipher_class().bind(cipher_class().generate_key())
+    data = MESSAGE.encode('utf-8')
+    frame = bytearray(context.max_frame_size(len(data)))
+    frame_length = context.encrypt_into(data, frame)
+    assert bytes(frame[:frame_length]) == context.encrypt_bytes(data)
+    out = bytearray(context.max_plaintext_size(frame_length))
+    assert bytes(out[:context.decrypt_into(frame[:frame_length], out)]) == data
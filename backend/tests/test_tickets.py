@@ -0,0 +1,106 @@
+"""
+Session resumption tickets (server/tickets.py).
+"""
+
+import base64
+import time
+
+import pytest
+
+from server import TicketError, TicketIssuer
+
+SETTINGS = {
+    'symmetric_algorithm': 'aes',
+    'symmetric_implementation': 'lib',
+    'symmetric_key': bytes(range(32)),
+    'binary': True,
+    'compression': 'zlib',
+    'compression_dictionary': b'sozluk',
+}
+
+
+class Clock:
+    def __init__(self, now=100000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def issuer(clock):
+    return TicketIssuer(secret=b'ortak sir', rotation_interval=100, lifetime=250)
+
+
+def _reason(issuer, ticket):
+    with pytest.raises(TicketError) as error:
+        issuer.open(ticket)
+    return error.value.reason
+
+
+def test_round_trip(issuer):
+    settings = issuer.open(issuer.issue(SETTINGS))
+    assert {name: settings[name] for name in SETTINGS} == SETTINGS
+
+
+def test_tampered_ticket_is_rejected(issuer):
+    raw = bytearray(base64.urlsafe_b64decode(issuer.issue(SETTINGS)))
+    raw[-1] ^= 1
+    assert _reason(issuer, base64.urlsafe_b64encode(bytes(raw)).decode('ascii')) == 'invalid'
+
+
+def test_other_secret_cannot_open(issuer, clock):
+    ticket = TicketIssuer(secret=b'baska sir', rotation_interval=100).issue(SETTINGS)
+    assert _reason(issuer, ticket) == 'invalid'
+
+
+@pytest.mark.parametrize('ticket', ['', '!!!', base64.urlsafe_b64encode(b'kisa').decode('ascii')])
+def test_malformed_ticket(issuer, ticket):
+    assert _reason(issuer, ticket) == 'malformed'
+
+
+def test_workers_sharing_the_secret_open_each_others_tickets(issuer):
+    other_worker = TicketIssuer(secret=b'ortak sir', rotation_interval=100, lifetime=250)
+    assert other_worker.open(issuer.issue(SETTINGS))['symmetric_key'] == SETTINGS['symmetric_key']
+
+
+def test_ticket_survives_key_rotation_within_lifetime(issuer, clock):
+    ticket = issuer.issue(SETTINGS)
+    # İki dönem sonra anahtar değişmiştir; eski dönemin anahtarı ömür boyunca türetilebilir
+    clock.now += 200
+    assert issuer.open(ticket)['symmetric_algorithm'] == 'aes'
+
+
+def test_expired_ticket(issuer, clock):
+    ticket = issuer.issue(SETTINGS)
+    # Biletin dönemi hâlâ kabul aralığında (dönem başında verildi), ama bilet ömrünü doldurdu
+    clock.now += 251
+    assert _reason(issuer, ticket) == 'expired'
+
+
+def test_ticket_from_a_dropped_epoch(issuer, clock):
+    ticket = issuer.issue(SETTINGS)
+    clock.now += 400
+    assert _reason(issuer, ticket) == 'unknown_key'
+
+
+def test_ticket_from_a_future_epoch(issuer, clock):
+    clock.now += 100
+    ticket = issuer.issue(SETTINGS)
+    clock.now -= 100
+    assert _reason(issuer, ticket) == 'unknown_key'
+
+
+def test_stats_count_hits_misses_and_full_handshakes(issuer):
+    issuer.open(issuer.issue(SETTINGS))
+    _reason(issuer, '')
+    issuer.record_full_handshake()
+    stats = issuer.stats()
+    assert (stats['issued'], stats['hits'], stats['misses'], stats['hit_rate']) == (1, 1, {'malformed': 1}, 0.5)
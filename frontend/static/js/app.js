@@ -78,6 +78,8 @@ socket.on('server_public_key', async (data) => {
 });
 
 socket.on('settings_confirmed', (data) => {
+    // Sunucu doğrulamadan sonra private key'ini siler; sonraki "Uygula" yeni anahtar ister
+    serverPublicKey = null;
     showMessage('Sistem', 'Şifreleme ayarları başarıyla doğrulandı!', 'system');
 });
 